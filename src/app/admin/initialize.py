@@ -1,11 +1,76 @@
+import asyncio
+from collections.abc import AsyncGenerator
 from typing import Optional
 
 from crudadmin import CRUDAdmin
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
 
 from ..core.config import EnvironmentOption, settings
 from ..core.db.database import async_get_db
+from ..core.utils.principal_cache import principal_cache
+from ..models import User
+from ..models.subscription import SubscriptionPlan, UserSubscription, UserSubscriptionUsage
+from ..services.subscription.meter import usage_meter
+from ..services.subscription.summary_cache import subscription_summary_cache
 from .views import register_admin_views
 
+ADMIN_SESSION_FLAG = "crud_admin"
+USERS_CHANGED_FLAG = "crud_admin_users_changed"
+SUBSCRIPTIONS_CHANGED_FLAG = "crud_admin_subscriptions_changed"
+
+SUBSCRIPTION_MODELS = (SubscriptionPlan, UserSubscription, UserSubscriptionUsage)
+
+_pending_invalidations: set[asyncio.Task] = set()
+
+
+async def async_get_admin_db() -> AsyncGenerator[AsyncSession, None]:
+    """Admin sessions are tagged so user and subscription edits made through the admin flush the caches."""
+    async for db in async_get_db():
+        db.info[ADMIN_SESSION_FLAG] = True
+        yield db
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_admin_user_statements(state: ORMExecuteState) -> None:
+    if not state.session.info.get(ADMIN_SESSION_FLAG) or not (state.is_update or state.is_delete):
+        return
+    if any(mapper.class_ is User for mapper in state.all_mappers):
+        state.session.info[USERS_CHANGED_FLAG] = True
+    if any(issubclass(mapper.class_, SUBSCRIPTION_MODELS) for mapper in state.all_mappers):
+        state.session.info[SUBSCRIPTIONS_CHANGED_FLAG] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _track_admin_user_flushes(session: Session, _flush_context: object) -> None:
+    if not session.info.get(ADMIN_SESSION_FLAG):
+        return
+    if any(isinstance(obj, User) for obj in (*session.dirty, *session.deleted)):
+        session.info[USERS_CHANGED_FLAG] = True
+    if any(isinstance(obj, SUBSCRIPTION_MODELS) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info[SUBSCRIPTIONS_CHANGED_FLAG] = True
+
+
+def _schedule_invalidation(coro) -> None:
+    task = asyncio.get_running_loop().create_task(coro)
+    _pending_invalidations.add(task)
+    task.add_done_callback(_pending_invalidations.discard)
+
+
+async def _flush_subscription_caches() -> None:
+    await subscription_summary_cache.invalidate_all()
+    await usage_meter.invalidate_all()
+
+
+@event.listens_for(Session, "after_commit")
+def _flush_caches_after_admin_commit(session: Session) -> None:
+    # Admin statements don't say which user they touched, so drop every affected cache entry.
+    if session.info.pop(USERS_CHANGED_FLAG, False):
+        _schedule_invalidation(principal_cache.invalidate_all())
+    if session.info.pop(SUBSCRIPTIONS_CHANGED_FLAG, False):
+        _schedule_invalidation(_flush_subscription_caches())
+
 
 def create_admin_interface() -> Optional[CRUDAdmin]:
     """Create and configure the admin interface."""
@@ -25,7 +90,7 @@ def create_admin_interface() -> Optional[CRUDAdmin]:
         }
 
     admin = CRUDAdmin(
-        session=async_get_db,
+        session=async_get_admin_db,
         SECRET_KEY=settings.SECRET_KEY.get_secret_value(),
         mount_path=settings.CRUD_ADMIN_MOUNT_PATH,
         session_backend=session_backend,
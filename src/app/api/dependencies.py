@@ -12,6 +12,7 @@ from ..core.logger import logging
 from ..core.search.elasticsearch import es_client
 from ..core.security import TokenType, verify_token
 from ..core.utils.cache import async_get_redis
+from ..core.utils.principal_cache import principal_cache
 from ..core.utils.rate_limit import rate_limiter, sanitize_path
 from ..crud.crud_users import crud_users
 from ..services.users.service import UserService
@@ -78,13 +79,18 @@ async def get_current_user(
     if token_data is None:
         raise UnauthorizedException("User not authenticated.")
 
-    if "@" in token_data.username_or_email:
-        user = await crud_users.get(db=db, email=token_data.username_or_email)
+    subject = token_data.username_or_email
+    principal = await principal_cache.get(subject)
+    if principal is not None:
+        return principal
+
+    if "@" in subject:
+        user = await crud_users.get(db=db, email=subject)
     else:
-        user = await crud_users.get(db=db, username=token_data.username_or_email)
+        user = await crud_users.get(db=db, username=subject)
 
     if user:
-        return user
+        return await principal_cache.set(subject, user)
 
     raise UnauthorizedException("User not authenticated.")
 
@@ -115,7 +121,7 @@ async def rate_limit_dependency(
     db: Annotated[AsyncSession, Depends(async_get_db)],
     user: Annotated[dict | None, Depends(get_optional_user)],
 ) -> None:
-    """Rate limit dependency using env config (DEFAULT_RATE_LIMIT_LIMIT and DEFAULT_RATE_LIMIT_PERIOD)."""
+    """Rate limit dependency using env config (RATE_LIMIT_ROUTES, else DEFAULT_RATE_LIMIT_LIMIT/PERIOD)."""
     if hasattr(request.app.state, "initialization_complete"):
         await request.app.state.initialization_complete.wait()
 
@@ -126,8 +132,9 @@ async def rate_limit_dependency(
     else:
         user_id = request.client.host if request.client else "unknown"
 
+    rule = rate_limiter.rule_for(path, default_limit=DEFAULT_LIMIT, default_period=DEFAULT_PERIOD)
     is_limited = await rate_limiter.is_rate_limited(
-        db=db, user_id=user_id, path=path, limit=DEFAULT_LIMIT, period=DEFAULT_PERIOD
+        db=db, user_id=user_id, path=path, limit=rule.limit, period=rule.period, cost=rule.cost
     )
     if is_limited:
         raise RateLimitException("Rate limit exceeded.")
@@ -1,22 +1,36 @@
+from datetime import datetime
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...core.db.database import async_get_db
+from ...models.property import Property
 from ...schemas.cma import (
     ComparablesRequest,
     ComparablesResponse,
+    ReportJobResponse,
     ReportRequest,
     ReportResponse,
 )
 from ...services.cma import cma_service
+from ...services.cma.jobs import enqueue_report_job, get_report_job
 from ...services.subscription.service import SubscriptionService
 from ..dependencies import get_current_user, get_subscription_service
 
 router = APIRouter(prefix="/cma", tags=["CMA"])
 
 
+async def _listing_stamp(db: AsyncSession, *listing_keys: str | None) -> datetime | None:
+    """The latest `updated_at` among the listings a response is built from, part of the CMA response cache key."""
+    keys = {key for key in listing_keys if key}
+    if not keys:
+        return None
+    return await db.scalar(select(func.max(Property.updated_at)).where(Property.listing_key.in_(keys)))
+
+
 @router.post("/comparables", response_model=ComparablesResponse)
 async def find_comparables(
     body: ComparablesRequest,
@@ -32,7 +46,31 @@ async def find_comparables(
         except ValueError as exc:
             raise HTTPException(status_code=412, detail=str(exc)) from exc
 
-    return await cma_service.find_comparables(body.model_dump(exclude_none=True))
+    listing_stamp = await _listing_stamp(db, body.subject_listing_key)
+    return await cma_service.find_comparables(body.model_dump(exclude_none=True), listing_stamp)
+
+
+@router.post("/comparables/stream", response_class=StreamingResponse)
+async def stream_comparables(
+    body: ComparablesRequest,
+    db: AsyncSession = Depends(async_get_db),
+    current_user: dict = Depends(get_current_user),
+    subscription_service: SubscriptionService = Depends(get_subscription_service),
+) -> StreamingResponse:
+    if body.subject_listing_key:
+        try:
+            await subscription_service.add_usage(
+                user_id=current_user["id"], property_id=body.subject_listing_key
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=412, detail=str(exc)) from exc
+
+    listing_stamp = await _listing_stamp(db, body.subject_listing_key)
+    return StreamingResponse(
+        cma_service.stream_comparables(body.model_dump(exclude_none=True), listing_stamp),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.post("/reports", response_model=ReportResponse)
@@ -50,4 +88,42 @@ async def generate_report(
         except ValueError as exc:
             raise HTTPException(status_code=412, detail=str(exc)) from exc
 
-    return await cma_service.generate_report(body)
+    listing_stamp = await _listing_stamp(db, body.subject_listing_key, *body.comparable_listing_keys)
+    return await cma_service.generate_report(body, listing_stamp)
+
+
+@router.post("/reports/jobs", response_model=ReportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def enqueue_report(
+    body: ReportRequest,
+    db: AsyncSession = Depends(async_get_db),
+    current_user: dict = Depends(get_current_user),
+    subscription_service: SubscriptionService = Depends(get_subscription_service),
+) -> Any:
+    if body.subject_listing_key:
+        try:
+            await subscription_service.add_usage(
+                user_id=current_user["id"], property_id=body.subject_listing_key
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=412, detail=str(exc)) from exc
+
+    listing_stamp = await _listing_stamp(db, body.subject_listing_key, *body.comparable_listing_keys)
+    try:
+        return await enqueue_report_job(current_user["id"], body, listing_stamp)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+
+
+@router.get("/reports/jobs/{job_id}", response_model=ReportJobResponse)
+async def report_job_status(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=60, description="Seconds to wait for the job to finish (long-poll)"),
+    current_user: dict = Depends(get_current_user),
+) -> Any:
+    try:
+        job = await get_report_job(job_id, current_user["id"], wait=wait)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+    if job is None:
+        raise HTTPException(status_code=404, detail="Report job not found")
+    return job
@@ -4,10 +4,13 @@ from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ...core.db.database import async_get_db
+from ...core.db.database import async_get_db, local_session
 from ...crud import crud_property
+from ...models.property import Property as PropertyModel
 from ...models.property import PropertyMedia as PropertyMediaModel
 from ...schemas.property import (
+    NearbyPointOfInterest,
+    NearbyPointsResponse,
     PropertyDetailResponse,
     PropertyListResponse,
     PropertyMediaItem,
@@ -15,11 +18,41 @@ from ...schemas.property import (
     PropertyPrice,
 )
 from ...core.utils.s3 import generate_presigned_url
+from ...core.utils.single_flight import SingleFlight
+from ...services.poi import poi_service
+from ...services.poi.features import PROXIMITY_CATEGORIES, feature_field
+from ...services.poi.index import PointOfInterestEntry
 from ...services.property.service import PropertyService
 from ..dependencies import get_property_service
 
 router = APIRouter(prefix="/properties", tags=["Properties"])
 
+property_detail_flight = SingleFlight("property-detail")
+
+
+def _parse_category_ids(categories: Optional[str]) -> set[int] | None:
+    if not categories:
+        return None
+    try:
+        return {int(c) for c in categories.split(",") if c.strip()}
+    except ValueError:
+        raise HTTPException(status_code=422, detail="categories must be comma-separated category ids")
+
+
+def _nearby_point(entry: PointOfInterestEntry, distance_m: float | None = None) -> NearbyPointOfInterest:
+    return NearbyPointOfInterest(
+        id=entry.id,
+        foursquare_id=entry.foursquare_id,
+        name=entry.name,
+        latitude=entry.latitude,
+        longitude=entry.longitude,
+        address=entry.address,
+        rating=entry.rating,
+        category_ids=sorted(entry.category_ids),
+        categories=poi_service.category_names(entry),
+        distance_m=round(distance_m, 1) if distance_m is not None else None,
+    )
+
 
 @router.get("", response_model=PropertyListResponse)
 async def search_properties(
@@ -34,9 +67,18 @@ async def search_properties(
     max_bedrooms: Optional[int] = Query(None, ge=0, description="Maximum number of bedrooms"),
     min_bathrooms: Optional[int] = Query(None, ge=0, description="Minimum number of bathrooms"),
     max_bathrooms: Optional[int] = Query(None, ge=0, description="Maximum number of bathrooms"),
-    sort_by: Optional[str] = Query(None, description="Sort field: price, bedrooms, bathrooms, created_at, updated_at"),
+    sort_by: Optional[str] = Query(
+        None,
+        description="Sort field: price, bedrooms, bathrooms, created_at, updated_at, or nearest_<category> "
+        "(e.g. nearest_coffee)",
+    ),
     sort_order: Optional[str] = Query("desc", description="Sort order: asc or desc"),
     has_photo: Optional[bool] = Query(None, description="Only return properties with a primary photo"),
+    near: Optional[str] = Query(
+        None,
+        description="Comma-separated category:meters pairs, e.g. coffee:500,park:1000. "
+        f"Categories: {', '.join(PROXIMITY_CATEGORIES)}",
+    ),
 ) -> Any:
     filters: Dict[str, Any] = {}
     if cities:
@@ -62,7 +104,14 @@ async def search_properties(
             r2["lte"] = max_bathrooms
         ranges["bathrooms_total_integer"] = r2
 
-    sort: list[Dict[str, str]] | None = None
+    if near:
+        for item in near.split(","):
+            slug, _, meters = item.strip().partition(":")
+            if slug not in PROXIMITY_CATEGORIES or not meters.isdigit():
+                raise HTTPException(status_code=422, detail=f"Invalid near filter: {item.strip()}")
+            ranges[feature_field(slug, "nearest_m")] = {"lte": int(meters)}
+
+    sort: list[Dict[str, Any]] | None = None
     if sort_by:
         sort_field_map = {
             "price": "list_price",
@@ -72,9 +121,12 @@ async def search_properties(
             "updated_at": "updated_at",
         }
         es_field = sort_field_map.get(sort_by)
+        order = sort_order if sort_order in ("asc", "desc") else "desc"
         if es_field:
-            order = sort_order if sort_order in ("asc", "desc") else "desc"
             sort = [{es_field: order}]
+        elif sort_by.startswith("nearest_") and sort_by[len("nearest_"):] in PROXIMITY_CATEGORIES:
+            # Properties with nothing in walking range have no distance; keep them at the end either way.
+            sort = [{feature_field(sort_by[len("nearest_"):], "nearest_m"): {"order": order, "missing": "_last"}}]
 
     result = await service.search_properties(
         query=query, page=page, limit=limit, filters=filters, ranges=ranges, sort=sort,
@@ -93,23 +145,69 @@ async def suggest_properties(
     return {"suggestions": suggestions}
 
 
-@router.get("/{listing_key}", response_model=PropertyDetailResponse)
-async def get_property(
+@router.get("/nearby", response_model=NearbyPointsResponse)
+async def nearby_points_in_bbox(
+    north: float = Query(..., ge=-90, le=90),
+    south: float = Query(..., ge=-90, le=90),
+    east: float = Query(..., ge=-180, le=180),
+    west: float = Query(..., ge=-180, le=180),
+    categories: Optional[str] = Query(None, description="Comma-separated category ids"),
+    limit: int = Query(200, ge=1, le=1000, description="Maximum number of points"),
+) -> Any:
+    if south > north or west > east:
+        raise HTTPException(status_code=422, detail="Bounding box must satisfy south <= north and west <= east")
+
+    entries = poi_service.index.within_bbox(
+        north=north, south=south, east=east, west=west, category_ids=_parse_category_ids(categories), limit=limit
+    )
+    return NearbyPointsResponse(points=[_nearby_point(entry) for entry in entries], total=len(entries))
+
+
+@router.get("/{listing_key}/nearby", response_model=NearbyPointsResponse)
+async def nearby_points(
     listing_key: str,
     db: AsyncSession = Depends(async_get_db),
+    categories: Optional[str] = Query(None, description="Comma-separated category ids"),
+    limit: int = Query(10, ge=1, le=100, description="Maximum number of points"),
+    radius_m: Optional[float] = Query(None, gt=0, le=50_000, description="Only return points within this distance"),
 ) -> Any:
-    property = await crud_property.get(db, listing_key=listing_key)
-    if not property:
+    result = await db.execute(
+        select(PropertyModel.latitude, PropertyModel.longitude).where(PropertyModel.listing_key == listing_key)
+    )
+    location = result.one_or_none()
+    if location is None:
         raise HTTPException(status_code=404, detail="Property not found")
+    if location.latitude is None or location.longitude is None:
+        return NearbyPointsResponse(points=[], total=0)
 
-    # Query S3-backed media from property_media table
-    media_stmt = (
-        select(PropertyMediaModel)
-        .where(PropertyMediaModel.property_id == listing_key)
-        .order_by(PropertyMediaModel.order)
+    matches = poi_service.index.nearest(
+        location.latitude,
+        location.longitude,
+        k=limit,
+        category_ids=_parse_category_ids(categories),
+        max_distance_m=radius_m,
+    )
+    return NearbyPointsResponse(
+        points=[_nearby_point(entry, distance) for entry, distance in matches], total=len(matches)
     )
-    media_result = await db.execute(media_stmt)
-    media_rows = media_result.scalars().all()
+
+
+async def _load_property_detail(listing_key: str) -> PropertyDetailResponse | None:
+    # Runs on its own session: the load is shared by concurrent requests and must outlive any one of them.
+    async with local_session() as db:
+        property = await crud_property.get(db, listing_key=listing_key)
+        if not property:
+            return None
+
+        # Query S3-backed media from property_media table
+        media_stmt = (
+            select(PropertyMediaModel)
+            .where(PropertyMediaModel.property_id == listing_key)
+            .order_by(PropertyMediaModel.order)
+        )
+        media_result = await db.execute(media_stmt)
+        media_rows = media_result.scalars().all()
+
     media_items = [
         PropertyMediaItem(
             url=generate_presigned_url(row.s3_path),
@@ -145,3 +243,11 @@ async def get_property(
         ),
         rating=0,
     )
+
+
+@router.get("/{listing_key}", response_model=PropertyDetailResponse)
+async def get_property(listing_key: str) -> Any:
+    detail = await property_detail_flight.do(listing_key, lambda: _load_property_detail(listing_key))
+    if detail is None:
+        raise HTTPException(status_code=404, detail="Property not found")
+    return detail
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -7,6 +7,8 @@ from ...core.db.database import async_get_db
 from ...crud import crud_property
 from ...schemas.report import (
     Indicator,
+    ReportBundle,
+    ReportSection,
     SimilarListings,
     Spectrum,
     UpgradeImpact,
@@ -83,3 +85,38 @@ async def get_upgrade_impact(
             raise HTTPException(status_code=412, detail=str(exc)) from exc
 
     return await report_service.get_upgrade_impact(listing_key, property_data)
+
+
+@router.get("/bundle", response_model=ReportBundle)
+async def get_report_bundle(
+    listing_key: str = Query(..., description="Listing key to build the report for"),
+    sections: Optional[str] = Query(
+        None, description="Comma-separated sections: similar_listings, spectrum, upgrade_impact (default: all)"
+    ),
+    indicator: Indicator = Query(Indicator.SALES_PROBABILITY, description="Indicator type for the spectrum"),
+    db: AsyncSession = Depends(async_get_db),
+    current_user: dict | None = Depends(get_optional_user),
+    subscription_service: SubscriptionService = Depends(get_subscription_service),
+) -> Any:
+    try:
+        requested = (
+            list(dict.fromkeys(ReportSection(s.strip()) for s in sections.split(",") if s.strip()))
+            if sections
+            else list(ReportSection)
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=f"Unknown report section: {exc}") from exc
+
+    property_data = await crud_property.get(db, listing_key=listing_key)
+    if not property_data:
+        raise HTTPException(status_code=404, detail="Property not found")
+
+    if current_user:
+        try:
+            await subscription_service.add_usage(
+                user_id=current_user["id"], property_id=listing_key
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=412, detail=str(exc)) from exc
+
+    return await report_service.get_bundle(listing_key, property_data, requested, indicator)
@@ -1,6 +1,6 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from ...schemas.auth import Envelope
 from ...schemas.subscription import ListPlansResponse, UsageReportResponse
@@ -24,8 +24,19 @@ async def usage_report(
     current_user: Annotated[dict, Depends(get_current_user)],
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(20, ge=1, le=100, description="Page size"),
+    cursor: str | None = Query(None, description="next_cursor from the previous page; takes precedence over page"),
+    include_total: bool | None = Query(
+        None, description="Count all usage rows (default: only when paging by page number)"
+    ),
 ) -> Envelope[UsageReportResponse]:
-    report = await service.get_usage_report(
-        user_id=current_user["id"], page=page, limit=limit
-    )
+    try:
+        report = await service.get_usage_report(
+            user_id=current_user["id"],
+            page=page,
+            limit=limit,
+            cursor=cursor,
+            include_total=include_total,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
     return Envelope(data=report)
@@ -4,30 +4,37 @@ from __future__ import annotations
 import argparse
 import asyncio
 from datetime import datetime
+import json
 import logging
 import sys
 
+from app.core.http_clients import http_clients
 from app.core.kafka import kafka_client
 from app.core.mongodb import mongo_client
 from app.core.search.elasticsearch import es_client
 from app.services.cli import (
     DEFAULT_CRAWL_WINDOW,
+    benchmark_inference,
     db_diff,
     db_migrate,
     db_prepare,
     ensure_indices,
+    explain_hot_queries,
     init_all,
     init_db,
     init_kafka_storage,
     init_postgres_data,
     parse_duration,
     promote_pending_notifications,
+    reconcile_usage_meter,
+    refresh_poi_features,
     replay_poison_messages,
     reindex_properties,
     run_crawl,
     run_crawl_csv,
     run_crawl_foursquare,
     run_crawl_foursquare_debug,
+    run_inference_stub,
 )
 
 def _normalize_db_commands(argv: list[str]) -> list[str]:
@@ -84,10 +91,21 @@ async def main_async(args: argparse.Namespace) -> None:
             message = args.message or args.service or "schema"
             db_prepare(message)
             return
+        if args.command == "db:explain":
+            result = await explain_hot_queries()
+            print(json.dumps(result, indent=2))
+            if result["seq_scans"]:
+                raise SystemExit(1)
+            return
         if args.command == "search:reindex":
             result = await reindex_properties(start_after=args.start_after, batch_size=args.batch_size)
             print(result)
             return
+        if args.command == "search:poi-features":
+            since = None if args.since is None else parse_duration(args.since)
+            result = await refresh_poi_features(since=since, batch_size=args.batch_size)
+            print(result)
+            return
         if args.command == "queue:poison:replay":
             result = await replay_poison_messages(
                 limit=args.limit,
@@ -96,6 +114,13 @@ async def main_async(args: argparse.Namespace) -> None:
                 original_topic=args.original_topic,
                 idle_timeout_seconds=args.idle_timeout,
                 group_id=args.group_id,
+                batch_size=args.batch_size,
+                reasons=args.reason,
+                handlers=args.handler,
+                since=args.since,
+                until=args.until,
+                dry_run=args.dry_run,
+                max_rate=args.max_rate,
             )
             print(result)
             return
@@ -103,6 +128,21 @@ async def main_async(args: argparse.Namespace) -> None:
             result = await promote_pending_notifications(now=args.now)
             print(result)
             return
+        if args.command == "subscription:usage:reconcile":
+            result = await reconcile_usage_meter()
+            print(result)
+            return
+        if args.command == "inference:stub":
+            await run_inference_stub(
+                host=args.host, port=args.port, overhead_ms=args.overhead_ms, item_ms=args.item_ms
+            )
+            return
+        if args.command == "inference:bench":
+            result = await benchmark_inference(
+                base_url=args.base_url, requests=args.requests, concurrency=args.concurrency
+            )
+            print(json.dumps(result, indent=2))
+            return
         if args.command == "init":
             result = await init_all()
             print(result)
@@ -124,6 +164,7 @@ async def main_async(args: argparse.Namespace) -> None:
         await kafka_client.close_producer()
         mongo_client.close()
         await es_client.close()
+        await http_clients.aclose()
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -171,6 +212,11 @@ def build_parser() -> argparse.ArgumentParser:
     db_prepare_parser.add_argument("--service", help="Service name (used for message)")
     db_prepare_parser.add_argument("--message", help="Migration message override")
 
+    subparsers.add_parser(
+        "db:explain",
+        help="EXPLAIN the hot Postgres queries and fail if any needs a sequential scan",
+    )
+
     reindex_parser = subparsers.add_parser(
         "search:reindex",
         help="Reindex properties from Postgres into Elasticsearch",
@@ -178,6 +224,16 @@ def build_parser() -> argparse.ArgumentParser:
     reindex_parser.add_argument("--batch-size", type=int, help="Batch size (default 500, max 5000)")
     reindex_parser.add_argument("--start-after", help="Listing key to resume after")
 
+    poi_features_parser = subparsers.add_parser(
+        "search:poi-features",
+        help="Recompute POI proximity fields on indexed properties",
+    )
+    poi_features_parser.add_argument(
+        "--since",
+        help="Only refresh properties near POIs changed within this window, like 6h or 2d (default: all)",
+    )
+    poi_features_parser.add_argument("--batch-size", type=int, help="Batch size (default 500, max 5000)")
+
     replay_parser = subparsers.add_parser(
         "queue:poison:replay",
         help="Replay messages from a poison topic back to their original topics",
@@ -192,6 +248,25 @@ def build_parser() -> argparse.ArgumentParser:
     replay_parser.add_argument("--original-topic", help="Fallback original topic if header missing")
     replay_parser.add_argument("--idle-timeout", type=float, default=2.0, help="Idle timeout seconds")
     replay_parser.add_argument("--group-id", help="Consumer group ID override")
+    replay_parser.add_argument("--batch-size", type=int, help="Messages fetched and committed per batch (default 500)")
+    replay_parser.add_argument(
+        "--reason",
+        action="append",
+        help="Only replay messages whose poisoned_reason contains this text (repeatable)",
+    )
+    replay_parser.add_argument(
+        "--handler",
+        action="append",
+        help="Only replay messages poisoned by this handler (repeatable)",
+    )
+    replay_parser.add_argument("--since", type=_parse_datetime, help="Only replay messages poisoned at or after (ISO 8601)")
+    replay_parser.add_argument("--until", type=_parse_datetime, help="Only replay messages poisoned before (ISO 8601)")
+    replay_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Count matching messages per original topic without replaying or committing",
+    )
+    replay_parser.add_argument("--max-rate", type=float, help="Maximum replayed messages per second")
 
     promote_parser = subparsers.add_parser(
         "notification:pending:promote",
@@ -199,6 +274,28 @@ def build_parser() -> argparse.ArgumentParser:
     )
     promote_parser.add_argument("--now", type=_parse_datetime, help="Override current time (ISO 8601)")
 
+    subparsers.add_parser(
+        "subscription:usage:reconcile",
+        help="Flush metered usage to Postgres and rebuild the Redis usage meter from it",
+    )
+
+    stub_parser = subparsers.add_parser(
+        "inference:stub",
+        help="Serve a local inference stub with single and batch endpoints for benchmarking",
+    )
+    stub_parser.add_argument("--host", default="127.0.0.1", help="Bind host (default 127.0.0.1)")
+    stub_parser.add_argument("--port", type=int, default=8089, help="Bind port (default 8089)")
+    stub_parser.add_argument("--overhead-ms", type=float, default=20.0, help="Cost of each forward pass (default 20)")
+    stub_parser.add_argument("--item-ms", type=float, default=1.0, help="Added cost per item in a pass (default 1)")
+
+    bench_parser = subparsers.add_parser(
+        "inference:bench",
+        help="Compare unbatched and micro-batched inference throughput",
+    )
+    bench_parser.add_argument("--base-url", help="Inference base URL (default INFERENCE_API_BASE_URL)")
+    bench_parser.add_argument("--requests", type=int, default=500, help="Number of calls (default 500)")
+    bench_parser.add_argument("--concurrency", type=int, default=64, help="Calls in flight at once (default 64)")
+
     subparsers.add_parser("init", help="Initialize postgres data dir, elasticsearch indices, and kafka storage")
     subparsers.add_parser("db:init", help="Initialize database schemas and tables")
     subparsers.add_parser("init_kafka", help="Initialize Kafka storage (devbox)")
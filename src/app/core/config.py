@@ -1,5 +1,6 @@
 import os
 from enum import Enum
+from typing import Any, Literal
 
 from pydantic import AliasChoices, Field, SecretStr, computed_field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -17,12 +18,18 @@ class IngestSettings(BaseSettings):
     MLS_SOURCE: str = "local_file"
     MLS_STORAGE_LOCAL_DIRECTORY: str = "tmp/properties_dump"
     MLS_RAW_MESSAGE_TOPIC: str = "backend-ingest-mls-raw"
+    # "json" (legacy) or "binary" (versioned envelope); switch to "binary" only once every consumer
+    # decodes both formats via the content-type header
+    MLS_RAW_MESSAGE_FORMAT: Literal["json", "binary"] = "json"
 
     MLS_REALTYFEED_URL: str = ""
     MLS_REALTYFEED_CLIENT_ID: str = ""
     MLS_REALTYFEED_CLIENT_SECRET: str = ""
 
     FOURSQUARE_API_KEY: str = ""
+    FOURSQUARE_CRAWL_CONCURRENCY: int = 4
+    FOURSQUARE_TILE_TREE_PATH: str = "tmp/foursquare_tiles.json"
+    FOURSQUARE_SPLIT_PAGE_DEPTH: int = 2
 
 
 class AppSettings(BaseSettings):
@@ -39,6 +46,8 @@ class CryptSettings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    PASSWORD_HASH_WORKERS: int = 4
+    TOKEN_CACHE_MAXSIZE: int = 10000
 
 
 class FileLoggerSettings(BaseSettings):
@@ -151,6 +160,10 @@ class KafkaSettings(BaseSettings):
     KAFKA_BOOTSTRAP_SERVERS: str = "localhost:9092"
     KAFKA_CLIENT_ID: str = "zaminai-backend"
     KAFKA_CONSUMER_GROUP: str = "zaminai-ingest"
+    KAFKA_CONSUMER_MAX_BATCH_SIZE: int = 500
+    KAFKA_CONSUMER_POLL_TIMEOUT_MS: int = 1000
+    KAFKA_CONSUMER_MAX_ATTEMPTS: int = 3
+    KAFKA_CONSUMER_RETRY_BACKOFF_SECONDS: float = 0.5
 
 class FirstUserSettings(BaseSettings):
     ADMIN_NAME: str = "admin"
@@ -179,6 +192,40 @@ class RedisCacheSettings(BaseSettings):
         return f"redis://{credentials}{self.REDIS_CACHE_HOST}:{self.REDIS_CACHE_PORT}/{self.REDIS_CACHE_DB}"
 
 
+class PrincipalCacheSettings(BaseSettings):
+    PRINCIPAL_CACHE_ENABLED: bool = True
+    PRINCIPAL_CACHE_LOCAL_TTL: int = 30
+    PRINCIPAL_CACHE_LOCAL_MAXSIZE: int = 10000
+    PRINCIPAL_CACHE_REDIS_TTL: int = 300
+
+
+class UsageMeterSettings(BaseSettings):
+    USAGE_METER_ENABLED: bool = True
+    USAGE_METER_STATE_TTL: int = 3600
+    USAGE_METER_FLUSH_INTERVAL_SECONDS: float = 2.0
+    USAGE_METER_FLUSH_BATCH_SIZE: int = 500
+
+
+class SubscriptionSummaryCacheSettings(BaseSettings):
+    SUBSCRIPTION_SUMMARY_CACHE_ENABLED: bool = True
+    SUBSCRIPTION_SUMMARY_CACHE_TTL: int = 60
+
+
+class ResponseCacheSettings(BaseSettings):
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_DEFAULT_TTL: int = 600
+    RESPONSE_CACHE_STALE_SECONDS: int = 3600
+    # JSON object of fresh TTLs in seconds keyed by namespace, e.g. {"comparables.llm": 3600, "spectrum": 900}
+    RESPONSE_CACHE_TTLS: dict[str, int] = {}
+
+
+class SingleFlightSettings(BaseSettings):
+    SINGLE_FLIGHT_REDIS_ENABLED: bool = False
+    SINGLE_FLIGHT_LOCK_SECONDS: int = 90
+    SINGLE_FLIGHT_RESULT_SECONDS: int = 10
+    SINGLE_FLIGHT_POLL_INTERVAL: float = 0.05
+
+
 class ClientSideCacheSettings(BaseSettings):
     CLIENT_CACHE_MAX_AGE: int = 60
 
@@ -216,6 +263,9 @@ class RedisRateLimiterSettings(BaseSettings):
 class DefaultRateLimitSettings(BaseSettings):
     DEFAULT_RATE_LIMIT_LIMIT: int = 10
     DEFAULT_RATE_LIMIT_PERIOD: int = 3600
+    # JSON object keyed by sanitized path, e.g. {"/api/v1/cma/comparables": {"limit": 100, "period": 3600, "cost": 10}}
+    RATE_LIMIT_ROUTES: dict[str, dict[str, int]] = {}
+    RATE_LIMIT_LOCAL_PRECHECK: bool = True
 
 
 class CRUDAdminSettings(BaseSettings):
@@ -302,10 +352,69 @@ class S3Settings(BaseSettings):
     S3_ENDPOINT_URL: str = ""
 
 
+class PointOfInterestSettings(BaseSettings):
+    POI_INDEX_ENABLED: bool = True
+    POI_INDEX_CELL_DEGREES: float = 0.005
+    POI_INDEX_REFRESH_SECONDS: int = 300
+
+
 class CMASettings(BaseSettings):
     CMA_API_BASE_URL: str = "http://localhost:9000"
     CMA_API_KEY: str = ""
     CMA_API_TIMEOUT: int = 60
+    CMA_REPORT_JOB_RESULT_TTL: int = 3600
+    CMA_REPORT_JOB_MAX_WAIT: float = 30.0
+    # The upstream exposes POST /api/v1/comparables/stream (SSE); otherwise stage events are synthesized.
+    CMA_API_STREAMING: bool = False
+    CMA_STREAM_HEARTBEAT_SECONDS: float = 2.0
+    # In-process baseline engine (needs the "comparables" extra): strategy=baseline_local and 5xx fallback.
+    BASELINE_ENGINE_ENABLED: bool = False
+    BASELINE_ENGINE_FALLBACK: bool = True
+    BASELINE_ENGINE_REFRESH_SECONDS: int = 60
+    BASELINE_ENGINE_PREFILTER: int = 200
+    BASELINE_ENGINE_STATUSES: list[str] = ["Active", "Active Under Contract", "Pending"]
+    # Send Elasticsearch geo-prefiltered candidate_properties with llm comparables requests.
+    CMA_PREFILTER_ENABLED: bool = False
+    CMA_PREFILTER_RADIUS_KM: float = 15.0
+    CMA_PREFILTER_CACHE_TTL: int = 300
+    CMA_PREFILTER_CACHE_MAXSIZE: int = 2048
+    CMA_PREFILTER_COLUMNS: list[str] = [
+        "city",
+        "postal_code",
+        "property_type",
+        "property_sub_type",
+        "standard_status",
+        "list_price",
+        "close_price",
+        "bedrooms_total",
+        "bathrooms_total_integer",
+        "living_area",
+        "lot_size_square_feet",
+        "year_built",
+    ]
+
+
+class InferenceSettings(BaseSettings):
+    INFERENCE_API_BASE_URL: str = "http://property-inference"
+    INFERENCE_API_TIMEOUT: int = 30
+    REPORT_BUNDLE_SECTION_TIMEOUT: float = 25.0
+    REPORT_PAYLOAD_CACHE_MAXSIZE: int = 2048
+    REPORT_PAYLOAD_CACHE_TTL: int = 600
+    # Coalesce concurrent calls per inference path into POST {path}/batch requests.
+    INFERENCE_BATCH_ENABLED: bool = False
+    INFERENCE_BATCH_WINDOW_MS: float = 5.0
+    INFERENCE_BATCH_MAX_SIZE: int = 32
+
+
+class HttpClientSettings(BaseSettings):
+    HTTP_CLIENT_TIMEOUT: float = 5.0
+    HTTP_CLIENT_CONNECT_TIMEOUT: float = 5.0
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 100
+    HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_CLIENT_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_CLIENT_HTTP2: bool = False
+    # JSON object keyed by upstream (cma, inference, google, foursquare, realtyfeed), e.g. {"cma": {"max_connections": 50}}
+    HTTP_CLIENT_UPSTREAMS: dict[str, dict[str, Any]] = {}
 
 
 class Settings(
@@ -317,6 +426,11 @@ class Settings(
     FirstUserSettings,
     TestSettings,
     RedisCacheSettings,
+    PrincipalCacheSettings,
+    UsageMeterSettings,
+    SubscriptionSummaryCacheSettings,
+    ResponseCacheSettings,
+    SingleFlightSettings,
     ClientSideCacheSettings,
     RedisQueueSettings,
     RedisRateLimiterSettings,
@@ -333,7 +447,10 @@ class Settings(
     ElasticsearchSettings,
     KafkaSettings,
     IngestSettings,
+    PointOfInterestSettings,
     CMASettings,
+    InferenceSettings,
+    HttpClientSettings,
     S3Settings,
 ):
     model_config = SettingsConfigDict(
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+import importlib.util
+import logging
+from typing import Any
+
+import httpx
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+@dataclass(frozen=True)
+class UpstreamConfig:
+    base_url: str = ""
+    timeout: float = settings.HTTP_CLIENT_TIMEOUT
+    connect_timeout: float = settings.HTTP_CLIENT_CONNECT_TIMEOUT
+    max_connections: int = settings.HTTP_CLIENT_MAX_CONNECTIONS
+    max_keepalive_connections: int = settings.HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS
+    keepalive_expiry: float = settings.HTTP_CLIENT_KEEPALIVE_EXPIRY
+    http2: bool = settings.HTTP_CLIENT_HTTP2
+
+
+class HttpClientRegistry:
+    """Long-lived, pooled `httpx.AsyncClient` per upstream service.
+
+    Clients are created on first use (or eagerly by the app lifespan) and closed together on
+    shutdown. Per-upstream limits come from the registered defaults, overridden by
+    `HTTP_CLIENT_UPSTREAMS`.
+    """
+
+    def __init__(self) -> None:
+        self._configs: dict[str, UpstreamConfig] = {}
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    def register(self, name: str, config: UpstreamConfig) -> None:
+        overrides: dict[str, Any] = settings.HTTP_CLIENT_UPSTREAMS.get(name, {})
+        self._configs[name] = replace(config, **overrides)
+
+    def config(self, name: str) -> UpstreamConfig:
+        return self._configs[name]
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._clients[name] = self._build(name, self._configs[name])
+        return client
+
+    @staticmethod
+    def _build(name: str, config: UpstreamConfig) -> httpx.AsyncClient:
+        http2 = config.http2
+        if http2 and not HTTP2_AVAILABLE:
+            logger.warning(f"HTTP/2 requested for {name} but the h2 package is not installed; using HTTP/1.1")
+            http2 = False
+        return httpx.AsyncClient(
+            base_url=config.base_url,
+            timeout=httpx.Timeout(config.timeout, connect=config.connect_timeout),
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry,
+            ),
+            http2=http2,
+        )
+
+    def open_all(self) -> None:
+        for name in self._configs:
+            self.get(name)
+
+    async def aclose(self) -> None:
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+
+http_clients = HttpClientRegistry()
+http_clients.register(
+    "cma",
+    UpstreamConfig(base_url=settings.CMA_API_BASE_URL.rstrip("/"), timeout=settings.CMA_API_TIMEOUT),
+)
+http_clients.register(
+    "inference",
+    UpstreamConfig(base_url=settings.INFERENCE_API_BASE_URL.rstrip("/"), timeout=settings.INFERENCE_API_TIMEOUT),
+)
+http_clients.register("google", UpstreamConfig(timeout=10.0, max_connections=20, max_keepalive_connections=5))
+http_clients.register("foursquare", UpstreamConfig(max_connections=settings.FOURSQUARE_CRAWL_CONCURRENCY * 2))
+http_clients.register("realtyfeed", UpstreamConfig(timeout=60.0, max_connections=10, max_keepalive_connections=5))
@@ -1,7 +1,28 @@
+import re
+from typing import Any
+
 from aiokafka import AIOKafkaConsumer, AIOKafkaProducer
 
 from .config import settings
 
+POISONED_TOPIC_HEADER = "poisoned_topic"
+POISONED_HANDLER_HEADER = "poisoned_handler"
+POISONED_SUBSCRIBER_HEADER = "poisoned_subscriber"
+POISONED_REASON_HEADER = "poisoned_reason"
+POISONED_AT_HEADER = "poisoned-at"
+POISON_QUEUE_TOPIC_HEADER = "poison-queue-topic"
+
+
+def _sanitize_topic(value: str) -> str:
+    cleaned = re.sub(r"[^a-zA-Z0-9-]+", "-", value.strip().lower())
+    cleaned = re.sub(r"-+", "-", cleaned).strip("-")
+    return cleaned or "app"
+
+
+def poison_topic_name() -> str:
+    base = settings.KAFKA_CLIENT_ID or settings.APP_NAME
+    return f"backend-{_sanitize_topic(base)}-poison-queue"
+
 
 class KafkaClient:
     def __init__(self) -> None:
@@ -20,12 +41,13 @@ class KafkaClient:
             await self.producer.start()
         return self.producer
 
-    async def create_consumer(self, *topics: str, group_id: str | None = None) -> AIOKafkaConsumer:
+    async def create_consumer(self, *topics: str, group_id: str | None = None, **kwargs: Any) -> AIOKafkaConsumer:
         consumer = AIOKafkaConsumer(
             *topics,
             bootstrap_servers=self._bootstrap_servers(),
             client_id=settings.KAFKA_CLIENT_ID,
             group_id=group_id or settings.KAFKA_CONSUMER_GROUP,
+            **kwargs,
         )
         await consumer.start()
         return consumer
@@ -0,0 +1,207 @@
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+
+from aiokafka import AIOKafkaConsumer, ConsumerRecord, TopicPartition
+from aiokafka.errors import CommitFailedError
+
+from .config import settings
+from .kafka import (
+    POISON_QUEUE_TOPIC_HEADER,
+    POISONED_AT_HEADER,
+    POISONED_HANDLER_HEADER,
+    POISONED_REASON_HEADER,
+    POISONED_SUBSCRIBER_HEADER,
+    POISONED_TOPIC_HEADER,
+    kafka_client,
+    poison_topic_name,
+)
+
+logger = logging.getLogger(__name__)
+
+BatchHandler = Callable[[list[ConsumerRecord]], Awaitable[None]]
+
+MAX_REASON_LENGTH = 1024
+
+
+@dataclass
+class ConsumerStats:
+    started_at: float = field(default_factory=time.monotonic)
+    records: int = 0
+    batches: int = 0
+    poisoned: int = 0
+    retries: int = 0
+    commit_failures: int = 0
+    lag: dict[str, int] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, Any]:
+        elapsed = time.monotonic() - self.started_at
+        return {
+            "records": self.records,
+            "batches": self.batches,
+            "poisoned": self.poisoned,
+            "retries": self.retries,
+            "commit_failures": self.commit_failures,
+            "elapsed_seconds": round(elapsed, 3),
+            "throughput_per_second": round(self.records / elapsed, 2) if elapsed > 0 else 0.0,
+            "lag": dict(self.lag),
+            "total_lag": sum(self.lag.values()),
+        }
+
+
+class BatchConsumer:
+    """Consume topics in batches and hand each partition's records to `handler` in offset order.
+
+    Partitions of one poll run concurrently; offsets are committed only after every partition in the
+    poll has been handled. A batch that keeps failing is retried record by record, and records that
+    still fail are written to the poison queue so `kafka_poison.py` can inspect and replay them.
+    """
+
+    def __init__(
+        self,
+        *topics: str,
+        handler: BatchHandler,
+        group_id: str | None = None,
+        name: str | None = None,
+        max_batch_size: int | None = None,
+        poll_timeout_ms: int | None = None,
+        max_attempts: int | None = None,
+        retry_backoff_seconds: float | None = None,
+        poison_topic: str | None = None,
+    ) -> None:
+        if not topics:
+            raise ValueError("at least one topic is required")
+        self.topics = topics
+        self.handler = handler
+        self.group_id = group_id or settings.KAFKA_CONSUMER_GROUP
+        self.name = name or getattr(handler, "__qualname__", repr(handler))
+        self.max_batch_size = max_batch_size or settings.KAFKA_CONSUMER_MAX_BATCH_SIZE
+        self.poll_timeout_ms = poll_timeout_ms or settings.KAFKA_CONSUMER_POLL_TIMEOUT_MS
+        self.max_attempts = max(1, max_attempts or settings.KAFKA_CONSUMER_MAX_ATTEMPTS)
+        self.retry_backoff_seconds = (
+            settings.KAFKA_CONSUMER_RETRY_BACKOFF_SECONDS if retry_backoff_seconds is None else retry_backoff_seconds
+        )
+        self.poison_topic = poison_topic or poison_topic_name()
+        self.stats = ConsumerStats()
+        self._consumer: AIOKafkaConsumer | None = None
+        self._stopping = asyncio.Event()
+
+    async def start(self) -> None:
+        if self._consumer is not None:
+            return
+        self._consumer = await kafka_client.create_consumer(
+            *self.topics,
+            group_id=self.group_id,
+            enable_auto_commit=False,
+            auto_offset_reset="earliest",
+        )
+        self.stats = ConsumerStats()
+        self._stopping.clear()
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._consumer is not None:
+            await self._consumer.stop()
+            self._consumer = None
+
+    def request_stop(self) -> None:
+        self._stopping.set()
+
+    async def run(self) -> None:
+        await self.start()
+        try:
+            while not self._stopping.is_set():
+                await self.poll_once()
+        finally:
+            await self.stop()
+
+    async def poll_once(self) -> int:
+        """Fetch, handle and commit one poll. Returns the number of records handled."""
+        if self._consumer is None:
+            raise RuntimeError("consumer is not started")
+        consumer = self._consumer
+
+        batch = await consumer.getmany(timeout_ms=self.poll_timeout_ms, max_records=self.max_batch_size)
+        if not batch:
+            return 0
+
+        await asyncio.gather(*(self._handle_partition(records) for records in batch.values() if records))
+
+        offsets = {tp: records[-1].offset + 1 for tp, records in batch.items() if records}
+        try:
+            await consumer.commit(offsets)
+        except CommitFailedError:
+            # The group rebalanced while we were handling; the new owner will redeliver these records.
+            self.stats.commit_failures += 1
+            logger.warning("Commit failed for %s after rebalance; records will be redelivered", self.name)
+
+        count = sum(len(records) for records in batch.values())
+        self.stats.records += count
+        self.stats.batches += 1
+        self._update_lag(consumer, offsets)
+        return count
+
+    def _update_lag(self, consumer: AIOKafkaConsumer, offsets: dict[TopicPartition, int]) -> None:
+        for tp, next_offset in offsets.items():
+            highwater = consumer.highwater(tp)
+            if highwater is not None:
+                self.stats.lag[f"{tp.topic}-{tp.partition}"] = max(highwater - next_offset, 0)
+
+    async def _handle_partition(self, records: list[ConsumerRecord]) -> None:
+        try:
+            await self._call_with_retries(records)
+            return
+        except Exception as exc:
+            if len(records) == 1:
+                await self._poison(records[0], exc)
+                return
+            logger.warning(
+                "Batch of %s records from %s-%s failed in %s; isolating records: %s",
+                len(records),
+                records[0].topic,
+                records[0].partition,
+                self.name,
+                exc,
+            )
+
+        for record in records:
+            try:
+                await self._call_with_retries([record])
+            except Exception as exc:
+                await self._poison(record, exc)
+
+    async def _call_with_retries(self, records: list[ConsumerRecord]) -> None:
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                await self.handler(records)
+                return
+            except Exception:
+                if attempt == self.max_attempts:
+                    raise
+                self.stats.retries += 1
+                await asyncio.sleep(self.retry_backoff_seconds * attempt)
+
+    async def _poison(self, record: ConsumerRecord, exc: Exception) -> None:
+        reason = f"{type(exc).__name__}: {exc}"[:MAX_REASON_LENGTH]
+        headers = [(key, value) for key, value in record.headers or () if not key.startswith("poison")]
+        headers.extend(
+            [
+                (POISONED_TOPIC_HEADER, record.topic.encode()),
+                (POISONED_HANDLER_HEADER, self.name.encode()),
+                (POISONED_SUBSCRIBER_HEADER, self.group_id.encode()),
+                (POISONED_REASON_HEADER, reason.encode()),
+                (POISONED_AT_HEADER, datetime.now(UTC).isoformat().encode()),
+                (POISON_QUEUE_TOPIC_HEADER, self.poison_topic.encode()),
+            ]
+        )
+        producer = await kafka_client.get_producer()
+        # Failing to park the record must not lose it, so this raises and skips the commit.
+        await producer.send_and_wait(self.poison_topic, record.value, key=record.key, headers=headers)
+        self.stats.poisoned += 1
+        logger.error(
+            "Poisoned %s-%s@%s from %s: %s", record.topic, record.partition, record.offset, self.name, reason
+        )
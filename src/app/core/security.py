@@ -1,6 +1,12 @@
+import asyncio
+import hashlib
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from enum import Enum
-from typing import Any, Literal
+from typing import Any, Callable, Literal, TypeVar
 
 import bcrypt
 from fastapi.security import OAuth2PasswordBearer
@@ -11,6 +17,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from ..crud.crud_users import crud_users
 from .config import settings
 from .schemas import TokenData
+from .utils.ttl_cache import TTLCache
 
 SECRET_KEY: SecretStr = settings.SECRET_KEY
 ALGORITHM = settings.ALGORITHM
@@ -19,19 +26,122 @@ REFRESH_TOKEN_EXPIRE_DAYS = settings.REFRESH_TOKEN_EXPIRE_DAYS
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/login")
 
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Queue waits above this are logged; they mean the pool is saturated by a login burst.
+SLOW_QUEUE_WAIT_SECONDS = 1.0
+
+# sha256(token) -> (token_type, TokenData); each entry expires with the token's own `exp`.
+_verified_tokens = TTLCache(maxsize=settings.TOKEN_CACHE_MAXSIZE, ttl=0)
+
 
 class TokenType(str, Enum):
     ACCESS = "access"
     REFRESH = "refresh"
 
 
+@dataclass
+class PasswordHashStats:
+    calls: int = 0
+    in_flight: int = 0
+    queue_wait_seconds: float = 0.0
+    max_queue_wait_seconds: float = 0.0
+    hash_seconds: float = 0.0
+    max_hash_seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        completed = max(self.calls - self.in_flight, 1)
+        return {
+            "calls": self.calls,
+            "in_flight": self.in_flight,
+            "avg_queue_wait_ms": round(self.queue_wait_seconds / completed * 1000, 2),
+            "max_queue_wait_ms": round(self.max_queue_wait_seconds * 1000, 2),
+            "avg_hash_ms": round(self.hash_seconds / completed * 1000, 2),
+            "max_hash_ms": round(self.max_hash_seconds * 1000, 2),
+        }
+
+
+class PasswordHasher:
+    """Runs bcrypt on a small dedicated thread pool so it never blocks the event loop.
+
+    bcrypt releases the GIL, so threads give real parallelism. The pool size caps how many hashes run
+    at once; a login burst queues here instead of stalling every other request on the worker.
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        self.max_workers = max(1, max_workers)
+        self.stats = PasswordHashStats()
+        self._executor: ThreadPoolExecutor | None = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        submitted_at = time.perf_counter()
+        timings: dict[str, float] = {}
+
+        def timed() -> T:
+            started_at = time.perf_counter()
+            timings["queue_wait"] = started_at - submitted_at
+            try:
+                return func(*args)
+            finally:
+                timings["hash"] = time.perf_counter() - started_at
+
+        self.stats.calls += 1
+        self.stats.in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), timed)
+        finally:
+            self.stats.in_flight -= 1
+            queue_wait = timings.get("queue_wait", 0.0)
+            hash_time = timings.get("hash", 0.0)
+            self.stats.queue_wait_seconds += queue_wait
+            self.stats.max_queue_wait_seconds = max(self.stats.max_queue_wait_seconds, queue_wait)
+            self.stats.hash_seconds += hash_time
+            self.stats.max_hash_seconds = max(self.stats.max_hash_seconds, hash_time)
+            if queue_wait > SLOW_QUEUE_WAIT_SECONDS:
+                logger.warning(f"Password hashing queue wait {queue_wait:.2f}s (pool size {self.max_workers})")
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(bcrypt.checkpw, plain_password.encode(), hashed_password.encode())
+
+    async def hash(self, password: str) -> str:
+        hashed: bytes = await self._run(_hash_password_bytes, password.encode())
+        return hashed.decode()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def _hash_password_bytes(password: bytes) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt())
+
+
+password_hasher = PasswordHasher(max_workers=settings.PASSWORD_HASH_WORKERS)
+
+
 async def verify_password(plain_password: str, hashed_password: str) -> bool:
-    correct_password: bool = bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+    correct_password: bool = await password_hasher.verify(plain_password, hashed_password)
     return correct_password
 
 
+async def hash_password(password: str) -> str:
+    return await password_hasher.hash(password)
+
+
 def get_password_hash(password: str) -> str:
-    hashed_password: str = bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+    """Synchronous hash for callers that cannot await (the admin `PasswordTransformer`).
+
+    Request handlers should use `hash_password`, which keeps bcrypt off the event loop.
+    """
+    hashed_password: str = _hash_password_bytes(password.encode()).decode()
     return hashed_password
 
 
@@ -87,15 +197,31 @@ async def verify_token(token: str, expected_token_type: TokenType) -> TokenData
     TokenData | None
         TokenData instance if the token is valid, None otherwise.
     """
+    digest = hashlib.sha256(token.encode()).digest()
+    cached = _verified_tokens.get(digest)
+    if cached is not None:
+        token_type, token_data = cached
+        return token_data if token_type == expected_token_type else None
+
     try:
         payload = jwt.decode(token, SECRET_KEY.get_secret_value(), algorithms=[ALGORITHM])
         username_or_email: str | None = payload.get("sub")
         token_type: str | None = payload.get("token_type")
 
-        if username_or_email is None or token_type != expected_token_type:
+        if username_or_email is None or token_type is None:
+            return None
+
+        token_data = TokenData(username_or_email=username_or_email)
+        expires_at = payload.get("exp")
+        if isinstance(expires_at, int | float):
+            remaining = expires_at - time.time()
+            if remaining > 0:
+                _verified_tokens.set(digest, (token_type, token_data), ttl=remaining)
+
+        if token_type != expected_token_type:
             return None
 
-        return TokenData(username_or_email=username_or_email)
+        return token_data
 
     except JWTError:
         return None
@@ -14,30 +14,41 @@ from fastapi.openapi.utils import get_openapi
 from sqlalchemy import text
 
 from ..api.dependencies import get_current_superuser
+from ..core.utils.principal_cache import principal_cache
 from ..core.utils.rate_limit import rate_limiter
 from ..middleware.api_key_middleware import APIKeyMiddleware
 from ..middleware.client_cache_middleware import ClientCacheMiddleware
 from ..middleware.logger_middleware import LoggerMiddleware
 from ..models import *  # noqa: F403
+from ..services.cma.baseline import baseline_engine
+from ..services.poi import poi_service
+from ..services.subscription.meter import usage_meter
 from .config import (
     APISettings,
     AppSettings,
+    CMASettings,
     ClientSideCacheSettings,
     CORSSettings,
+    CryptSettings,
     DatabaseSettings,
     EnvironmentOption,
     EnvironmentSettings,
+    HttpClientSettings,
     KafkaSettings,
     MongoDBSettings,
+    PointOfInterestSettings,
     RedisCacheSettings,
     RedisQueueSettings,
     RedisRateLimiterSettings,
+    UsageMeterSettings,
     settings,
 )
 from .db.database import Base
 from .db.database import async_engine as engine
+from .http_clients import http_clients
 from .kafka import kafka_client
 from .mongodb import mongo_client
+from .security import password_hasher
 from .utils import cache, queue
 
 
@@ -52,9 +63,11 @@ async def create_tables() -> None:
 async def create_redis_cache_pool() -> None:
     cache.pool = redis.ConnectionPool.from_url(settings.REDIS_CACHE_URL)
     cache.client = redis.Redis.from_pool(cache.pool)  # type: ignore
+    principal_cache.start_listener()
 
 
 async def close_redis_cache_pool() -> None:
+    await principal_cache.stop_listener()
     if cache.client is not None:
         await cache.client.aclose()  # type: ignore
 
@@ -112,6 +125,42 @@ async def close_kafka_producer() -> None:
     await kafka_client.close_producer()
 
 
+# -------------- http clients --------------
+async def create_http_clients() -> None:
+    http_clients.open_all()
+
+
+async def close_http_clients() -> None:
+    await http_clients.aclose()
+
+
+# -------------- points of interest --------------
+async def create_poi_index() -> None:
+    await poi_service.start()
+
+
+async def close_poi_index() -> None:
+    await poi_service.stop()
+
+
+# -------------- baseline comparables --------------
+async def start_baseline_engine() -> None:
+    await baseline_engine.start()
+
+
+async def stop_baseline_engine() -> None:
+    await baseline_engine.stop()
+
+
+# -------------- usage meter --------------
+async def start_usage_meter() -> None:
+    usage_meter.start_flusher()
+
+
+async def stop_usage_meter() -> None:
+    await usage_meter.stop_flusher()
+
+
 # -------------- application --------------
 async def set_threadpool_tokens(number_of_tokens: int = 100) -> None:
     limiter = anyio.to_thread.current_default_thread_limiter()
@@ -127,6 +176,7 @@ def lifespan_factory(
         | CORSSettings
         | KafkaSettings
         | MongoDBSettings
+        | PointOfInterestSettings
         | RedisQueueSettings
         | RedisRateLimiterSettings
         | EnvironmentSettings
@@ -149,6 +199,9 @@ def lifespan_factory(
             if isinstance(settings, RedisCacheSettings):
                 await create_redis_cache_pool()
 
+            if isinstance(settings, RedisCacheSettings) and isinstance(settings, UsageMeterSettings):
+                await start_usage_meter()
+
             if isinstance(settings, RedisQueueSettings):
                 await create_redis_queue_pool()
 
@@ -161,14 +214,27 @@ def lifespan_factory(
             if isinstance(settings, KafkaSettings):
                 await create_kafka_producer()
 
+            if isinstance(settings, HttpClientSettings):
+                await create_http_clients()
+
             if create_tables_on_start:
                 await create_tables()
 
+            if isinstance(settings, PointOfInterestSettings) and settings.POI_INDEX_ENABLED:
+                await create_poi_index()
+
+            if isinstance(settings, CMASettings) and settings.BASELINE_ENGINE_ENABLED:
+                await start_baseline_engine()
+
             initialization_complete.set()
 
             yield
 
         finally:
+            # Drains queued usage rows, so it has to run while the cache pool is still open.
+            if isinstance(settings, UsageMeterSettings):
+                await stop_usage_meter()
+
             if isinstance(settings, RedisCacheSettings):
                 await close_redis_cache_pool()
 
@@ -184,6 +250,18 @@ def lifespan_factory(
             if isinstance(settings, MongoDBSettings):
                 await close_mongo_client()
 
+            if isinstance(settings, PointOfInterestSettings):
+                await close_poi_index()
+
+            if isinstance(settings, CMASettings):
+                await stop_baseline_engine()
+
+            if isinstance(settings, HttpClientSettings):
+                await close_http_clients()
+
+            if isinstance(settings, CryptSettings):
+                password_hasher.shutdown()
+
     return lifespan
 
 
@@ -198,6 +276,7 @@ def create_application(
         | CORSSettings
         | KafkaSettings
         | MongoDBSettings
+        | PointOfInterestSettings
         | RedisQueueSettings
         | RedisRateLimiterSettings
         | EnvironmentSettings
@@ -226,8 +305,12 @@ def create_application(
         - RedisCacheSettings: Sets up event handlers for creating and closing a Redis cache pool.
         - ClientSideCacheSettings: Integrates middleware for client-side caching.
         - CORSSettings: Integrates CORS middleware with specified origins.
+        - HttpClientSettings: Opens the pooled upstream HTTP clients on startup and closes them on shutdown.
         - KafkaSettings: Sets up a Kafka producer on startup and closes it on shutdown.
         - MongoDBSettings: Sets up a MongoDB client on startup and closes it on shutdown.
+        - PointOfInterestSettings: Builds the in-memory POI index on startup and keeps it refreshed.
+        - CMASettings: Loads the in-process baseline comparables snapshots when BASELINE_ENGINE_ENABLED is set.
+        - UsageMeterSettings: Runs the task that writes metered subscription usage from Redis to Postgres.
         - RedisQueueSettings: Sets up event handlers for creating and closing a Redis queue pool.
         - RedisRateLimiterSettings: Sets up event handlers for creating and closing a Redis rate limiter pool.
         - EnvironmentSettings: Conditionally sets documentation URLs and integrates custom routes for API documentation
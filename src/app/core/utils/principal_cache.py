@@ -0,0 +1,147 @@
+import asyncio
+import json
+import logging
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from redis.exceptions import RedisError
+
+from ..config import settings
+from . import cache
+from .ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "principal:"
+INVALIDATION_CHANNEL = "principal-invalidate"
+INVALIDATE_ALL = "*"
+
+# Never cached; the principal is what request handlers see as `current_user`.
+EXCLUDED_FIELDS = frozenset({"password_hash"})
+
+
+class PrincipalCache:
+    """Two-level cache of authenticated users keyed by token subject (email or username).
+
+    Lookups hit an in-process TTL LRU first, then Redis. Invalidations delete the Redis entry and are
+    published over pub/sub so every API replica drops its local copy as well.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = settings.PRINCIPAL_CACHE_ENABLED
+        self.local = TTLCache(maxsize=settings.PRINCIPAL_CACHE_LOCAL_MAXSIZE, ttl=settings.PRINCIPAL_CACHE_LOCAL_TTL)
+        self.redis_ttl = settings.PRINCIPAL_CACHE_REDIS_TTL
+        self._listener: asyncio.Task | None = None
+
+    @staticmethod
+    def _key(subject: str) -> str:
+        return f"{KEY_PREFIX}{subject}"
+
+    async def get(self, subject: str) -> dict[str, Any] | None:
+        if not self.enabled:
+            return None
+
+        principal = self.local.get(subject)
+        if principal is not None:
+            return principal
+
+        if cache.client is None:
+            return None
+        try:
+            raw = await cache.client.get(self._key(subject))
+        except RedisError as exc:
+            logger.warning(f"Principal cache read failed: {exc}")
+            return None
+        if raw is None:
+            return None
+
+        principal = json.loads(raw)
+        self.local.set(subject, principal)
+        return principal
+
+    async def set(self, subject: str, user: dict[str, Any]) -> dict[str, Any]:
+        principal = jsonable_encoder({key: value for key, value in user.items() if key not in EXCLUDED_FIELDS})
+        if not self.enabled:
+            return principal
+
+        self.local.set(subject, principal)
+        if cache.client is not None:
+            try:
+                await cache.client.set(self._key(subject), json.dumps(principal), ex=self.redis_ttl)
+            except RedisError as exc:
+                logger.warning(f"Principal cache write failed: {exc}")
+        return principal
+
+    async def invalidate(self, *subjects: str | None) -> None:
+        targets = [subject for subject in subjects if subject]
+        for subject in targets:
+            self.local.pop(subject)
+        if not targets or cache.client is None:
+            return
+        try:
+            await cache.client.delete(*(self._key(subject) for subject in targets))
+            for subject in targets:
+                await cache.client.publish(INVALIDATION_CHANNEL, subject)
+        except RedisError as exc:
+            logger.warning(f"Principal cache invalidation failed: {exc}")
+
+    async def invalidate_all(self) -> None:
+        self.local.clear()
+        if cache.client is None:
+            return
+        try:
+            batch: list[bytes] = []
+            async for key in cache.client.scan_iter(match=f"{KEY_PREFIX}*", count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    await cache.client.delete(*batch)
+                    batch.clear()
+            if batch:
+                await cache.client.delete(*batch)
+            await cache.client.publish(INVALIDATION_CHANNEL, INVALIDATE_ALL)
+        except RedisError as exc:
+            logger.warning(f"Principal cache flush failed: {exc}")
+
+    def _apply_invalidation(self, data: bytes | str) -> None:
+        subject = data.decode() if isinstance(data, bytes) else data
+        if subject == INVALIDATE_ALL:
+            self.local.clear()
+        else:
+            self.local.pop(subject)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                if cache.client is None:
+                    return
+                pubsub = cache.client.pubsub(ignore_subscribe_messages=True)
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                try:
+                    async for message in pubsub.listen():
+                        if message.get("type") == "message":
+                            self._apply_invalidation(message["data"])
+                finally:
+                    await pubsub.aclose()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                # Anything published while disconnected is lost, so drop local entries to stay safe.
+                self.local.clear()
+                logger.warning(f"Principal invalidation listener restarting: {exc}")
+                await asyncio.sleep(1)
+
+    def start_listener(self) -> None:
+        if self.enabled and self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop_listener(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+
+principal_cache = PrincipalCache()
@@ -1,11 +1,15 @@
 import re
-from datetime import UTC, datetime
+import time
+from dataclasses import dataclass
 from typing import Optional
 
 from redis.asyncio import ConnectionPool, Redis
+from redis.commands.core import AsyncScript
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ...core.config import settings
 from ...core.logger import logging
+from .ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -19,10 +23,62 @@ def sanitize_path(path: str) -> str:
     return path
 
 
+# Sliding-window counter: the previous fixed window is weighted by how much of it still overlaps the
+# sliding window. Reads, the limit check and the increment happen atomically in one round trip.
+# KEYS[1] is a prefix with a hash tag so both window keys live in the same cluster slot.
+# Returns {allowed, estimated count, retry after ms}.
+SLIDING_WINDOW_SCRIPT = """
+local now = redis.call('TIME')
+local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+local period_ms = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+
+local window = math.floor(now_ms / period_ms)
+local cur_key = KEYS[1] .. ':' .. window
+local prev_key = KEYS[1] .. ':' .. (window - 1)
+local cur = tonumber(redis.call('GET', cur_key) or '0')
+local prev = tonumber(redis.call('GET', prev_key) or '0')
+local into_window = now_ms % period_ms
+local elapsed = into_window / period_ms
+local estimated = prev * (1 - elapsed) + cur
+
+if estimated + cost > limit then
+    local retry_ms = period_ms - into_window
+    if prev > 0 and cur + cost <= limit then
+        local needed = 1 - (limit - cur - cost) / prev
+        retry_ms = math.ceil((needed - elapsed) * period_ms)
+    end
+    return {0, math.ceil(estimated), retry_ms}
+end
+
+redis.call('INCRBY', cur_key, cost)
+redis.call('PEXPIRE', cur_key, period_ms * 2)
+return {1, math.ceil(estimated + cost), 0}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    limit: int
+    period: int
+    cost: int = 1
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    limited: bool
+    count: int
+    retry_after: float = 0.0
+
+
 class RateLimiter:
     _instance: Optional["RateLimiter"] = None
     pool: Optional[ConnectionPool] = None
     client: Optional[Redis] = None
+    script: Optional[AsyncScript] = None
+    # Clients known to be over their limit, with the time Redis said they may retry.
+    blocked: TTLCache = TTLCache(maxsize=10000, ttl=0)
 
     def __new__(cls) -> "RateLimiter":
         if cls._instance is None:
@@ -35,6 +91,7 @@ class RateLimiter:
         if instance.pool is None:
             instance.pool = ConnectionPool.from_url(redis_url)
             instance.client = Redis(connection_pool=instance.pool)
+            instance.script = instance.client.register_script(SLIDING_WINDOW_SCRIPT)
 
     @classmethod
     def get_client(cls) -> Redis:
@@ -44,27 +101,47 @@ class RateLimiter:
             raise Exception("Redis client is not initialized.")
         return instance.client
 
-    async def is_rate_limited(self, db: AsyncSession, user_id: int, path: str, limit: int, period: int) -> bool:
-        client = self.get_client()
-        current_timestamp = int(datetime.now(UTC).timestamp())
-        window_start = current_timestamp - (current_timestamp % period)
-
+    @staticmethod
+    def rule_for(path: str, default_limit: int, default_period: int) -> RateLimitRule:
+        """Look up the per-route rule for a sanitized path, falling back to the default limit."""
+        configured = settings.RATE_LIMIT_ROUTES.get(sanitize_path(path))
+        if not configured:
+            return RateLimitRule(limit=default_limit, period=default_period)
+        return RateLimitRule(
+            limit=configured.get("limit", default_limit),
+            period=configured.get("period", default_period),
+            cost=configured.get("cost", 1),
+        )
+
+    async def check(self, user_id: int | str, path: str, limit: int, period: int, cost: int = 1) -> RateLimitResult:
         sanitized_path = sanitize_path(path)
-        key = f"ratelimit:{user_id}:{sanitized_path}:{window_start}"
-
-        try:
-            current_count = await client.incr(key)
-            if current_count == 1:
-                await client.expire(key, period)
+        key = f"ratelimit:{{{user_id}:{sanitized_path}}}"
 
-            if current_count > limit:
-                return True
+        if settings.RATE_LIMIT_LOCAL_PRECHECK:
+            retry_at = self.blocked.get(key)
+            if retry_at is not None:
+                return RateLimitResult(limited=True, count=limit, retry_after=max(retry_at - time.monotonic(), 0.0))
 
+        self.get_client()
+        try:
+            allowed, count, retry_after_ms = await self.script(keys=[key], args=[period * 1000, limit, cost])
         except Exception as e:
             logger.exception(f"Error checking rate limit for user {user_id} on path {path}: {e}")
             raise e
 
-        return False
+        if allowed:
+            return RateLimitResult(limited=False, count=int(count))
+
+        retry_after = max(int(retry_after_ms), 0) / 1000
+        if settings.RATE_LIMIT_LOCAL_PRECHECK and retry_after > 0:
+            self.blocked.set(key, time.monotonic() + retry_after, ttl=retry_after)
+        return RateLimitResult(limited=True, count=int(count), retry_after=retry_after)
+
+    async def is_rate_limited(
+        self, db: AsyncSession, user_id: int, path: str, limit: int, period: int, cost: int = 1
+    ) -> bool:
+        result = await self.check(user_id=user_id, path=path, limit=limit, period=period, cost=cost)
+        return result.limited
 
 
 rate_limiter = RateLimiter()
@@ -0,0 +1,97 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+import hashlib
+import json
+import logging
+import time
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from redis.exceptions import RedisError
+
+from ..config import settings
+from . import cache
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "response:"
+REVALIDATE_LOCK_SECONDS = 120
+
+
+def content_key(namespace: str, material: Any) -> str:
+    """Hash of the canonical JSON form of `material`, so equal requests share a key whatever their field order."""
+    canonical = json.dumps(jsonable_encoder(material), sort_keys=True, separators=(",", ":"))
+    return f"{KEY_PREFIX}{namespace}:{hashlib.sha256(canonical.encode()).hexdigest()}"
+
+
+class ResponseCache:
+    """Stale-while-revalidate cache for upstream JSON responses, stored in Redis.
+
+    Entries are fresh for the namespace TTL (`RESPONSE_CACHE_TTLS`, else `RESPONSE_CACHE_DEFAULT_TTL`) and
+    may be served stale for `RESPONSE_CACHE_STALE_SECONDS` more while one background task refreshes them.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = settings.RESPONSE_CACHE_ENABLED
+        self.default_ttl = settings.RESPONSE_CACHE_DEFAULT_TTL
+        self.stale_seconds = settings.RESPONSE_CACHE_STALE_SECONDS
+        self.ttls = settings.RESPONSE_CACHE_TTLS
+        self._revalidations: set[asyncio.Task] = set()
+
+    def ttl_for(self, namespace: str) -> int:
+        return int(self.ttls.get(namespace, self.default_ttl))
+
+    async def get_or_compute(
+        self,
+        namespace: str,
+        material: Any,
+        compute: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        if not self.enabled or cache.client is None:
+            return await compute()
+
+        key = content_key(namespace, material)
+        ttl = self.ttl_for(namespace)
+        try:
+            raw = await cache.client.get(key)
+        except RedisError as exc:
+            logger.warning(f"Response cache read failed: {exc}")
+            return await compute()
+
+        if raw is not None:
+            entry = json.loads(raw)
+            if time.time() - entry["stored_at"] >= ttl:
+                self._revalidate(key, ttl, compute)
+            return entry["payload"]
+
+        payload = await compute()
+        await self._store(key, ttl, payload)
+        return payload
+
+    async def _store(self, key: str, ttl: int, payload: Any) -> None:
+        entry = json.dumps({"stored_at": time.time(), "payload": jsonable_encoder(payload)})
+        try:
+            await cache.client.set(key, entry, ex=ttl + self.stale_seconds)
+        except RedisError as exc:
+            logger.warning(f"Response cache write failed: {exc}")
+
+    def _revalidate(self, key: str, ttl: int, compute: Callable[[], Awaitable[Any]]) -> None:
+        async def refresh() -> None:
+            lock_key = f"{key}:revalidating"
+            try:
+                # One replica refreshes a stale entry; everyone else keeps serving it meanwhile.
+                if not await cache.client.set(lock_key, 1, nx=True, ex=REVALIDATE_LOCK_SECONDS):
+                    return
+                try:
+                    await self._store(key, ttl, await compute())
+                finally:
+                    await cache.client.delete(lock_key)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning(f"Response cache revalidation failed for {key}: {exc}")
+
+        task = asyncio.get_running_loop().create_task(refresh())
+        self._revalidations.add(task)
+        task.add_done_callback(self._revalidations.discard)
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,100 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+import json
+import logging
+import time
+from typing import Any, TypeVar
+import uuid
+
+from fastapi.encoders import jsonable_encoder
+from redis.exceptions import RedisError
+
+from ..config import settings
+from . import cache
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+KEY_PREFIX = "singleflight:"
+
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class SingleFlight:
+    """Coalesces concurrent identical calls into one in-flight call whose result every caller shares.
+
+    The call runs in its own task and callers await it through `asyncio.shield`, so a caller that is
+    cancelled (say, its client disconnected) stops waiting without cancelling the call for the rest.
+
+    With `distributed=True` a Redis lock extends the coalescing across replicas: the lock holder runs
+    the call and publishes its JSON result for `SINGLE_FLIGHT_RESULT_SECONDS`; other replicas poll for
+    it and run the call themselves if the holder goes away without a result.
+    """
+
+    def __init__(self, namespace: str) -> None:
+        self.namespace = namespace
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]], *, distributed: bool = False) -> T:
+        task = self._inflight.get(key)
+        if task is None:
+            call = (lambda: self._run_distributed(key, fn)) if distributed else fn
+            task = asyncio.get_running_loop().create_task(call())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved when every caller has already gone away.
+            task.exception()
+
+    async def _run_distributed(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        if not settings.SINGLE_FLIGHT_REDIS_ENABLED or cache.client is None:
+            return await fn()
+
+        lock_key = f"{KEY_PREFIX}{self.namespace}:{key}:lock"
+        result_key = f"{KEY_PREFIX}{self.namespace}:{key}:result"
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + settings.SINGLE_FLIGHT_LOCK_SECONDS
+        try:
+            while True:
+                raw = await cache.client.get(result_key)
+                if raw is not None:
+                    return json.loads(raw)
+                if await cache.client.set(lock_key, token, nx=True, ex=settings.SINGLE_FLIGHT_LOCK_SECONDS):
+                    # The previous holder may have published between the read above and taking the lock.
+                    raw = await cache.client.get(result_key)
+                    if raw is not None:
+                        await cache.client.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+                        return json.loads(raw)
+                    break
+                if time.monotonic() >= deadline:
+                    return await fn()
+                await asyncio.sleep(settings.SINGLE_FLIGHT_POLL_INTERVAL)
+        except RedisError as exc:
+            logger.warning(f"Single-flight lock unavailable for {self.namespace}: {exc}")
+            return await fn()
+
+        try:
+            result = await fn()
+            try:
+                await cache.client.set(
+                    result_key, json.dumps(jsonable_encoder(result)), ex=settings.SINGLE_FLIGHT_RESULT_SECONDS
+                )
+            except RedisError as exc:
+                logger.warning(f"Single-flight result publish failed for {self.namespace}: {exc}")
+            return result
+        finally:
+            try:
+                await cache.client.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+            except RedisError as exc:
+                logger.warning(f"Single-flight lock release failed for {self.namespace}: {exc}")
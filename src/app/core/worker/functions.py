@@ -1,10 +1,19 @@
 import asyncio
+from datetime import datetime
 import logging
 from typing import Any
 
+import redis.asyncio as redis
 import structlog
 import uvloop
 from arq.worker import Worker
+from fastapi import HTTPException
+
+from ...schemas.cma import ReportRequest
+from ...services.cma import cma_service
+from ..config import settings
+from ..http_clients import http_clients
+from ..utils import cache
 
 asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
@@ -15,12 +24,29 @@ async def sample_background_task(ctx: Worker, name: str) -> str:
     return f"Task {name} is complete!"
 
 
+async def generate_cma_report(
+    ctx: Worker, user_id: int, body: dict[str, Any], listing_stamp: datetime | None
+) -> dict[str, Any]:
+    try:
+        report = await cma_service.generate_report(ReportRequest.model_validate(body), listing_stamp)
+    except HTTPException as exc:
+        # Stored with the job result, so keep it a plain, picklable error.
+        raise RuntimeError(f"CMA report failed ({exc.status_code}): {exc.detail}") from None
+    return report.model_dump(mode="json")
+
+
 # -------- base functions --------
 async def startup(ctx: Worker) -> None:
+    # The CMA response cache and single-flight live in the cache Redis.
+    cache.pool = redis.ConnectionPool.from_url(settings.REDIS_CACHE_URL)
+    cache.client = redis.Redis.from_pool(cache.pool)  # type: ignore
     logging.info("Worker Started")
 
 
 async def shutdown(ctx: Worker) -> None:
+    await http_clients.aclose()
+    if cache.client is not None:
+        await cache.client.aclose()  # type: ignore
     logging.info("Worker end")
 
 
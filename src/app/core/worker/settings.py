@@ -4,11 +4,11 @@ from typing import cast
 from arq.cli import watch_reload
 from arq.connections import RedisSettings
 from arq.typing import WorkerSettingsType
-from arq.worker import check_health, run_worker
+from arq.worker import check_health, func, run_worker
 
 from ...core.config import settings
 from ...core.logger import logging  # noqa: F401
-from .functions import on_job_end, on_job_start, sample_background_task, shutdown, startup
+from .functions import generate_cma_report, on_job_end, on_job_start, sample_background_task, shutdown, startup
 
 REDIS_QUEUE_HOST = settings.REDIS_QUEUE_HOST
 REDIS_QUEUE_PORT = settings.REDIS_QUEUE_PORT
@@ -17,7 +17,14 @@ REDIS_QUEUE_PASSWORD = settings.REDIS_QUEUE_PASSWORD_OR_NONE
 
 
 class WorkerSettings:
-    functions = [sample_background_task]
+    functions = [
+        sample_background_task,
+        func(
+            generate_cma_report,
+            keep_result=settings.CMA_REPORT_JOB_RESULT_TTL,
+            timeout=settings.CMA_API_TIMEOUT + 30,
+        ),
+    ]
     redis_settings = RedisSettings(
         host=REDIS_QUEUE_HOST,
         port=REDIS_QUEUE_PORT,
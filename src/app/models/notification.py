@@ -2,7 +2,7 @@ from datetime import UTC, datetime
 from enum import Enum
 from typing import Any
 
-from sqlalchemy import DateTime, Integer, String, JSON
+from sqlalchemy import DateTime, Index, Integer, String, JSON, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from ..core.db.database import Base
@@ -21,6 +21,13 @@ class NotificationChannel(str, Enum):
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        Index(
+            "ix_notifications_new_send_at",
+            "send_at",
+            postgresql_where=text("status = 'new' AND send_at IS NOT NULL"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True, init=False)
     caller: Mapped[str] = mapped_column(String, nullable=False)
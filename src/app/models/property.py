@@ -1,7 +1,7 @@
 from datetime import UTC, datetime
 from typing import List, Optional
 
-from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -10,7 +10,10 @@ from ..core.db.database import Base
 
 class Property(Base):
     __tablename__ = "property"
-    __table_args__ = {"schema": "public"}  # Assuming public schema for properties as per other potential tables
+    __table_args__ = (
+        Index("ix_property_updated_at", "updated_at"),
+        {"schema": "public"},  # Assuming public schema for properties as per other potential tables
+    )
 
     # Primary Key
     listing_key: Mapped[str] = mapped_column(String, primary_key=True, nullable=False)
@@ -212,7 +215,10 @@ class Property(Base):
 
 class PropertyMedia(Base):
     __tablename__ = "property_media"
-    __table_args__ = {"schema": "public"}
+    __table_args__ = (
+        Index("ix_property_media_property_id_order", "property_id", "order"),
+        {"schema": "public"},
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True, init=False)
     property_id: Mapped[str] = mapped_column(
@@ -1,6 +1,6 @@
 from datetime import UTC, datetime
 
-from sqlalchemy import DateTime, Integer, String, JSON, ForeignKey, UniqueConstraint
+from sqlalchemy import DateTime, Index, Integer, String, JSON, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from ..core.db.database import Base
@@ -35,6 +35,7 @@ class SubscriptionPlan(Base):
 
 class UserSubscription(Base):
     __tablename__ = "user_subscription"
+    __table_args__ = (Index("ix_user_subscription_user_id_ended_at", "user_id", "ended_at"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True, init=False)
     user_id: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -67,6 +68,7 @@ class UserSubscriptionUsage(Base):
             "property_id",
             name="uq_subscription_usage_user_property",
         ),
+        Index("ix_user_subscription_usages_user_id_created_at", "user_id", "created_at", "id"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True, init=False)
@@ -37,6 +37,12 @@ class BaselineComparablesRequest(_ComparablesBase):
     h3_resolution: int | None = None
 
 
+class LocalBaselineComparablesRequest(BaselineComparablesRequest):
+    """Baseline comparables answered in-process from the listing snapshot, never by the CMA service."""
+
+    strategy: Literal["baseline_local"] = "baseline_local"  # type: ignore[assignment]
+
+
 class MLComparablesRequest(_ComparablesBase):
     strategy: Literal["ml"] = "ml"
     city_name: str | None = None
@@ -61,6 +67,7 @@ ComparablesRequest = Annotated[
     Union[
         LLMComparablesRequest,
         BaselineComparablesRequest,
+        LocalBaselineComparablesRequest,
         MLComparablesRequest,
         VectorComparablesRequest,
     ],
@@ -254,3 +261,10 @@ class ReportResponse(BaseModel):
     price_direction: float | None = None
 
     model_config = {"extra": "allow"}
+
+
+class ReportJobResponse(BaseModel):
+    job_id: str
+    status: str
+    result: ReportResponse | None = None
+    error: str | None = None
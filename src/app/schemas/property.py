@@ -265,3 +265,21 @@ class PropertyDetailResponse(BaseModel):
     longitude: Optional[float] = None
     price: PropertyPrice
     rating: float = 0
+
+
+class NearbyPointOfInterest(BaseModel):
+    id: int
+    foursquare_id: str
+    name: str
+    latitude: float
+    longitude: float
+    address: Optional[str] = None
+    rating: Optional[float] = None
+    category_ids: List[int] = []
+    categories: List[str] = []
+    distance_m: Optional[float] = None
+
+
+class NearbyPointsResponse(BaseModel):
+    points: List[NearbyPointOfInterest]
+    total: int
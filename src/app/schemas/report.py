@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -207,3 +207,18 @@ class UpgradeImpact(BaseModel):
     property_id: str
     base: BaseMetrics
     scenarios: List[Scenario]
+
+
+class ReportSection(str, Enum):
+    SIMILAR_LISTINGS = "similar_listings"
+    SPECTRUM = "spectrum"
+    UPGRADE_IMPACT = "upgrade_impact"
+
+
+class ReportBundle(BaseModel):
+    listing_key: str
+    similar_listings: Optional[SimilarListings] = None
+    spectrum: Optional[Spectrum] = None
+    upgrade_impact: Optional[UpgradeImpact] = None
+    # Sections that failed or timed out, mapped to the reason.
+    errors: Dict[str, str] = {}
@@ -14,10 +14,11 @@ class UsageItem(BaseModel):
 
 
 class UsageReportResponse(BaseModel):
-    total: int
+    total: Optional[int] = None
     page: int
     limit: int
     items: list[UsageItem]
+    next_cursor: Optional[str] = None
 
 
 class PlanPayment(BaseModel):
@@ -8,27 +8,36 @@ from .ingest import (
     run_crawl_foursquare,
     run_crawl_foursquare_debug,
 )
+from .inference_bench import benchmark_inference, run_inference_stub
 from .init_tasks import init_all, init_db, init_kafka_storage, init_postgres_data
 from .kafka_poison import replay_poison_messages
 from .notification import promote_pending_notifications
+from .poi_features import refresh_poi_features
+from .query_plans import explain_hot_queries
 from .reindex import reindex_properties
+from .usage_meter import reconcile_usage_meter
 
 __all__ = [
     "DEFAULT_CRAWL_WINDOW",
+    "benchmark_inference",
     "db_diff",
     "db_migrate",
     "db_prepare",
     "ensure_indices",
+    "explain_hot_queries",
     "init_all",
     "init_db",
     "init_kafka_storage",
     "init_postgres_data",
     "parse_duration",
     "promote_pending_notifications",
+    "reconcile_usage_meter",
+    "refresh_poi_features",
     "replay_poison_messages",
     "reindex_properties",
     "run_crawl",
     "run_crawl_csv",
     "run_crawl_foursquare",
     "run_crawl_foursquare_debug",
+    "run_inference_stub",
 ]
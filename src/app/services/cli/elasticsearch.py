@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from app.core.config import settings
 from app.core.search.elasticsearch import es_client
+from app.services.poi.features import feature_fields
 
 
 def _parse_indices(value: str | None) -> list[str]:
@@ -31,6 +32,10 @@ async def ensure_indices(indices: list[str] | str | None = None) -> dict[str, li
                     "latitude": {"type": "float"},
                     "longitude": {"type": "float"},
                     "location": {"type": "geo_point"},
+                    **{
+                        field: {"type": "float" if field.endswith("_nearest_m") else "integer"}
+                        for field in feature_fields()
+                    },
                 }
             },
         )
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+from fastapi import FastAPI, HTTPException, Request
+import uvicorn
+
+from app.core.config import settings
+from app.services.report.client import InferenceClient
+
+STUB_PATH = "/api/v1/inference/similar"
+
+
+def build_inference_stub(overhead_ms: float, item_ms: float) -> FastAPI:
+    """A stand-in for the inference service that models a server running one forward pass at a time.
+
+    Every pass costs `overhead_ms` plus `item_ms` per item, so batching pays off the same way it does
+    against the real model server. Items whose `property_data.listing_key` starts with "fail" get a 422.
+    """
+    app = FastAPI()
+    model_lock = asyncio.Lock()
+
+    async def forward(n_items: int) -> None:
+        async with model_lock:
+            await asyncio.sleep((overhead_ms + item_ms * n_items) / 1000)
+
+    def infer(body: dict[str, Any]) -> tuple[int, dict[str, Any]]:
+        listing_key = str((body.get("property_data") or {}).get("listing_key", ""))
+        if listing_key.startswith("fail"):
+            return 422, {"detail": f"cannot score {listing_key}"}
+        return 200, {"property_id": listing_key, "similar_properties": []}
+
+    @app.post("/api/v1/inference/{name}")
+    async def single(name: str, request: Request) -> dict[str, Any]:
+        await forward(1)
+        status_code, body = infer(await request.json())
+        if status_code != 200:
+            raise HTTPException(status_code=status_code, detail=body["detail"])
+        return body
+
+    @app.post("/api/v1/inference/{name}/batch")
+    async def batch(name: str, request: Request) -> dict[str, Any]:
+        items = (await request.json())["items"]
+        await forward(len(items))
+        results = []
+        for item in items:
+            status_code, body = infer(item)
+            results.append({"status_code": status_code, "body": body})
+        return {"results": results}
+
+    return app
+
+
+async def run_inference_stub(host: str, port: int, overhead_ms: float, item_ms: float) -> None:
+    config = uvicorn.Config(build_inference_stub(overhead_ms, item_ms), host=host, port=port, log_level="warning")
+    await uvicorn.Server(config).serve()
+
+
+async def benchmark_inference(base_url: str | None, requests: int, concurrency: int) -> dict[str, Any]:
+    """Send the same burst of calls with batching off and on, and report throughput for each."""
+    base_url = base_url or settings.INFERENCE_API_BASE_URL
+    results: dict[str, Any] = {"requests": requests, "concurrency": concurrency}
+    for label, batching in (("unbatched", False), ("batched", True)):
+        client = InferenceClient(base_url=base_url, batching=batching)
+        semaphore = asyncio.Semaphore(concurrency)
+        failures = 0
+
+        async def call(i: int) -> None:
+            nonlocal failures
+            async with semaphore:
+                try:
+                    await client.post(STUB_PATH, {"property_data": {"listing_key": f"bench-{i}"}, "limit": 10})
+                except Exception:  # noqa: BLE001
+                    failures += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(call(i) for i in range(requests)))
+        elapsed = time.perf_counter() - started
+        results[label] = {
+            "seconds": round(elapsed, 3),
+            "requests_per_second": round(requests / elapsed, 1),
+            "failures": failures,
+        }
+    return results
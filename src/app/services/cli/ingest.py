@@ -46,15 +46,19 @@ async def run_crawl_csv() -> None:
     print(f"Crawled {count} properties from CSV dumps")
 
 
+def _format_crawl_stats(stats: dict[str, int]) -> str:
+    return ", ".join(f"{key}={value}" for key, value in stats.items())
+
+
 async def run_crawl_foursquare() -> None:
     if not settings.FOURSQUARE_API_KEY:
         raise RuntimeError("FOURSQUARE_API_KEY is not configured.")
     client = FoursquareClient(settings.FOURSQUARE_API_KEY)
     async with local_session() as db:
         crawler = FoursquareCrawler(client, db)
-        await crawler.crawl()
+        stats = await crawler.crawl()
     await client.close()
-    print("Foursquare crawl completed")
+    print(f"Foursquare crawl completed: {_format_crawl_stats(stats)}")
 
 
 async def run_crawl_foursquare_debug(ne_lat: float, ne_lon: float, sw_lat: float, sw_lon: float) -> None:
@@ -63,6 +67,6 @@ async def run_crawl_foursquare_debug(ne_lat: float, ne_lon: float, sw_lat: float
     client = FoursquareClient(settings.FOURSQUARE_API_KEY)
     async with local_session() as db:
         crawler = FoursquareCrawler(client, db)
-        await crawler.debug_crawl(ne_lat=ne_lat, ne_lon=ne_lon, sw_lat=sw_lat, sw_lon=sw_lon)
+        stats = await crawler.debug_crawl(ne_lat=ne_lat, ne_lon=ne_lon, sw_lat=sw_lat, sw_lon=sw_lon)
     await client.close()
-    print("Foursquare debug crawl completed")
+    print(f"Foursquare debug crawl completed: {_format_crawl_stats(stats)}")
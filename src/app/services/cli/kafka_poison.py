@@ -1,37 +1,41 @@
 from __future__ import annotations
 
 import asyncio
+from collections import Counter
 from datetime import UTC, datetime
-import re
+import time
 from typing import Any
 
-from aiokafka import AIOKafkaConsumer
+from aiokafka import AIOKafkaConsumer, ConsumerRecord, TopicPartition
 
 from app.core.config import settings
-from app.core.kafka import kafka_client
+from app.core.kafka import (
+    POISON_QUEUE_TOPIC_HEADER,
+    POISONED_AT_HEADER,
+    POISONED_HANDLER_HEADER,
+    POISONED_REASON_HEADER,
+    POISONED_SUBSCRIBER_HEADER,
+    POISONED_TOPIC_HEADER,
+    kafka_client,
+    poison_topic_name,
+)
 
 DEFAULT_REPLAY_LIMIT = 10
+DEFAULT_BATCH_SIZE = 500
 DEFAULT_IDLE_TIMEOUT_SECONDS = 2.0
 
 POISON_HEADER_KEYS = {
-    "poisoned_topic",
-    "poisoned_handler",
-    "poisoned_subscriber",
-    "poisoned_reason",
-    "poisoned-at",
-    "poison-queue-topic",
+    POISONED_TOPIC_HEADER,
+    POISONED_HANDLER_HEADER,
+    POISONED_SUBSCRIBER_HEADER,
+    POISONED_REASON_HEADER,
+    POISONED_AT_HEADER,
+    POISON_QUEUE_TOPIC_HEADER,
 }
 
 
-def _sanitize_topic(value: str) -> str:
-    cleaned = re.sub(r"[^a-zA-Z0-9-]+", "-", value.strip().lower())
-    cleaned = re.sub(r"-+", "-", cleaned).strip("-")
-    return cleaned or "app"
-
-
 def _default_poison_topic() -> str:
-    base = settings.KAFKA_CLIENT_ID or settings.APP_NAME
-    return f"backend-{_sanitize_topic(base)}-poison-queue"
+    return poison_topic_name()
 
 
 def _headers_to_dict(headers: list[tuple[str, bytes]] | None) -> dict[str, bytes]:
@@ -50,17 +54,85 @@ def _filter_headers(headers: list[tuple[str, bytes]] | None, original_topic_head
     ]
 
 
+def _header_text(headers: dict[str, bytes], key: str) -> str:
+    value = headers.get(key)
+    if not value:
+        return ""
+    return value.decode(errors="replace").strip()
+
+
+def _to_millis(value: datetime | None) -> int | None:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return int(value.timestamp() * 1000)
+
+
+def _matches(
+    msg: ConsumerRecord,
+    headers: dict[str, bytes],
+    *,
+    reasons: list[str] | None,
+    handlers: list[str] | None,
+    since_ms: int | None,
+    until_ms: int | None,
+) -> bool:
+    if since_ms is not None and msg.timestamp < since_ms:
+        return False
+    if until_ms is not None and msg.timestamp >= until_ms:
+        return False
+    if reasons:
+        reason = _header_text(headers, POISONED_REASON_HEADER).lower()
+        if not any(item.lower() in reason for item in reasons):
+            return False
+    if handlers:
+        if _header_text(headers, POISONED_HANDLER_HEADER) not in handlers:
+            return False
+    return True
+
+
+async def _throttle(started_at: float, sent: int, max_rate: float | None) -> None:
+    if not max_rate or max_rate <= 0:
+        return
+    ready_at = started_at + (sent / max_rate)
+    delay = ready_at - time.monotonic()
+    if delay > 0:
+        await asyncio.sleep(delay)
+
+
 async def replay_poison_messages(
     *,
     limit: int | None = None,
     poison_topic: str | None = None,
-    original_topic_header: str = "poisoned_topic",
+    original_topic_header: str = POISONED_TOPIC_HEADER,
     original_topic: str | None = None,
     idle_timeout_seconds: float = DEFAULT_IDLE_TIMEOUT_SECONDS,
     group_id: str | None = None,
+    batch_size: int | None = None,
+    reasons: list[str] | None = None,
+    handlers: list[str] | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    dry_run: bool = False,
+    max_rate: float | None = None,
 ) -> dict[str, Any]:
+    """Replay poison messages back to their original topics.
+
+    Messages are fetched with ``getmany`` in batches, re-published without waiting on each
+    send, and committed once per batch after every send in it is acknowledged. Messages that
+    do not match the reason/handler/time filters are skipped and committed with the batch, so
+    filtered replays should use a dedicated ``group_id`` when the rest must be replayed later.
+    A dry run only counts matching messages per original topic and never commits.
+    """
     total_limit = limit if limit and limit > 0 else DEFAULT_REPLAY_LIMIT
+    fetch_size = batch_size if batch_size and batch_size > 0 else DEFAULT_BATCH_SIZE
+    if max_rate and max_rate > 0:
+        # Keep each batch within one second of budget so the rate cap does not produce bursts.
+        fetch_size = min(fetch_size, max(int(max_rate), 1))
     topic = poison_topic or _default_poison_topic()
+    since_ms = _to_millis(since)
+    until_ms = _to_millis(until)
 
     consumer = AIOKafkaConsumer(
         topic,
@@ -74,57 +146,98 @@ async def replay_poison_messages(
 
     processed = 0
     replayed = 0
-    messages: list[dict[str, Any]] = []
+    skipped = 0
+    batches = 0
+    by_topic: Counter[str] = Counter()
+    errors: list[dict[str, Any]] = []
+    started_at = time.monotonic()
 
     try:
-        producer = await kafka_client.get_producer()
-        while processed < total_limit:
-            try:
-                msg = await asyncio.wait_for(consumer.getone(), timeout=idle_timeout_seconds)
-            except asyncio.TimeoutError:
-                break
-
-            processed += 1
-            headers = _headers_to_dict(msg.headers)
-            header_topic = headers.get(original_topic_header, b"").decode()
-            target_topic = header_topic.strip() or (original_topic or "").strip()
-
-            details: dict[str, Any] = {
-                "poison_topic": topic,
-                "original_topic": target_topic or None,
-                "partition": msg.partition,
-                "offset": msg.offset,
-                "replayed": False,
-            }
-
-            if not target_topic:
-                details["error"] = f"missing header {original_topic_header}"
-                messages.append(details)
-                break
-
-            new_headers = _filter_headers(msg.headers, original_topic_header)
-            new_headers.append(("poison-replayed-at", datetime.now(UTC).isoformat().encode()))
-
-            await producer.send_and_wait(
-                target_topic,
-                msg.value,
-                key=msg.key,
-                headers=new_headers,
+        producer = None if dry_run else await kafka_client.get_producer()
+        halted = False
+        while processed < total_limit and not halted:
+            records = await consumer.getmany(
+                timeout_ms=int(idle_timeout_seconds * 1000),
+                max_records=min(fetch_size, total_limit - processed),
             )
-            await consumer.commit()
+            if not records:
+                break
 
-            details["replayed"] = True
-            replayed += 1
-            messages.append(details)
+            batches += 1
+            outgoing: list[tuple[str, ConsumerRecord, list[tuple[str, bytes]]]] = []
+            offsets: dict[TopicPartition, int] = {}
+
+            for tp, messages in records.items():
+                for msg in messages:
+                    if processed >= total_limit:
+                        break
+
+                    headers = _headers_to_dict(msg.headers)
+                    target_topic = _header_text(headers, original_topic_header) or (original_topic or "").strip()
+                    if not target_topic:
+                        errors.append(
+                            {
+                                "partition": msg.partition,
+                                "offset": msg.offset,
+                                "error": f"missing header {original_topic_header}",
+                            }
+                        )
+                        halted = True
+                        break
+
+                    processed += 1
+                    offsets[tp] = msg.offset + 1
+
+                    if not _matches(
+                        msg,
+                        headers,
+                        reasons=reasons,
+                        handlers=handlers,
+                        since_ms=since_ms,
+                        until_ms=until_ms,
+                    ):
+                        skipped += 1
+                        continue
+
+                    by_topic[target_topic] += 1
+                    new_headers = _filter_headers(msg.headers, original_topic_header)
+                    outgoing.append((target_topic, msg, new_headers))
+                if halted:
+                    break
+
+            if producer is None:
+                continue
+
+            if outgoing:
+                await _throttle(started_at, replayed, max_rate)
+                replayed_at = datetime.now(UTC).isoformat().encode()
+                pending = [
+                    await producer.send(
+                        target_topic,
+                        msg.value,
+                        key=msg.key,
+                        headers=[*new_headers, ("poison-replayed-at", replayed_at)],
+                    )
+                    for target_topic, msg, new_headers in outgoing
+                ]
+                await asyncio.gather(*pending)
+                replayed += len(pending)
+            if offsets:
+                await consumer.commit(offsets)
     finally:
         await consumer.stop()
 
-    if processed == 0:
-        return {"poison_topic": topic, "processed": 0, "replayed": 0, "messages": [], "error": "no messages"}
-
-    return {
+    result: dict[str, Any] = {
         "poison_topic": topic,
         "processed": processed,
         "replayed": replayed,
-        "messages": messages,
+        "skipped": skipped,
+        "batches": batches,
+        "dry_run": dry_run,
+        "by_topic": dict(by_topic),
+        "errors": errors,
+        "elapsed_seconds": round(time.monotonic() - started_at, 3),
     }
+    if processed == 0 and not errors:
+        result["error"] = "no messages"
+    return result
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+import math
+from typing import Any
+
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.core.db.database import local_session
+from app.core.search.elasticsearch import es_client
+from app.models.ingest import IngestPointOfInterest
+from app.models.property import Property
+from app.services.poi.features import NEAREST_MAX_M, ProximityFeatures
+from app.services.poi.index import METERS_PER_DEGREE_LAT
+
+from .reindex import clamp_batch_size
+
+# Changed POIs are grouped into cells of this size; each cell pulls the properties within reach of it.
+CHANGE_CELL_DEGREES = 0.02
+
+
+def _count_update_successes(items: list[dict[str, Any]]) -> int:
+    successes = 0
+    for item in items:
+        result = item.get("update") or {}
+        status = result.get("status")
+        if status is not None and int(status) < 300:
+            successes += 1
+    return successes
+
+
+def _reach_bboxes(points: list[tuple[float, float]]) -> list[tuple[float, float, float, float]]:
+    cells = {
+        (math.floor(lat / CHANGE_CELL_DEGREES), math.floor(lon / CHANGE_CELL_DEGREES)) for lat, lon in points
+    }
+    lat_margin = NEAREST_MAX_M / METERS_PER_DEGREE_LAT
+    bboxes = []
+    for row, col in sorted(cells):
+        south = row * CHANGE_CELL_DEGREES
+        west = col * CHANGE_CELL_DEGREES
+        north = south + CHANGE_CELL_DEGREES
+        east = west + CHANGE_CELL_DEGREES
+        widest_lat = max(abs(south), abs(north)) + lat_margin
+        lon_margin = NEAREST_MAX_M / (METERS_PER_DEGREE_LAT * max(math.cos(math.radians(widest_lat)), 0.01))
+        bboxes.append((north + lat_margin, south - lat_margin, east + lon_margin, west - lon_margin))
+    return bboxes
+
+
+async def refresh_poi_features(since: timedelta | None = None, batch_size: int | None = None) -> dict[str, Any]:
+    """Recompute POI proximity fields on indexed properties.
+
+    With `since`, only properties within reach of POIs created or updated in that window are touched;
+    without it every property is recomputed. Removed POIs are only reflected by a full run.
+    """
+    size = clamp_batch_size(batch_size)
+    client = es_client.get_client()
+    updated = 0
+    candidates: dict[str, tuple[float, float]] = {}
+
+    async with local_session() as db:
+        proximity = await ProximityFeatures.load(db)
+
+        location_columns = (Property.listing_key, Property.latitude, Property.longitude)
+        has_location = (Property.latitude.is_not(None), Property.longitude.is_not(None))
+        if since is None:
+            result = await db.execute(select(*location_columns).where(*has_location))
+            candidates = {row.listing_key: (row.latitude, row.longitude) for row in result}
+            changed_pois = None
+        else:
+            cutoff = datetime.now(timezone.utc) - since
+            changed = await db.execute(
+                select(IngestPointOfInterest.latitude, IngestPointOfInterest.longitude).where(
+                    func.coalesce(IngestPointOfInterest.updated_at, IngestPointOfInterest.created_at) >= cutoff
+                )
+            )
+            points = [(row.latitude, row.longitude) for row in changed]
+            changed_pois = len(points)
+            for north, south, east, west in _reach_bboxes(points):
+                result = await db.execute(
+                    select(*location_columns).where(
+                        *has_location,
+                        Property.latitude.between(south, north),
+                        Property.longitude.between(west, east),
+                    )
+                )
+                candidates.update({row.listing_key: (row.latitude, row.longitude) for row in result})
+
+    keys = list(candidates)
+    for start in range(0, len(keys), size):
+        operations: list[dict[str, Any]] = []
+        for listing_key in keys[start : start + size]:
+            latitude, longitude = candidates[listing_key]
+            operations.append({"update": {"_id": listing_key}})
+            operations.append({"doc": proximity.compute(latitude, longitude)})
+        response = await client.bulk(index=settings.ELASTICSEARCH_INDEX, operations=operations)
+        updated += _count_update_successes(response.get("items", []))
+
+    return {
+        "changed_pois": changed_pois,
+        "properties": len(candidates),
+        "updated": updated,
+        "points_indexed": len(proximity.index),
+    }
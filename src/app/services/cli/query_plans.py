@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+import json
+from typing import Any
+
+from sqlalchemy import or_, select, text, update
+from sqlalchemy.sql import Executable
+
+from app.core.db.database import async_engine
+from app.models.notification import Notification, NotificationStatus
+from app.models.property import Property, PropertyMedia
+from app.models.subscription import SubscriptionPlan, UserSubscription, UserSubscriptionUsage
+
+SAMPLE_USER_ID = 1
+SAMPLE_LISTING_KEY = "sample-listing"
+
+
+@dataclass(frozen=True)
+class HotQuery:
+    name: str
+    table: str
+    build: Callable[[datetime], Executable]
+
+
+def _active_subscription(now: datetime) -> Executable:
+    return (
+        select(UserSubscription, SubscriptionPlan)
+        .join(SubscriptionPlan, UserSubscription.plan_id == SubscriptionPlan.id)
+        .where(
+            UserSubscription.user_id == SAMPLE_USER_ID,
+            or_(UserSubscription.ended_at.is_(None), UserSubscription.ended_at > now),
+        )
+        .order_by(UserSubscription.ended_at.asc().nulls_last())
+    )
+
+
+def _usage_report_page(_now: datetime) -> Executable:
+    return (
+        select(UserSubscriptionUsage.id, UserSubscriptionUsage.property_id, UserSubscriptionUsage.created_at)
+        .where(UserSubscriptionUsage.user_id == SAMPLE_USER_ID)
+        .order_by(UserSubscriptionUsage.created_at.desc(), UserSubscriptionUsage.id.desc())
+        .limit(20)
+    )
+
+
+def _property_media(_now: datetime) -> Executable:
+    return (
+        select(PropertyMedia)
+        .where(PropertyMedia.property_id == SAMPLE_LISTING_KEY)
+        .order_by(PropertyMedia.order)
+    )
+
+
+def _promote_notifications(now: datetime) -> Executable:
+    return (
+        update(Notification)
+        .where(
+            Notification.status == NotificationStatus.NEW.value,
+            Notification.send_at.is_not(None),
+            Notification.send_at < now,
+        )
+        .values(status=NotificationStatus.PENDING.value, updated_at=now)
+    )
+
+
+def _changed_properties(now: datetime) -> Executable:
+    return (
+        select(Property.listing_key)
+        .where(Property.updated_at >= now - timedelta(hours=1))
+        .order_by(Property.updated_at)
+        .limit(500)
+    )
+
+
+HOT_QUERIES = [
+    HotQuery("subscription.active", "user_subscription", _active_subscription),
+    HotQuery("subscription.usage_report", "user_subscription_usages", _usage_report_page),
+    HotQuery("property.media", "property_media", _property_media),
+    HotQuery("notification.promote", "notifications", _promote_notifications),
+    HotQuery("property.changed_since", "property", _changed_properties),
+]
+
+
+def _plan_nodes(node: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def _render(statement: Executable) -> str:
+    return str(statement.compile(dialect=async_engine.dialect, compile_kwargs={"literal_binds": True}))
+
+
+async def explain_hot_queries() -> dict[str, Any]:
+    """EXPLAIN every hot query with sequential scans disabled.
+
+    With `enable_seqscan` off the planner only falls back to a sequential scan when no index can
+    serve the query, so any "Seq Scan" on the query's own table means a missing index, whatever the
+    size of the local tables.
+    """
+    now = datetime.now(UTC)
+    plans: dict[str, str] = {}
+    seq_scans: list[str] = []
+    async with async_engine.connect() as conn:
+        for query in HOT_QUERIES:
+            transaction = await conn.begin()
+            try:
+                await conn.execute(text("SET LOCAL enable_seqscan = off"))
+                raw = (await conn.execute(text(f"EXPLAIN (FORMAT JSON) {_render(query.build(now))}"))).scalar_one()
+            finally:
+                await transaction.rollback()
+
+            root = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+            nodes = list(_plan_nodes(root))
+            if any(node.get("Node Type") == "Seq Scan" and node.get("Relation Name") == query.table for node in nodes):
+                seq_scans.append(query.name)
+            plans[query.name] = " > ".join(
+                f"{node['Node Type']}({node.get('Index Name') or node.get('Relation Name') or ''})".replace("()", "")
+                for node in nodes
+            )
+
+    return {"checked": len(HOT_QUERIES), "seq_scans": seq_scans, "plans": plans}
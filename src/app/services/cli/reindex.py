@@ -8,6 +8,7 @@ from app.core.config import settings
 from app.core.db.database import local_session
 from app.core.search.elasticsearch import es_client
 from app.models.property import Property
+from app.services.poi.features import ProximityFeatures
 
 DEFAULT_BATCH_SIZE = 500
 MAX_BATCH_SIZE = 5000
@@ -28,7 +29,7 @@ def _normalize(value: str | None, *, upper: bool = False) -> str:
     return cleaned.upper() if upper else cleaned.lower()
 
 
-def _build_document(prop: Property) -> dict[str, Any]:
+def _build_document(prop: Property, proximity: ProximityFeatures | None = None) -> dict[str, Any]:
     doc: dict[str, Any] = {
         "listing_key": prop.listing_key,
         "standard_status": _normalize(prop.standard_status),
@@ -48,6 +49,8 @@ def _build_document(prop: Property) -> dict[str, Any]:
     }
     if prop.latitude is not None and prop.longitude is not None:
         doc["location"] = {"lat": prop.latitude, "lon": prop.longitude}
+    if proximity is not None:
+        doc.update(proximity.compute(prop.latitude, prop.longitude))
     return doc
 
 
@@ -71,6 +74,7 @@ async def reindex_properties(start_after: str | None = None, batch_size: int | N
     client = es_client.get_client()
 
     async with local_session() as db:
+        proximity = await ProximityFeatures.load(db)
         while True:
             query = select(Property).order_by(Property.listing_key).limit(size)
             if last_key:
@@ -86,7 +90,7 @@ async def reindex_properties(start_after: str | None = None, batch_size: int | N
                 if not prop.listing_key:
                     continue
                 operations.append({"index": {"_id": prop.listing_key}})
-                operations.append(_build_document(prop))
+                operations.append(_build_document(prop, proximity))
 
             if not operations:
                 last_key = batch[-1].listing_key
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from redis.asyncio import Redis
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.db.database import local_session
+from app.core.utils import cache
+from app.models.subscription import UserSubscription
+from app.services.subscription.meter import usage_meter
+from app.services.subscription.service import SubscriptionService
+from app.services.subscription.summary_cache import subscription_summary_cache
+
+
+async def reconcile_usage_meter() -> dict[str, int]:
+    """Flush queued usage rows, then rebuild every user's meter state from Postgres.
+
+    Cached subscription summaries are dropped as well and reload on the next request.
+    """
+    owns_client = cache.client is None
+    if owns_client:
+        cache.client = Redis.from_url(settings.REDIS_CACHE_URL)
+    try:
+        flushed = await usage_meter.flush()
+        await usage_meter.release()
+
+        cleared = await usage_meter.invalidate_all()
+        await subscription_summary_cache.invalidate_all()
+
+        primed = 0
+        async with local_session() as db:
+            user_ids = (await db.execute(select(UserSubscription.user_id).distinct())).scalars().all()
+            service = SubscriptionService(db)
+            for user_id in user_ids:
+                state, property_ids = await service.load_meter_state(user_id)
+                await usage_meter.prime(user_id, state, property_ids)
+                primed += 1
+    finally:
+        if owns_client:
+            await cache.client.aclose()
+            cache.client = None
+
+    return {"flushed": flushed, "cleared": cleared, "primed": primed}
@@ -0,0 +1,402 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from datetime import UTC, datetime
+import logging
+import time
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...core.config import settings
+from ...core.db.database import local_session
+from ...models.property import Property
+from ...schemas.cma import ComparablesResponse, PropertySummary, SimilarityRow, TimingLog
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional: pip install '.[comparables]'
+    np = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Per-attribute weight and scale: a difference of one "scale" costs "weight". Attributes missing on
+# either side cost their full weight, and a different property sub-type costs TYPE_MISMATCH_WEIGHT.
+FEATURE_WEIGHTS: dict[str, tuple[float, float]] = {
+    "distance_km": (1.0, 2.0),
+    "beds": (0.6, 1.0),
+    "baths": (0.5, 1.0),
+    "log_living_area": (1.0, 0.25),
+    "year_built": (0.4, 15.0),
+    "log_price": (0.8, 0.25),
+}
+TYPE_MISMATCH_WEIGHT = 1.5
+PREFILTER_SLACK = 16
+
+_COLUMNS = (
+    Property.listing_key,
+    Property.updated_at,
+    Property.standard_status,
+    Property.city,
+    Property.unparsed_address,
+    Property.postal_code,
+    Property.property_type,
+    Property.property_sub_type,
+    Property.latitude,
+    Property.longitude,
+    Property.bedrooms_total,
+    Property.bathrooms_total_integer,
+    Property.living_area,
+    Property.year_built,
+    Property.list_price,
+    Property.close_price,
+)
+
+
+@dataclass(frozen=True)
+class Listing:
+    listing_key: str
+    city: str
+    address: str | None
+    postal_code: str | None
+    property_type: str | None
+    property_sub_type: str | None
+    standard_status: str | None
+    latitude: float
+    longitude: float
+    beds: int | None
+    baths: float | None
+    living_area: float | None
+    year_built: int | None
+    list_price: float | None
+    close_price: float | None
+
+    @classmethod
+    def from_row(cls, row: Any) -> Listing | None:
+        if row.latitude is None or row.longitude is None or not row.city:
+            return None
+        return cls(
+            listing_key=row.listing_key,
+            city=row.city,
+            address=row.unparsed_address,
+            postal_code=row.postal_code,
+            property_type=row.property_type,
+            property_sub_type=row.property_sub_type,
+            standard_status=row.standard_status,
+            latitude=row.latitude,
+            longitude=row.longitude,
+            beds=row.bedrooms_total,
+            baths=row.bathrooms_total_integer,
+            living_area=row.living_area,
+            year_built=row.year_built,
+            list_price=row.list_price,
+            close_price=row.close_price,
+        )
+
+    @classmethod
+    def from_subject(cls, data: dict[str, Any]) -> Listing | None:
+        """Build a subject from a request's `subject_property`, accepting model or summary field names."""
+        lat, lon = data.get("latitude"), data.get("longitude")
+        if lat is None or lon is None:
+            return None
+        return cls(
+            listing_key=str(data.get("listing_key") or ""),
+            city=data.get("city") or "",
+            address=data.get("unparsed_address") or data.get("address"),
+            postal_code=data.get("postal_code"),
+            property_type=data.get("property_type"),
+            property_sub_type=data.get("property_sub_type"),
+            standard_status=data.get("standard_status"),
+            latitude=float(lat),
+            longitude=float(lon),
+            beds=data.get("bedrooms_total", data.get("beds")),
+            baths=data.get("bathrooms_total_integer", data.get("baths")),
+            living_area=data.get("living_area"),
+            year_built=data.get("year_built"),
+            list_price=data.get("list_price"),
+            close_price=data.get("close_price"),
+        )
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "listing_key": self.listing_key or None,
+            "address": self.address,
+            "city": self.city or None,
+            "postal_code": self.postal_code,
+            "property_type": self.property_type,
+            "property_sub_type": self.property_sub_type,
+            "standard_status": self.standard_status,
+            "list_price": self.list_price,
+            "close_price": self.close_price,
+            "beds": self.beds,
+            "baths": self.baths,
+            "living_area": self.living_area,
+            "year_built": self.year_built,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
+        }
+
+
+def _city_key(city: str) -> str:
+    return city.strip().lower()
+
+
+def _log_or_nan(value: float | None) -> float:
+    return float(np.log(value)) if value and value > 0 else np.nan
+
+
+class CitySnapshot:
+    """Column arrays for one city's active listings, built once and then only read."""
+
+    def __init__(self, listings: list[Listing]) -> None:
+        self.listings = listings
+        self.keys = np.array([item.listing_key for item in listings], dtype=object)
+        self.addresses = np.array([item.address or "" for item in listings], dtype=object)
+        self.lat = np.radians(np.array([item.latitude for item in listings], dtype=np.float64))
+        self.lon = np.radians(np.array([item.longitude for item in listings], dtype=np.float64))
+        self.features = {
+            "beds": np.array([np.nan if item.beds is None else item.beds for item in listings], dtype=np.float64),
+            "baths": np.array([np.nan if item.baths is None else item.baths for item in listings], dtype=np.float64),
+            "log_living_area": np.array([_log_or_nan(item.living_area) for item in listings], dtype=np.float64),
+            "year_built": np.array(
+                [np.nan if item.year_built is None else item.year_built for item in listings], dtype=np.float64
+            ),
+            "log_price": np.array([_log_or_nan(item.list_price) for item in listings], dtype=np.float64),
+        }
+        self.sub_type = np.array([item.property_sub_type or "" for item in listings], dtype=object)
+
+    def __len__(self) -> int:
+        return len(self.listings)
+
+    def distances_km(self, subject: Listing) -> np.ndarray:
+        lat0, lon0 = np.radians(subject.latitude), np.radians(subject.longitude)
+        a = np.sin((self.lat - lat0) / 2) ** 2 + np.cos(lat0) * np.cos(self.lat) * np.sin((self.lon - lon0) / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+    def scores(self, subject: Listing, candidates: np.ndarray, distances: np.ndarray) -> np.ndarray:
+        subject_values = {
+            "beds": np.nan if subject.beds is None else float(subject.beds),
+            "baths": np.nan if subject.baths is None else float(subject.baths),
+            "log_living_area": _log_or_nan(subject.living_area),
+            "year_built": np.nan if subject.year_built is None else float(subject.year_built),
+            "log_price": _log_or_nan(subject.list_price),
+        }
+        weight, scale = FEATURE_WEIGHTS["distance_km"]
+        total = weight * distances / scale
+        for name, value in subject_values.items():
+            weight, scale = FEATURE_WEIGHTS[name]
+            diff = np.abs(self.features[name][candidates] - value) / scale
+            total += weight * np.where(np.isnan(diff), 1.0, np.minimum(diff, 3.0))
+        if subject.property_sub_type:
+            total += TYPE_MISMATCH_WEIGHT * (self.sub_type[candidates] != subject.property_sub_type)
+        return total
+
+
+class BaselineComparablesEngine:
+    """Answers `strategy=baseline` in-process from per-city NumPy snapshots of active listings.
+
+    Snapshots are loaded once on startup and then advanced from `Property.updated_at`: each refresh
+    reads only rows changed since the last one and rebuilds the arrays of the cities they touch.
+    Cities are swapped in whole, so a query never sees a half-built snapshot.
+    """
+
+    def __init__(self) -> None:
+        self.statuses = frozenset(settings.BASELINE_ENGINE_STATUSES)
+        self.prefilter = settings.BASELINE_ENGINE_PREFILTER
+        self.snapshots: dict[str, CitySnapshot] = {}
+        self._rows: dict[str, dict[str, Listing]] = {}
+        self._city_of: dict[str, str] = {}
+        self._watermark: datetime | None = None
+        self._refresh_task: asyncio.Task | None = None
+
+    @property
+    def available(self) -> bool:
+        return np is not None
+
+    @property
+    def ready(self) -> bool:
+        return self.available and self._watermark is not None
+
+    async def load(self, db: AsyncSession) -> None:
+        result = await db.execute(select(*_COLUMNS).where(Property.standard_status.in_(self.statuses)))
+        self._rows, self._city_of, watermark = {}, {}, None
+        for row in result:
+            watermark = row.updated_at if watermark is None else max(watermark, row.updated_at)
+            self._upsert(row)
+        self.snapshots = {city: CitySnapshot(list(rows.values())) for city, rows in self._rows.items() if rows}
+        self._watermark = watermark or datetime.min.replace(tzinfo=UTC)
+        listings = sum(len(snapshot) for snapshot in self.snapshots.values())
+        logger.info(f"Baseline comparables engine loaded {listings} listings in {len(self.snapshots)} cities")
+
+    async def refresh(self, db: AsyncSession) -> int:
+        """Apply rows changed since the last refresh. Returns how many changed rows were seen."""
+        if self._watermark is None:
+            await self.load(db)
+            return len(self._city_of)
+
+        # `>=` re-reads rows sharing the watermark timestamp; applying a row twice is harmless.
+        result = await db.execute(select(*_COLUMNS).where(Property.updated_at >= self._watermark))
+        touched: set[str] = set()
+        seen = 0
+        watermark = self._watermark
+        for row in result:
+            seen += 1
+            watermark = max(watermark, row.updated_at)
+            touched.update(self._upsert(row))
+        for city in touched:
+            rows = self._rows.get(city)
+            if rows:
+                self.snapshots[city] = CitySnapshot(list(rows.values()))
+            else:
+                self.snapshots.pop(city, None)
+        self._watermark = watermark
+        return seen
+
+    def _upsert(self, row: Any) -> set[str]:
+        """Place, move or drop one listing; returns the cities whose snapshot changed."""
+        touched: set[str] = set()
+        previous_city = self._city_of.pop(row.listing_key, None)
+        if previous_city is not None:
+            self._rows[previous_city].pop(row.listing_key, None)
+            touched.add(previous_city)
+        listing = Listing.from_row(row) if row.standard_status in self.statuses else None
+        if listing is not None:
+            city = _city_key(listing.city)
+            self._rows.setdefault(city, {})[listing.listing_key] = listing
+            self._city_of[listing.listing_key] = city
+            touched.add(city)
+        return touched
+
+    async def _subject(self, listing_key: str | None, subject_property: dict[str, Any] | None) -> Listing | None:
+        if listing_key:
+            city = self._city_of.get(listing_key)
+            if city is not None:
+                return self._rows[city].get(listing_key)
+            async with local_session() as db:
+                row = (await db.execute(select(*_COLUMNS).where(Property.listing_key == listing_key))).first()
+            # A stored row without coordinates or city still lets the caller's subject_property place it.
+            listing = Listing.from_row(row) if row is not None else None
+            if listing is not None:
+                return listing
+        if subject_property:
+            return Listing.from_subject(subject_property)
+        return None
+
+    async def find_comparables(self, body: dict[str, Any]) -> ComparablesResponse | None:
+        """Rank the subject's city by haversine prefilter plus weighted attribute distance.
+
+        Returns None when the engine has no snapshot yet or the subject cannot be placed, so the caller
+        can fall back to the CMA service.
+        """
+        if not self.ready:
+            return None
+        started = time.perf_counter()
+        subject = await self._subject(body.get("subject_listing_key"), body.get("subject_property"))
+        if subject is None:
+            return None
+        city = _city_key(body.get("city_name") or subject.city)
+        snapshot = self.snapshots.get(city)
+        if snapshot is None:
+            return None
+
+        timing_logs: list[TimingLog] = []
+        step_started = time.perf_counter()
+        distances = snapshot.distances_km(subject)
+        limit = body.get("max_candidates") or self.prefilter
+        # Take a little more than the prefilter so dropping the subject and its address still leaves `limit`.
+        candidates = _nearest(distances, np.arange(len(snapshot)), limit + PREFILTER_SLACK)
+        eligible = snapshot.keys[candidates] != subject.listing_key
+        if body.get("skip_same_address", True) and subject.address:
+            eligible &= snapshot.addresses[candidates] != subject.address
+        candidates = _nearest(distances, candidates[eligible], limit)
+        timing_logs.append(
+            TimingLog(step="geo_prefilter", duration_ms=_elapsed_ms(step_started), selected_count=len(candidates))
+        )
+
+        step_started = time.perf_counter()
+        scores = snapshot.scores(subject, candidates, distances[candidates])
+        top_k = body.get("top_k") or 10
+        order = np.argsort(scores, kind="stable")[:top_k]
+        selected = candidates[order]
+        timing_logs.append(
+            TimingLog(step="attribute_rank", duration_ms=_elapsed_ms(step_started), selected_count=len(selected))
+        )
+
+        geo_rank = np.empty(len(candidates), dtype=np.int64)
+        geo_rank[np.argsort(distances[candidates], kind="stable")] = np.arange(1, len(candidates) + 1)
+        rows = []
+        for position, index in zip(order, selected, strict=True):
+            listing = snapshot.listings[index]
+            summary = listing.summary()
+            rows.append(
+                SimilarityRow(
+                    candidate_id=listing.listing_key,
+                    distance_km=round(float(distances[index]), 3),
+                    geo_rank=int(geo_rank[position]),
+                    similarity_score=round(float(scores[position]), 4),
+                    **{key: summary[key] for key in SimilarityRow.model_fields if key in summary},
+                )
+            )
+
+        return ComparablesResponse(
+            strategy="baseline",
+            engine="local",
+            subject_summary=PropertySummary(**subject.summary()),
+            selected_listing_keys=[row.listing_key for row in rows if row.listing_key],
+            selected_rows=rows,
+            timing_logs=timing_logs,
+            total_duration_ms=_elapsed_ms(started),
+        )
+
+    async def _refresh_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with local_session() as db:
+                    await self.refresh(db)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                logger.warning(f"Baseline comparables snapshot refresh failed: {exc}")
+
+    async def start(self, interval: float | None = None) -> None:
+        if not self.available:
+            logger.warning("Baseline comparables engine disabled: numpy is not installed")
+            return
+        try:
+            async with local_session() as db:
+                await self.load(db)
+        except Exception as exc:  # noqa: BLE001
+            # Requests go to the CMA service until a snapshot exists; the refresh loop retries the load.
+            logger.warning(f"Baseline comparables snapshot load failed: {exc}")
+
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(
+                self._refresh_loop(interval or settings.BASELINE_ENGINE_REFRESH_SECONDS)
+            )
+
+    async def stop(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+
+def _nearest(distances: np.ndarray, candidates: np.ndarray, limit: int) -> np.ndarray:
+    if len(candidates) <= limit:
+        return candidates
+    return candidates[np.argpartition(distances[candidates], limit - 1)[:limit]]
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 3)
+
+
+baseline_engine = BaselineComparablesEngine()
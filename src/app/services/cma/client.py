@@ -1,10 +1,10 @@
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
 from typing import Any
 
-import httpx
-
 from ...core.config import settings
+from ...core.http_clients import http_clients
 
 
 class CMAClient:
@@ -25,11 +25,33 @@ class CMAClient:
         return headers
 
     async def post(self, path: str, json_body: dict[str, Any]) -> dict[str, Any]:
-        async with httpx.AsyncClient(
-            base_url=self.base_url,
+        client = http_clients.get("cma")
+        response = await client.post(
+            f"{self.base_url}{path}",
+            json=json_body,
             headers=self._headers(),
             timeout=self.timeout,
-        ) as client:
-            response = await client.post(path, json=json_body)
+        )
+        response.raise_for_status()
+        return response.json()  # type: ignore[no-any-return]
+
+    async def stream(self, path: str, json_body: dict[str, Any]) -> AsyncIterator[str]:
+        """POST and yield the upstream's server-sent events one frame at a time, as they arrive."""
+        client = http_clients.get("cma")
+        headers = {**self._headers(), "Accept": "text/event-stream"}
+        async with client.stream(
+            "POST", f"{self.base_url}{path}", json=json_body, headers=headers, timeout=self.timeout
+        ) as response:
+            if response.is_error:
+                await response.aread()
             response.raise_for_status()
-            return response.json()  # type: ignore[no-any-return]
+            frame: list[str] = []
+            async for line in response.aiter_lines():
+                if line:
+                    frame.append(line)
+                    continue
+                if frame:
+                    yield "\n".join(frame) + "\n\n"
+                    frame = []
+            if frame:
+                yield "\n".join(frame) + "\n\n"
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+import time
+import uuid
+
+from arq.jobs import Job, JobStatus
+
+from ...core.config import settings
+from ...core.utils import queue
+from ...schemas.cma import ReportJobResponse, ReportRequest, ReportResponse
+
+REPORT_JOB_FUNCTION = "generate_cma_report"
+REPORT_JOB_PREFIX = "cma-report:"
+POLL_INTERVAL_SECONDS = 0.5
+
+
+async def enqueue_report_job(user_id: int, request: ReportRequest, listing_stamp: datetime | None) -> ReportJobResponse:
+    if queue.pool is None:
+        raise RuntimeError("job queue is not available")
+    job_id = f"{REPORT_JOB_PREFIX}{uuid.uuid4().hex}"
+    await queue.pool.enqueue_job(
+        REPORT_JOB_FUNCTION,
+        user_id,
+        request.model_dump(exclude_none=True),
+        listing_stamp,
+        _job_id=job_id,
+    )
+    return ReportJobResponse(job_id=job_id, status=JobStatus.queued.value)
+
+
+async def get_report_job(job_id: str, user_id: int, wait: float = 0) -> ReportJobResponse | None:
+    """Current state of a report job owned by `user_id`, waiting up to `wait` seconds for it to finish.
+
+    Returns None for unknown jobs and for jobs enqueued by another user.
+    """
+    if queue.pool is None:
+        raise RuntimeError("job queue is not available")
+    if not job_id.startswith(REPORT_JOB_PREFIX):
+        return None
+
+    job = Job(job_id, queue.pool)
+    info = await job.info()
+    if info is None or not info.args or info.args[0] != user_id:
+        return None
+
+    deadline = time.monotonic() + min(wait, settings.CMA_REPORT_JOB_MAX_WAIT)
+    while True:
+        status = await job.status()
+        if status == JobStatus.complete:
+            result = await job.result_info()
+            if result is None:
+                return None
+            if result.success:
+                return ReportJobResponse(
+                    job_id=job_id, status=status.value, result=ReportResponse.model_validate(result.result)
+                )
+            return ReportJobResponse(job_id=job_id, status=status.value, error=str(result.result))
+        if time.monotonic() >= deadline:
+            return ReportJobResponse(job_id=job_id, status=status.value)
+        await asyncio.sleep(POLL_INTERVAL_SECONDS)
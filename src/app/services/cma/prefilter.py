@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from elasticsearch import ApiError, TransportError
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+
+from ...core.config import settings
+from ...core.db.database import local_session
+from ...core.search.elasticsearch import es_client
+from ...core.utils.ttl_cache import TTLCache
+from ...models.property import Property
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PREFILTER_COUNT = 50
+
+# Always sent with a candidate, whatever `similarity_columns` asks for: the CMA service needs them to
+# identify candidates, compute distances and apply `skip_same_address`.
+REQUIRED_COLUMNS = ("listing_key", "unparsed_address", "latitude", "longitude")
+
+_PROPERTY_COLUMNS = Property.__table__.c
+
+
+def _normalize(value: str | None) -> str:
+    return (value or "").strip().lower()
+
+
+class CandidatePrefilter:
+    """Supplies `candidate_properties` for `llm` comparables from the Elasticsearch listing index.
+
+    The nearest listings of the subject's property type are found with a geo-distance query, then
+    only the columns the ranker reads are loaded from Postgres by primary key. Candidate sets are
+    cached per subject for `CMA_PREFILTER_CACHE_TTL` seconds.
+    """
+
+    def __init__(self) -> None:
+        self.radius_km = settings.CMA_PREFILTER_RADIUS_KM
+        self.default_columns = tuple(settings.CMA_PREFILTER_COLUMNS)
+        self._cache = TTLCache(maxsize=settings.CMA_PREFILTER_CACHE_MAXSIZE, ttl=settings.CMA_PREFILTER_CACHE_TTL)
+
+    @staticmethod
+    def applies(body: dict[str, Any]) -> bool:
+        return (
+            settings.CMA_PREFILTER_ENABLED
+            and body.get("strategy", "llm") == "llm"
+            and bool(body.get("subject_listing_key"))
+            and not body.get("candidate_properties")
+        )
+
+    def columns(self, body: dict[str, Any]) -> tuple[str, ...]:
+        requested = body.get("similarity_columns") or self.default_columns
+        wanted = dict.fromkeys((*REQUIRED_COLUMNS, *requested))
+        return tuple(name for name in wanted if name in _PROPERTY_COLUMNS)
+
+    async def prepare(self, body: dict[str, Any]) -> dict[str, Any]:
+        """Return `body` with `candidate_properties` filled in, or unchanged when no candidates are found.
+
+        Any search or database failure leaves the body unchanged, so the CMA service runs its own query.
+        """
+        columns = self.columns(body)
+        count = body.get("prefilter_count") or DEFAULT_PREFILTER_COUNT
+        key = (body["subject_listing_key"], _normalize(body.get("city_name")), count, columns)
+        candidates = self._cache.get(key)
+        if candidates is None:
+            try:
+                candidates = await self._load(body["subject_listing_key"], body.get("city_name"), count, columns)
+            except (ApiError, TransportError, SQLAlchemyError) as exc:
+                logger.warning(f"Comparables prefilter failed for {body['subject_listing_key']}: {exc}")
+                return body
+            self._cache.set(key, candidates)
+        if not candidates:
+            return body
+        return {**body, "candidate_properties": candidates}
+
+    async def _load(
+        self, listing_key: str, city_name: str | None, count: int, columns: tuple[str, ...]
+    ) -> list[dict[str, Any]]:
+        async with local_session() as db:
+            subject = (
+                await db.execute(
+                    select(Property.latitude, Property.longitude, Property.property_type).where(
+                        Property.listing_key == listing_key
+                    )
+                )
+            ).first()
+            if subject is None or subject.latitude is None or subject.longitude is None:
+                return []
+
+            candidate_keys = await self._nearest_keys(listing_key, subject, city_name, count)
+            if not candidate_keys:
+                return []
+
+            result = await db.execute(
+                select(*(_PROPERTY_COLUMNS[name] for name in columns)).where(Property.listing_key.in_(candidate_keys))
+            )
+            rows = {row.listing_key: row._asdict() for row in result}
+
+        # Keep the search's nearest-first order.
+        return [_jsonable(rows[key]) for key in candidate_keys if key in rows]
+
+    async def _nearest_keys(self, listing_key: str, subject: Any, city_name: str | None, count: int) -> list[str]:
+        location = {"lat": subject.latitude, "lon": subject.longitude}
+        filters: list[dict[str, Any]] = [
+            {"geo_distance": {"distance": f"{self.radius_km}km", "location": location}},
+        ]
+        if subject.property_type:
+            filters.append({"term": {"property_type.keyword": _normalize(subject.property_type)}})
+        if city_name:
+            filters.append({"term": {"city.keyword": _normalize(city_name)}})
+
+        response = await es_client.get_client().search(
+            index=settings.ELASTICSEARCH_INDEX,
+            query={"bool": {"filter": filters, "must_not": [{"ids": {"values": [listing_key]}}]}},
+            sort=[{"_geo_distance": {"location": location, "order": "asc", "unit": "km"}}],
+            size=count,
+            source=False,
+        )
+        return [hit["_id"] for hit in response["hits"]["hits"]]
+
+
+def _jsonable(row: dict[str, Any]) -> dict[str, Any]:
+    return {key: value.isoformat() if hasattr(value, "isoformat") else value for key, value in row.items()}
+
+
+candidate_prefilter = CandidatePrefilter()
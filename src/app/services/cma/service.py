@@ -1,41 +1,175 @@
 from __future__ import annotations
 
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from datetime import datetime
+import json
 import logging
+import time
 from typing import Any
 
 import httpx
 from fastapi import HTTPException
 
+from ...core.config import settings
+from ...core.utils.response_cache import content_key, response_cache
+from ...core.utils.single_flight import SingleFlight
 from ...schemas.cma import (
     ComparablesResponse,
     ReportRequest,
     ReportResponse,
 )
 
+from .baseline import baseline_engine
 from .client import CMAClient
+from .prefilter import candidate_prefilter
 
 logger = logging.getLogger(__name__)
 
 
+LOCAL_BASELINE_STRATEGY = "baseline_local"
+
+# Requests carrying their own prompt, model endpoint or credentials are never cached or served from cache.
+CACHE_BYPASS_FIELDS = frozenset(
+    {
+        "similarity_prompt",
+        "base_url",
+        "api_key",
+        "qdrant_url",
+        "qdrant_api_key",
+        "openai_api_key",
+        "openai_base_url",
+    }
+)
+
+
+def _bypasses_cache(body: dict[str, Any]) -> bool:
+    return any(body.get(field) for field in CACHE_BYPASS_FIELDS)
+
+
+def sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
 class CMAService:
     def __init__(self) -> None:
         self.client = CMAClient()
+        self.flight = SingleFlight("cma")
 
-    async def find_comparables(self, body: dict[str, Any]) -> ComparablesResponse:
+    async def find_comparables(self, body: dict[str, Any], listing_stamp: datetime | None = None) -> ComparablesResponse:
+        strategy = body.get("strategy", "llm")
+        if strategy == LOCAL_BASELINE_STRATEGY:
+            return await self._find_local(body)
+
+        prepare = candidate_prefilter.prepare if candidate_prefilter.applies(body) else None
         try:
-            data = await self.client.post("/api/v1/comparables", body)
-        except httpx.HTTPStatusError as exc:
-            detail = _extract_detail(exc)
-            raise HTTPException(status_code=exc.response.status_code, detail=detail) from exc
-        except httpx.RequestError as exc:
-            logger.exception("CMA API connection error")
-            raise HTTPException(status_code=502, detail="CMA service unavailable") from exc
+            data = await self._post(f"comparables.{strategy}", "/api/v1/comparables", body, listing_stamp, prepare)
+        except HTTPException as exc:
+            if exc.status_code < 500 or not settings.BASELINE_ENGINE_FALLBACK:
+                raise
+            # The CMA service is down or failing: a local baseline answer beats a 5xx.
+            fallback = await baseline_engine.find_comparables(body)
+            if fallback is None:
+                raise
+            logger.warning(f"CMA API failed with {exc.status_code}; answered {strategy} comparables locally")
+            fallback.fallback_from = strategy
+            return fallback
         return ComparablesResponse.model_validate(data)
 
-    async def generate_report(self, request: ReportRequest) -> ReportResponse:
+    @staticmethod
+    async def _find_local(body: dict[str, Any]) -> ComparablesResponse:
+        if not baseline_engine.ready:
+            raise HTTPException(status_code=503, detail="Local comparables engine is not loaded")
+        result = await baseline_engine.find_comparables(body)
+        if result is None:
+            raise HTTPException(status_code=422, detail="Subject listing has no coordinates or no loaded city")
+        return result
+
+    async def stream_comparables(self, body: dict[str, Any], listing_stamp: datetime | None = None) -> AsyncIterator[str]:
+        """Server-sent events for a comparables run: `stage` events as it progresses, then `result` or `error`.
+
+        With `CMA_API_STREAMING` the upstream's own event stream is relayed frame by frame. Otherwise the
+        regular (cached, coalesced) call runs while heartbeat stages are emitted, and its timing logs are
+        replayed as stages before the result.
+        """
+        strategy = body.get("strategy", "llm")
+        yield sse_event("stage", {"step": "accepted", "strategy": strategy})
+
+        if settings.CMA_API_STREAMING and strategy != LOCAL_BASELINE_STRATEGY:
+            try:
+                upstream_body = await candidate_prefilter.prepare(body) if candidate_prefilter.applies(body) else body
+                async for frame in self.client.stream("/api/v1/comparables/stream", upstream_body):
+                    yield frame
+                return
+            except httpx.HTTPStatusError as exc:
+                if exc.response.status_code not in (404, 405, 501):
+                    yield sse_event("error", {"status_code": exc.response.status_code, "detail": _extract_detail(exc)})
+                    return
+                logger.info("CMA API has no streaming endpoint; synthesizing stage events")
+            except httpx.RequestError:
+                logger.exception("CMA API connection error")
+                yield sse_event("error", {"status_code": 502, "detail": "CMA service unavailable"})
+                return
+
+        started = time.monotonic()
+        call = asyncio.ensure_future(self.find_comparables(body, listing_stamp))
+        try:
+            while True:
+                done, _ = await asyncio.wait({call}, timeout=settings.CMA_STREAM_HEARTBEAT_SECONDS)
+                if done:
+                    break
+                elapsed_ms = round((time.monotonic() - started) * 1000)
+                yield sse_event("stage", {"step": "waiting", "strategy": strategy, "elapsed_ms": elapsed_ms})
+        finally:
+            # A disconnected client stops waiting here; the coalesced upstream call carries on for others.
+            call.cancel()
+
+        try:
+            result = call.result()
+        except HTTPException as exc:
+            yield sse_event("error", {"status_code": exc.status_code, "detail": exc.detail})
+            return
+        except Exception:
+            # Headers and stage events are already out, so the failure has to be reported in-stream.
+            logger.exception("CMA comparables stream failed")
+            yield sse_event("error", {"status_code": 502, "detail": "CMA service unavailable"})
+            return
+
+        for log in result.timing_logs:
+            yield sse_event("stage", log.model_dump(mode="json", exclude_none=True))
+        yield sse_event("result", result.model_dump(mode="json"))
+
+    async def generate_report(self, request: ReportRequest, listing_stamp: datetime | None = None) -> ReportResponse:
         body = request.model_dump(exclude_none=True)
+        data = await self._post("cma-report", "/api/v1/reports", body, listing_stamp)
+        return ReportResponse.model_validate(data)
+
+    async def _post(
+        self,
+        namespace: str,
+        path: str,
+        body: dict[str, Any],
+        listing_stamp: datetime | None,
+        prepare: Callable[[dict[str, Any]], Awaitable[dict[str, Any]]] | None = None,
+    ) -> dict[str, Any]:
+        """POST to the CMA API through the response cache, keyed by the body and the listing's modification stamp.
+
+        Identical concurrent requests share one upstream call. `prepare` rewrites the body just before
+        it is sent, so cache hits skip it and it does not change the cache key.
+        """
+
+        async def call() -> dict[str, Any]:
+            return await self.client.post(path, await prepare(body) if prepare else body)
+
         try:
-            data = await self.client.post("/api/v1/reports", body)
+            if _bypasses_cache(body):
+                return await call()
+            material = {"body": body, "listing_stamp": listing_stamp}
+            return await self.flight.do(
+                content_key(namespace, material),
+                lambda: response_cache.get_or_compute(namespace, material, call),
+                distributed=True,
+            )
         except httpx.HTTPStatusError as exc:
             detail = _extract_detail(exc)
             raise HTTPException(status_code=exc.response.status_code, detail=detail) from exc
@@ -43,8 +177,6 @@ class CMAService:
             logger.exception("CMA API connection error")
             raise HTTPException(status_code=502, detail="CMA service unavailable") from exc
 
-        return ReportResponse.model_validate(data)
-
 
 def _extract_detail(exc: httpx.HTTPStatusError) -> str:
     try:
@@ -1,13 +1,13 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-import json
 import logging
 from typing import Protocol
 
 from aiokafka import AIOKafkaProducer
 
 from ....schemas.ingest import Pager, RawProperty
+from .envelope import FORMAT_JSON, encode_raw_message
 
 logger = logging.getLogger(__name__)
 
@@ -17,17 +17,18 @@ class MLSClient(Protocol):
         ...
 
 
-def _json_default(value):
-    if isinstance(value, datetime):
-        return value.isoformat()
-    return str(value)
-
-
 class CrawlModule:
-    def __init__(self, mls_client: MLSClient, producer: AIOKafkaProducer, raw_message_topic: str) -> None:
+    def __init__(
+        self,
+        mls_client: MLSClient,
+        producer: AIOKafkaProducer,
+        raw_message_topic: str,
+        message_format: str = FORMAT_JSON,
+    ) -> None:
         self.mls_client = mls_client
         self.producer = producer
         self.raw_message_topic = raw_message_topic
+        self.message_format = message_format
 
     async def crawl(self, since: datetime) -> int:
         if since.tzinfo is None:
@@ -45,23 +46,15 @@ class CrawlModule:
 
             batch = self.producer.create_batch()
             for prop in properties:
-                payload = {
-                    "listing_key": prop.listing_key,
-                    "listing_id": prop.listing_id,
-                    "status": prop.standard_status,
-                    "channel": prop.channel.value,
-                    "crawled_at": crawled_at,
-                    "data": prop.data,
-                }
-                encoded = json.dumps(payload, default=_json_default).encode("utf-8")
-                if batch is None or batch.append(value=encoded, key=None, timestamp=None) is None:
+                encoded, headers = encode_raw_message(prop, crawled_at, self.message_format)
+                if batch is None or batch.append(value=encoded, key=None, timestamp=None, headers=headers) is None:
                     if batch is not None:
                         await self.producer.send_batch(batch, self.raw_message_topic)
                     batch = self.producer.create_batch()
                     if batch is None:
-                        await self.producer.send_and_wait(self.raw_message_topic, encoded)
+                        await self.producer.send_and_wait(self.raw_message_topic, encoded, headers=headers)
                     else:
-                        batch.append(value=encoded, key=None, timestamp=None)
+                        batch.append(value=encoded, key=None, timestamp=None, headers=headers)
 
             if batch is not None and batch.record_count() > 0:
                 await self.producer.send_batch(batch, self.raw_message_topic)
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+import json
+import struct
+import zlib
+from typing import Any
+
+from ....schemas.ingest import Channel, RawProperty
+
+CONTENT_TYPE_HEADER = "content-type"
+JSON_CONTENT_TYPE = "application/json"
+ENVELOPE_CONTENT_TYPE = "application/vnd.zaminai.mls-raw.v1"
+
+FORMAT_JSON = "json"
+FORMAT_ENVELOPE = "binary"
+
+# v1 layout (big-endian):
+#   magic(4) version(u8) flags(u8) crawled_at_us(i64)
+#   len(listing_key)(u16) len(listing_id)(u16) len(status)(u16) len(channel)(u16) len(payload)(u32)
+#   listing_key | listing_id | status | channel | payload
+# The payload is the compact JSON encoding of `data`, zlib-compressed when FLAG_COMPRESSED is set.
+MAGIC = b"ZMLS"
+VERSION = 1
+FLAG_COMPRESSED = 0x01
+FLAG_HAS_CRAWLED_AT = 0x02
+
+_HEADER = struct.Struct(">4sBBqHHHHI")
+
+COMPRESSION_LEVEL = 3
+COMPRESSION_MIN_BYTES = 256
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class EnvelopeError(ValueError):
+    pass
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _to_micros(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - _EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _from_micros(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=value)
+
+
+def _encode_text(value: str | None, field: str) -> bytes:
+    encoded = (value or "").encode("utf-8")
+    if len(encoded) > 0xFFFF:
+        raise EnvelopeError(f"{field} is too long for the envelope header")
+    return encoded
+
+
+def encode_json(prop: RawProperty, crawled_at: datetime | None) -> bytes:
+    payload = {
+        "listing_key": prop.listing_key,
+        "listing_id": prop.listing_id,
+        "status": prop.standard_status,
+        "channel": prop.channel.value,
+        "crawled_at": crawled_at,
+        "data": prop.data,
+    }
+    return json.dumps(payload, default=_json_default).encode("utf-8")
+
+
+def encode_envelope(prop: RawProperty, crawled_at: datetime | None) -> bytes:
+    listing_key = _encode_text(prop.listing_key, "listing_key")
+    listing_id = _encode_text(prop.listing_id, "listing_id")
+    status = _encode_text(prop.standard_status, "status")
+    channel = _encode_text(prop.channel.value, "channel")
+
+    flags = 0
+    payload = json.dumps(prop.data, default=_json_default, separators=(",", ":")).encode("utf-8")
+    if len(payload) >= COMPRESSION_MIN_BYTES:
+        payload = zlib.compress(payload, COMPRESSION_LEVEL)
+        flags |= FLAG_COMPRESSED
+
+    crawled_at_us = 0
+    if crawled_at is not None:
+        crawled_at_us = _to_micros(crawled_at)
+        flags |= FLAG_HAS_CRAWLED_AT
+
+    header = _HEADER.pack(
+        MAGIC,
+        VERSION,
+        flags,
+        crawled_at_us,
+        len(listing_key),
+        len(listing_id),
+        len(status),
+        len(channel),
+        len(payload),
+    )
+    return b"".join((header, listing_key, listing_id, status, channel, payload))
+
+
+def encode_raw_message(
+    prop: RawProperty, crawled_at: datetime | None, fmt: str = FORMAT_JSON
+) -> tuple[bytes, list[tuple[str, bytes]]]:
+    """Encode a crawled property and return the message value together with its Kafka headers."""
+    if fmt == FORMAT_JSON:
+        return encode_json(prop, crawled_at), [(CONTENT_TYPE_HEADER, JSON_CONTENT_TYPE.encode())]
+    if fmt == FORMAT_ENVELOPE:
+        return encode_envelope(prop, crawled_at), [(CONTENT_TYPE_HEADER, ENVELOPE_CONTENT_TYPE.encode())]
+    raise ValueError(f"unknown raw message format {fmt!r}")
+
+
+def _content_type(headers: Any) -> str:
+    for key, value in headers or ():
+        if key.lower() == CONTENT_TYPE_HEADER:
+            return value.decode() if isinstance(value, bytes) else str(value)
+    return ""
+
+
+def decode_envelope(value: bytes) -> RawProperty:
+    if len(value) < _HEADER.size:
+        raise EnvelopeError("message is shorter than the envelope header")
+
+    magic, version, flags, crawled_at_us, key_len, id_len, status_len, channel_len, payload_len = _HEADER.unpack_from(
+        value
+    )
+    if magic != MAGIC:
+        raise EnvelopeError("unexpected envelope magic")
+    if version != VERSION:
+        raise EnvelopeError(f"unsupported envelope version {version}")
+
+    view = memoryview(value)
+    offset = _HEADER.size
+    fields: list[str] = []
+    for length in (key_len, id_len, status_len, channel_len):
+        fields.append(bytes(view[offset : offset + length]).decode("utf-8"))
+        offset += length
+
+    payload = bytes(view[offset : offset + payload_len])
+    if len(payload) != payload_len:
+        raise EnvelopeError("truncated envelope payload")
+    if flags & FLAG_COMPRESSED:
+        payload = zlib.decompress(payload)
+
+    listing_key, listing_id, status, channel = fields
+    return RawProperty(
+        listing_key=listing_key,
+        listing_id=listing_id,
+        standard_status=status,
+        channel=Channel(channel),
+        data=json.loads(payload),
+        crawled_at=_from_micros(crawled_at_us) if flags & FLAG_HAS_CRAWLED_AT else None,
+    )
+
+
+def decode_json(value: bytes) -> RawProperty:
+    payload = json.loads(value)
+    crawled_at = payload.get("crawled_at")
+    return RawProperty(
+        listing_key=payload.get("listing_key", ""),
+        listing_id=payload.get("listing_id", ""),
+        standard_status=payload.get("status", ""),
+        channel=Channel(payload.get("channel", "")),
+        data=payload.get("data"),
+        crawled_at=datetime.fromisoformat(crawled_at) if crawled_at else None,
+    )
+
+
+def decode_raw_message(value: bytes, headers: Any = None) -> RawProperty:
+    """Decode a raw MLS message written in either format.
+
+    The content-type header decides the format; messages produced before the header existed are
+    detected by the envelope magic and otherwise treated as JSON.
+    """
+    content_type = _content_type(headers)
+    if content_type == ENVELOPE_CONTENT_TYPE:
+        return decode_envelope(value)
+    if content_type == JSON_CONTENT_TYPE:
+        return decode_json(value)
+    if value[: len(MAGIC)] == MAGIC:
+        return decode_envelope(value)
+    return decode_json(value)
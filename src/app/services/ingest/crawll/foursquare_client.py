@@ -6,6 +6,7 @@ from urllib.parse import parse_qs, urlparse
 
 import httpx
 
+from ....core.http_clients import http_clients
 from ....schemas.ingest import (
     CategoryIcon,
     Coordinates,
@@ -26,7 +27,10 @@ API_VERSION = "2025-06-17"
 class FoursquareClient:
     def __init__(self, api_key: str) -> None:
         self.api_key = api_key
-        self._client = httpx.AsyncClient()
+
+    @property
+    def _client(self) -> httpx.AsyncClient:
+        return http_clients.get("foursquare")
 
     async def search_places(
         self,
@@ -153,4 +157,5 @@ class FoursquareClient:
         return cursor[0] if cursor else ""
 
     async def close(self) -> None:
-        await self._client.aclose()
+        # The pooled client belongs to the registry and is closed with it.
+        return None
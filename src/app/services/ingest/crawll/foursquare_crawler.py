@@ -1,24 +1,19 @@
 from __future__ import annotations
 
+import asyncio
+from datetime import UTC, datetime
 import logging
 
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ....crud.crud_ingest_category import crud_ingest_category
-from ....crud.crud_ingest_chain import crud_ingest_chain
-from ....crud.crud_ingest_pointofinterest import crud_ingest_pointofinterest
-from ....schemas.ingest import (
-    CategoryCreate,
-    ChainCreate,
-    FoursquareCategory,
-    FoursquareChain,
-    FoursquarePlace,
-    PointOfInterestCreate,
-    PointOfInterestUpdate,
-)
+from ....core.config import settings
+from ....models.ingest import IngestCategory, IngestChain, IngestPointOfInterest
+from ....schemas.ingest import FoursquarePlace, PointOfInterestCreate
 from .foursquare_client import FoursquareClient
-from .grid import BBox, generate_grid
+from .grid import TILE_LAT_DELTA, TILE_LON_DELTA, BBox, generate_grid
+from .tile_tree import TileLeaf, TileTree
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +24,11 @@ SD_WEST = -117.26
 
 SEARCH_LIMIT = 50
 
+# Coarse tiles are 4x4 of the old fixed grid; dense tiles are split down to a quarter of it.
+COARSE_TILE_FACTOR = 4
+MIN_TILE_LAT_DELTA = TILE_LAT_DELTA / 4
+MIN_TILE_LON_DELTA = TILE_LON_DELTA / 4
+
 RELEVANT_CATEGORIES = [
     "4bf58dd8d48988d1e0931735",  # Coffee Shop
     "4d4b7105d754a06374d81259",  # Restaurant
@@ -40,41 +40,97 @@ RELEVANT_CATEGORIES = [
 
 
 class FoursquareCrawler:
-    def __init__(self, client: FoursquareClient, db: AsyncSession) -> None:
+    def __init__(
+        self,
+        client: FoursquareClient,
+        db: AsyncSession,
+        concurrency: int | None = None,
+        tile_tree_path: str | None = None,
+        split_depth: int | None = None,
+    ) -> None:
         self.client = client
         self.db = db
+        self.concurrency = max(1, concurrency or settings.FOURSQUARE_CRAWL_CONCURRENCY)
+        self.tile_tree_path = tile_tree_path or settings.FOURSQUARE_TILE_TREE_PATH
+        self.split_depth = max(1, split_depth or settings.FOURSQUARE_SPLIT_PAGE_DEPTH)
+        self._stats: dict[str, int] = {}
+        self._api_semaphore = asyncio.Semaphore(self.concurrency)
         self._category_cache: dict[str, int] = {}
         self._chain_cache: dict[str, int] = {}
+        self._caches_loaded = False
+        # Tiles fetch concurrently but share one session, so writes are serialized.
+        self._db_lock = asyncio.Lock()
 
-    async def crawl(self) -> None:
+    async def crawl(self) -> dict[str, int]:
         bbox = BBox(north=SD_NORTH, south=SD_SOUTH, east=SD_EAST, west=SD_WEST)
-        await self.crawl_grid(bbox)
+        return await self.crawl_grid(bbox)
 
-    async def debug_crawl(self, ne_lat: float, ne_lon: float, sw_lat: float, sw_lon: float) -> None:
+    async def debug_crawl(self, ne_lat: float, ne_lon: float, sw_lat: float, sw_lon: float) -> dict[str, int]:
         bbox = BBox(north=ne_lat, south=sw_lat, east=ne_lon, west=sw_lon)
-        await self.crawl_grid(bbox)
-
-    async def crawl_grid(self, target_bbox: BBox) -> None:
-        tiles = generate_grid(target_bbox)
-        if tiles:
-            snapped_bbox = BBox(
-                south=tiles[0].south,
-                west=tiles[0].west,
-                north=tiles[-1].north,
-                east=tiles[-1].east,
-            )
-            logger.info("foursquare.grid", extra={"tiles": len(tiles), "snapped_bbox": snapped_bbox})
+        return await self.crawl_grid(bbox)
+
+    async def load_caches(self) -> None:
+        categories = await self.db.execute(select(IngestCategory.foursquare_id, IngestCategory.id))
+        self._category_cache = {foursquare_id: id_ for foursquare_id, id_ in categories.all()}
+        chains = await self.db.execute(select(IngestChain.foursquare_id, IngestChain.id))
+        self._chain_cache = {foursquare_id: id_ for foursquare_id, id_ in chains.all()}
+        self._caches_loaded = True
+        logger.info(
+            "foursquare.caches.loaded",
+            extra={"categories": len(self._category_cache), "chains": len(self._chain_cache)},
+        )
+
+    async def crawl_grid(self, target_bbox: BBox) -> dict[str, int]:
+        """Crawl `target_bbox` adaptively and return API/tile statistics.
+
+        Coarse tiles (or the leaves saved by the previous crawl of the same box) are paginated; a tile
+        whose pages stay full past `split_depth` is split into quadrants until the minimum tile size.
+        """
+        if not self._caches_loaded:
+            await self.load_caches()
+
+        self._stats = {"api_calls": 0, "tiles": 0, "splits": 0, "leaves": 0, "places": 0, "failed_tiles": 0}
+        self._api_semaphore = asyncio.Semaphore(self.concurrency)
 
-        for idx, tile in enumerate(tiles):
+        tree = TileTree(self.tile_tree_path)
+        tree.load()
+        known_leaves = tree.leaves(target_bbox)
+        tiles = [leaf.bbox for leaf in known_leaves] or generate_grid(
+            target_bbox,
+            tile_lat_delta=TILE_LAT_DELTA * COARSE_TILE_FACTOR,
+            tile_lon_delta=TILE_LON_DELTA * COARSE_TILE_FACTOR,
+        )
+        logger.info(
+            "foursquare.grid",
+            extra={"tiles": len(tiles), "reused_tree": bool(known_leaves), "target_bbox": target_bbox},
+        )
+
+        leaves: list[TileLeaf] = []
+
+        async def run(idx: int, tile: BBox) -> None:
             try:
-                await self._process_tile(tile)
+                await self._explore_tile(tile, leaves)
             except Exception as exc:  # noqa: BLE001
+                self._stats["failed_tiles"] += 1
+                # Keep the tile so the next crawl retries it instead of falling back to the coarse grid.
+                leaves.append(TileLeaf(bbox=tile))
                 logger.warning("foursquare.tile.failed", extra={"index": idx, "error": str(exc)})
 
-    async def _process_tile(self, bbox: BBox) -> None:
-        cursor = ""
-        while True:
-            results, next_cursor = await self.client.search_places(
+        await asyncio.gather(*(run(idx, tile) for idx, tile in enumerate(tiles)))
+
+        tree.store(target_bbox, leaves)
+        tree.save()
+        self._stats["leaves"] = len(leaves)
+        logger.info("foursquare.crawl.stats", extra=self._stats)
+        return dict(self._stats)
+
+    def _can_split(self, bbox: BBox) -> bool:
+        return bbox.lat_span / 2 >= MIN_TILE_LAT_DELTA - 1e-9 and bbox.lon_span / 2 >= MIN_TILE_LON_DELTA - 1e-9
+
+    async def _search(self, bbox: BBox, cursor: str) -> tuple[list[FoursquarePlace], str | None]:
+        async with self._api_semaphore:
+            self._stats["api_calls"] += 1
+            return await self.client.search_places(
                 RELEVANT_CATEGORIES,
                 ne_lat=bbox.north,
                 ne_lon=bbox.east,
@@ -84,74 +140,94 @@ class FoursquareCrawler:
                 cursor=cursor or None,
             )
 
-            for place in results:
-                await self._upsert_place(place)
+    async def _explore_tile(self, bbox: BBox, leaves: list[TileLeaf]) -> None:
+        self._stats["tiles"] += 1
+        cursor = ""
+        pages = 0
+        places = 0
+        while True:
+            results, next_cursor = await self._search(bbox, cursor)
+            pages += 1
+            places += len(results)
+            if results:
+                await self._write_page(results)
+                self._stats["places"] += len(results)
 
             if not next_cursor:
                 break
+            # Empty or partial pages never split; a tile only splits while its pages are still full.
+            if len(results) >= SEARCH_LIMIT and pages >= self.split_depth and self._can_split(bbox):
+                self._stats["splits"] += 1
+                await asyncio.gather(*(self._explore_tile(child, leaves) for child in bbox.split()))
+                return
             cursor = next_cursor
 
-    async def _resolve_category_ids(self, categories: list[FoursquareCategory]) -> list[int]:
-        ids: list[int] = []
-        for cat in categories:
-            cached = self._category_cache.get(cat.id)
-            if cached is not None:
-                ids.append(cached)
-                continue
-
-            existing = await crud_ingest_category.get(db=self.db, foursquare_id=cat.id, return_as_model=True)
-            if existing is None:
-                create_in = CategoryCreate(
-                    foursquare_id=cat.id,
-                    name=cat.name,
-                    icon_prefix=cat.icon.prefix if cat.icon else None,
-                    icon_suffix=cat.icon.suffix if cat.icon else None,
-                )
-                try:
-                    existing = await crud_ingest_category.create(db=self.db, object=create_in, return_as_model=True)
-                except IntegrityError:
-                    await self.db.rollback()
-                    existing = await crud_ingest_category.get(
-                        db=self.db, foursquare_id=cat.id, return_as_model=True
-                    )
-
-            if existing is None:
-                continue
-
-            self._category_cache[cat.id] = existing.id
-            ids.append(existing.id)
-        return ids
-
-    async def _resolve_chain_ids(self, chains: list[FoursquareChain]) -> list[int]:
-        ids: list[int] = []
-        for chain in chains:
-            cached = self._chain_cache.get(chain.id)
-            if cached is not None:
-                ids.append(cached)
-                continue
-
-            existing = await crud_ingest_chain.get(db=self.db, foursquare_id=chain.id, return_as_model=True)
-            if existing is None:
-                create_in = ChainCreate(foursquare_id=chain.id, name=chain.name)
-                try:
-                    existing = await crud_ingest_chain.create(db=self.db, object=create_in, return_as_model=True)
-                except IntegrityError:
-                    await self.db.rollback()
-                    existing = await crud_ingest_chain.get(
-                        db=self.db, foursquare_id=chain.id, return_as_model=True
-                    )
-
-            if existing is None:
-                continue
-
-            self._chain_cache[chain.id] = existing.id
-            ids.append(existing.id)
-        return ids
-
-    async def _upsert_place(self, place: FoursquarePlace) -> None:
-        category_ids = await self._resolve_category_ids(place.categories)
-        chain_ids = await self._resolve_chain_ids(place.chains)
+        leaves.append(TileLeaf(bbox=bbox, places=places, pages=pages))
+
+    async def _write_page(self, places: list[FoursquarePlace]) -> None:
+        async with self._db_lock:
+            try:
+                categories = await self._ensure_categories(places)
+                chains = await self._ensure_chains(places)
+                await self._upsert_places(places, categories, chains)
+                await self.db.commit()
+            except Exception:
+                await self.db.rollback()
+                raise
+            # Only cache ids once their rows are committed; a rolled-back page must not leak ids into later pages.
+            self._category_cache = categories
+            self._chain_cache = chains
+
+    async def _ensure_categories(self, places: list[FoursquarePlace]) -> dict[str, int]:
+        """Insert the page's unknown categories; returns the category cache extended with their ids."""
+        missing = {}
+        for place in places:
+            for cat in place.categories:
+                if cat.id not in self._category_cache:
+                    missing[cat.id] = {
+                        "foursquare_id": cat.id,
+                        "name": cat.name,
+                        "icon_prefix": cat.icon.prefix if cat.icon else None,
+                        "icon_suffix": cat.icon.suffix if cat.icon else None,
+                        "created_at": datetime.now(UTC),
+                    }
+        if not missing:
+            return self._category_cache
 
+        stmt = insert(IngestCategory).values(list(missing.values()))
+        # DO UPDATE (rather than DO NOTHING) so RETURNING also yields rows another crawler inserted first.
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[IngestCategory.foursquare_id],
+            set_={"name": stmt.excluded.name},
+        ).returning(IngestCategory.foursquare_id, IngestCategory.id)
+        result = await self.db.execute(stmt)
+        return {**self._category_cache, **{foursquare_id: id_ for foursquare_id, id_ in result.all()}}
+
+    async def _ensure_chains(self, places: list[FoursquarePlace]) -> dict[str, int]:
+        """Insert the page's unknown chains; returns the chain cache extended with their ids."""
+        missing = {}
+        for place in places:
+            for chain in place.chains:
+                if chain.id not in self._chain_cache:
+                    missing[chain.id] = {
+                        "foursquare_id": chain.id,
+                        "name": chain.name,
+                        "created_at": datetime.now(UTC),
+                    }
+        if not missing:
+            return self._chain_cache
+
+        stmt = insert(IngestChain).values(list(missing.values()))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[IngestChain.foursquare_id],
+            set_={"name": stmt.excluded.name},
+        ).returning(IngestChain.foursquare_id, IngestChain.id)
+        result = await self.db.execute(stmt)
+        return {**self._chain_cache, **{foursquare_id: id_ for foursquare_id, id_ in result.all()}}
+
+    def _place_row(
+        self, place: FoursquarePlace, now: datetime, categories: dict[str, int], chains: dict[str, int]
+    ) -> dict:
         lat = place.latitude or (place.geocodes.main.latitude if place.geocodes else 0.0)
         lon = place.longitude or (place.geocodes.main.longitude if place.geocodes else 0.0)
 
@@ -163,31 +239,37 @@ class FoursquareCrawler:
                 "twitter": place.social_media.twitter,
             }
 
-        payload = {
-            "foursquare_id": place.fsq_place_id,
-            "name": place.name,
-            "latitude": lat,
-            "longitude": lon,
-            "address": place.location.address or "",
-            "city": place.location.locality or "",
-            "state": place.location.region or "",
-            "zip_code": place.location.postcode or "",
-            "popularity": place.popularity,
-            "rating": place.rating,
-            "price": place.price,
-            "website": place.website,
-            "social_media": social_media,
-            "category_ids": category_ids,
-            "chain_ids": chain_ids,
-        }
-
-        existing = await crud_ingest_pointofinterest.get(
-            db=self.db, foursquare_id=place.fsq_place_id, return_as_model=True
-        )
-        if existing is None:
-            create_in = PointOfInterestCreate(**payload)
-            await crud_ingest_pointofinterest.create(db=self.db, object=create_in)
-            return
+        payload = PointOfInterestCreate(
+            foursquare_id=place.fsq_place_id,
+            name=place.name,
+            latitude=lat,
+            longitude=lon,
+            address=place.location.address or "",
+            city=place.location.locality or "",
+            state=place.location.region or "",
+            zip_code=place.location.postcode or "",
+            popularity=place.popularity,
+            rating=place.rating,
+            price=place.price,
+            website=place.website,
+            social_media=social_media,
+            category_ids=[categories[cat.id] for cat in place.categories if cat.id in categories],
+            chain_ids=[chains[chain.id] for chain in place.chains if chain.id in chains],
+        ).model_dump()
+        payload["created_at"] = now
+        return payload
+
+    async def _upsert_places(
+        self, places: list[FoursquarePlace], categories: dict[str, int], chains: dict[str, int]
+    ) -> None:
+        now = datetime.now(UTC)
+        # A single INSERT cannot touch the same row twice, so keep the last copy of each place.
+        rows = {place.fsq_place_id: self._place_row(place, now, categories, chains) for place in places}
 
-        update_in = PointOfInterestUpdate(**payload)
-        await crud_ingest_pointofinterest.update(db=self.db, id=existing.id, object=update_in)
+        stmt = insert(IngestPointOfInterest).values(list(rows.values()))
+        updatable = [column for column in next(iter(rows.values())) if column not in ("foursquare_id", "created_at")]
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[IngestPointOfInterest.foursquare_id],
+            set_={**{column: stmt.excluded[column] for column in updatable}, "updated_at": now},
+        )
+        await self.db.execute(stmt)
@@ -11,10 +11,35 @@ class BBox:
     east: float
     west: float
 
+    @property
+    def lat_span(self) -> float:
+        return self.north - self.south
 
-def generate_grid(target: BBox) -> list[BBox]:
-    tile_lat_delta = 0.0145
-    tile_lon_delta = 0.0172
+    @property
+    def lon_span(self) -> float:
+        return self.east - self.west
+
+    def split(self) -> list[BBox]:
+        mid_lat = (self.north + self.south) / 2
+        mid_lon = (self.east + self.west) / 2
+        return [
+            BBox(north=self.north, south=mid_lat, east=mid_lon, west=self.west),
+            BBox(north=self.north, south=mid_lat, east=self.east, west=mid_lon),
+            BBox(north=mid_lat, south=self.south, east=mid_lon, west=self.west),
+            BBox(north=mid_lat, south=self.south, east=self.east, west=mid_lon),
+        ]
+
+    def key(self) -> str:
+        return f"{self.north:.6f},{self.south:.6f},{self.east:.6f},{self.west:.6f}"
+
+
+TILE_LAT_DELTA = 0.0145
+TILE_LON_DELTA = 0.0172
+
+
+def generate_grid(
+    target: BBox, tile_lat_delta: float = TILE_LAT_DELTA, tile_lon_delta: float = TILE_LON_DELTA
+) -> list[BBox]:
 
     target_north = max(target.north, target.south)
     target_south = min(target.north, target.south)
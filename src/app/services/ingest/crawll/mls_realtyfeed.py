@@ -6,6 +6,7 @@ import logging
 
 import httpx
 
+from ....core.http_clients import http_clients
 from ....schemas.ingest import Channel, Pager, RawProperty
 
 logger = logging.getLogger(__name__)
@@ -17,7 +18,10 @@ class RealtyFeedMLSClient:
         self.client_id = client_id
         self.client_secret = client_secret
         self._auth: _AuthToken | None = None
-        self._client = httpx.AsyncClient()
+
+    @property
+    def _client(self) -> httpx.AsyncClient:
+        return http_clients.get("realtyfeed")
 
     async def _authenticate(self) -> None:
         if self._auth and self._auth.is_valid():
@@ -88,7 +92,8 @@ class RealtyFeedMLSClient:
         return properties
 
     async def close(self) -> None:
-        await self._client.aclose()
+        # The pooled client belongs to the registry and is closed with it.
+        return None
 
 
 @dataclass
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+import json
+import logging
+import os
+from pathlib import Path
+
+from .grid import BBox
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TileLeaf:
+    bbox: BBox
+    places: int = 0
+    pages: int = 0
+
+
+class TileTree:
+    """Leaves of the adaptive crawl, stored per target box so a re-crawl starts where the last one ended."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._targets: dict[str, dict] = {}
+
+    def load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            self._targets = json.loads(self.path.read_text())
+        except (OSError, ValueError) as exc:
+            logger.warning("foursquare.tile_tree.unreadable", extra={"path": str(self.path), "error": str(exc)})
+            self._targets = {}
+
+    def leaves(self, target: BBox) -> list[TileLeaf]:
+        entry = self._targets.get(target.key())
+        if not entry:
+            return []
+        return [TileLeaf(bbox=BBox(**leaf["bbox"]), places=leaf["places"], pages=leaf["pages"]) for leaf in entry["leaves"]]
+
+    def store(self, target: BBox, leaves: list[TileLeaf]) -> None:
+        self._targets[target.key()] = {
+            "updated_at": datetime.now(UTC).isoformat(),
+            "leaves": [{"bbox": asdict(leaf.bbox), "places": leaf.places, "pages": leaf.pages} for leaf in leaves],
+        }
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(self._targets))
+        os.replace(tmp_path, self.path)
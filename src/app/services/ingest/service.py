@@ -26,6 +26,7 @@ class IngestService:
             mls_client=self.mls_client,
             producer=self.producer,
             raw_message_topic=settings.MLS_RAW_MESSAGE_TOPIC,
+            message_format=settings.MLS_RAW_MESSAGE_FORMAT,
         )
 
     @classmethod
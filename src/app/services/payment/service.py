@@ -7,6 +7,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...core.config import settings
 from ...models.payment import PaymentPlan, PaymentSubscription, UserPayment
+from ..subscription.meter import usage_meter
+from ..subscription.summary_cache import subscription_summary_cache
 from ...schemas.payment import (
     CheckoutResponse,
     PaymentPlan as PaymentPlanSchema,
@@ -195,6 +197,8 @@ class PaymentService:
             binding.last_synced_at = now
 
         await self.db.commit()
+        await subscription_summary_cache.invalidate(user_id)
+        await usage_meter.invalidate(user_id)
 
         return SubscriptionSnapshot(
             user_id=user_id,
@@ -0,0 +1 @@
+from .service import poi_service as poi_service
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .index import PointOfInterestIndex
+from .service import PointOfInterestService
+
+# Crawled places carry Foursquare leaf categories ("Thai Restaurant", "Dog Park"), not the parent
+# category the crawl searched for, so features group categories by name.
+PROXIMITY_CATEGORIES: dict[str, re.Pattern[str]] = {
+    "coffee": re.compile(r"\b(coffee|caf[eé]|espresso)\b", re.IGNORECASE),
+    "restaurant": re.compile(r"\b(restaurant|diner|bistro|steakhouse|pizzeria|eatery)\b", re.IGNORECASE),
+    "mall": re.compile(r"\b(shopping mall|mall|shopping plaza)\b", re.IGNORECASE),
+    "park": re.compile(r"\b(park|playground)\b", re.IGNORECASE),
+    "school": re.compile(r"\bschool\b", re.IGNORECASE),
+    "grocery": re.compile(r"\b(grocery|supermarket)\b", re.IGNORECASE),
+}
+
+NEAR_RADIUS_M = 500
+FAR_RADIUS_M = 1000
+# Beyond this distance a POI is not "walkable" and the nearest-distance field is left empty. It also
+# bounds how far a POI change can reach when recomputing features incrementally.
+NEAREST_MAX_M = 3000
+
+
+def feature_field(slug: str, kind: str) -> str:
+    return f"poi_{slug}_{kind}"
+
+
+def feature_fields() -> list[str]:
+    return [
+        feature_field(slug, kind)
+        for slug in PROXIMITY_CATEGORIES
+        for kind in ("nearest_m", "count_500m", "count_1km")
+    ]
+
+
+class ProximityFeatures:
+    """Per-category proximity features computed against a POI index snapshot."""
+
+    def __init__(self, index: PointOfInterestIndex, categories: dict[int, str]) -> None:
+        self.index = index
+        self.category_ids: dict[str, set[int]] = {
+            slug: {id_ for id_, name in categories.items() if pattern.search(name or "")}
+            for slug, pattern in PROXIMITY_CATEGORIES.items()
+        }
+
+    @classmethod
+    async def load(cls, db: AsyncSession) -> ProximityFeatures:
+        service = PointOfInterestService()
+        await service.load(db)
+        return cls(service.index, service.categories)
+
+    def compute(self, latitude: float | None, longitude: float | None) -> dict[str, Any]:
+        if latitude is None or longitude is None:
+            return {}
+
+        features: dict[str, Any] = {}
+        for slug, ids in self.category_ids.items():
+            nearest_m = None
+            count_near = 0
+            count_far = 0
+            if ids:
+                matches = self.index.within_radius(latitude, longitude, NEAREST_MAX_M, category_ids=ids)
+                if matches:
+                    nearest_m = round(matches[0][1], 1)
+                for _, distance in matches:
+                    if distance > FAR_RADIUS_M:
+                        break
+                    count_far += 1
+                    if distance <= NEAR_RADIUS_M:
+                        count_near += 1
+            features[feature_field(slug, "nearest_m")] = nearest_m
+            features[feature_field(slug, "count_500m")] = count_near
+            features[feature_field(slug, "count_1km")] = count_far
+        return features
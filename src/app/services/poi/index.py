@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+import heapq
+import math
+
+EARTH_RADIUS_M = 6_371_000.0
+METERS_PER_DEGREE_LAT = 111_320.0
+
+
+@dataclass(frozen=True, slots=True)
+class PointOfInterestEntry:
+    id: int
+    foursquare_id: str
+    name: str
+    latitude: float
+    longitude: float
+    category_ids: frozenset[int]
+    address: str | None = None
+    rating: float | None = None
+
+
+def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+class PointOfInterestIndex:
+    """Bucket grid over POI coordinates.
+
+    Points are hashed into square cells of `cell_degrees`; k-nearest and radius queries only visit
+    the rings of cells that can still contain a closer point.
+    """
+
+    def __init__(self, entries: Iterable[PointOfInterestEntry] = (), cell_degrees: float = 0.005) -> None:
+        self.cell_degrees = cell_degrees
+        self._cells: dict[tuple[int, int], list[PointOfInterestEntry]] = {}
+        self._size = 0
+        self._min_cell = (0, 0)
+        self._max_cell = (0, 0)
+        for entry in entries:
+            self._add(entry)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _cell(self, lat: float, lon: float) -> tuple[int, int]:
+        return math.floor(lat / self.cell_degrees), math.floor(lon / self.cell_degrees)
+
+    def _add(self, entry: PointOfInterestEntry) -> None:
+        cell = self._cell(entry.latitude, entry.longitude)
+        self._cells.setdefault(cell, []).append(entry)
+        if self._size == 0:
+            self._min_cell = self._max_cell = cell
+        else:
+            self._min_cell = (min(self._min_cell[0], cell[0]), min(self._min_cell[1], cell[1]))
+            self._max_cell = (max(self._max_cell[0], cell[0]), max(self._max_cell[1], cell[1]))
+        self._size += 1
+
+    def _ring(self, center: tuple[int, int], radius: int) -> Iterable[list[PointOfInterestEntry]]:
+        row, col = center
+        if radius == 0:
+            bucket = self._cells.get(center)
+            if bucket:
+                yield bucket
+            return
+        for r in range(row - radius, row + radius + 1):
+            step = 1 if r in (row - radius, row + radius) else 2 * radius
+            for c in range(col - radius, col + radius + 1, step):
+                bucket = self._cells.get((r, c))
+                if bucket:
+                    yield bucket
+
+    def _max_ring(self, center: tuple[int, int]) -> int:
+        return max(
+            abs(center[0] - self._min_cell[0]),
+            abs(center[0] - self._max_cell[0]),
+            abs(center[1] - self._min_cell[1]),
+            abs(center[1] - self._max_cell[1]),
+        )
+
+    def _ring_reach_m(self, lat: float, rings: int) -> float:
+        # Distance that rings 0..`rings` are guaranteed to cover; longitude cells shrink with latitude.
+        cell_m = self.cell_degrees * METERS_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 0.01)
+        return rings * cell_m
+
+    def nearest(
+        self,
+        lat: float,
+        lon: float,
+        k: int = 10,
+        category_ids: set[int] | None = None,
+        max_distance_m: float | None = None,
+    ) -> list[tuple[PointOfInterestEntry, float]]:
+        if self._size == 0 or k <= 0:
+            return []
+
+        center = self._cell(lat, lon)
+        max_ring = self._max_ring(center)
+        if max_distance_m is not None:
+            max_ring = min(max_ring, self._rings_for(lat, max_distance_m))
+
+        best: list[tuple[float, int, PointOfInterestEntry]] = []  # max-heap via negated distance
+        for radius in range(max_ring + 1):
+            for bucket in self._ring(center, radius):
+                for entry in bucket:
+                    if category_ids and category_ids.isdisjoint(entry.category_ids):
+                        continue
+                    distance = haversine_m(lat, lon, entry.latitude, entry.longitude)
+                    if max_distance_m is not None and distance > max_distance_m:
+                        continue
+                    item = (-distance, entry.id, entry)
+                    if len(best) < k:
+                        heapq.heappush(best, item)
+                    elif distance < -best[0][0]:
+                        heapq.heapreplace(best, item)
+            if len(best) >= k and -best[0][0] <= self._ring_reach_m(lat, radius):
+                break
+
+        return [(entry, -neg_distance) for neg_distance, _, entry in sorted(best, reverse=True)]
+
+    def _rings_for(self, lat: float, distance_m: float) -> int:
+        per_ring = self._ring_reach_m(lat, 1)
+        return math.ceil(distance_m / per_ring) + 1
+
+    def within_radius(
+        self,
+        lat: float,
+        lon: float,
+        radius_m: float,
+        category_ids: set[int] | None = None,
+        limit: int | None = None,
+    ) -> list[tuple[PointOfInterestEntry, float]]:
+        if self._size == 0:
+            return []
+
+        center = self._cell(lat, lon)
+        max_ring = min(self._max_ring(center), self._rings_for(lat, radius_m))
+        found: list[tuple[PointOfInterestEntry, float]] = []
+        for radius in range(max_ring + 1):
+            for bucket in self._ring(center, radius):
+                for entry in bucket:
+                    if category_ids and category_ids.isdisjoint(entry.category_ids):
+                        continue
+                    distance = haversine_m(lat, lon, entry.latitude, entry.longitude)
+                    if distance <= radius_m:
+                        found.append((entry, distance))
+        found.sort(key=lambda item: item[1])
+        return found[:limit] if limit is not None else found
+
+    def within_bbox(
+        self,
+        north: float,
+        south: float,
+        east: float,
+        west: float,
+        category_ids: set[int] | None = None,
+        limit: int | None = None,
+    ) -> list[PointOfInterestEntry]:
+        if self._size == 0:
+            return []
+
+        min_row, min_col = self._cell(south, west)
+        max_row, max_col = self._cell(north, east)
+        min_row, min_col = max(min_row, self._min_cell[0]), max(min_col, self._min_cell[1])
+        max_row, max_col = min(max_row, self._max_cell[0]), min(max_col, self._max_cell[1])
+
+        found: list[PointOfInterestEntry] = []
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                for entry in self._cells.get((row, col), ()):
+                    if not (south <= entry.latitude <= north and west <= entry.longitude <= east):
+                        continue
+                    if category_ids and category_ids.isdisjoint(entry.category_ids):
+                        continue
+                    found.append(entry)
+                    if limit is not None and len(found) >= limit:
+                        return found
+        return found
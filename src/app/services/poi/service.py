@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+import logging
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...core.config import settings
+from ...core.db.database import local_session
+from ...models.ingest import IngestCategory, IngestPointOfInterest
+from .index import PointOfInterestEntry, PointOfInterestIndex
+
+logger = logging.getLogger(__name__)
+
+
+class PointOfInterestService:
+    """Serves POI lookups from an in-process index that is rebuilt whenever the table changes.
+
+    The index is swapped atomically, so readers never see a half-built grid. Crawls run in another
+    process, so changes are detected by polling a cheap (count, last change) watermark.
+    """
+
+    def __init__(self, cell_degrees: float | None = None) -> None:
+        self.cell_degrees = cell_degrees or settings.POI_INDEX_CELL_DEGREES
+        self.index = PointOfInterestIndex(cell_degrees=self.cell_degrees)
+        self.categories: dict[int, str] = {}
+        self._watermark: tuple[int, datetime | None] | None = None
+        self._refresh_task: asyncio.Task | None = None
+
+    @staticmethod
+    async def _current_watermark(db: AsyncSession) -> tuple[int, datetime | None]:
+        stmt = select(
+            func.count(IngestPointOfInterest.id),
+            func.max(func.coalesce(IngestPointOfInterest.updated_at, IngestPointOfInterest.created_at)),
+        )
+        count, last_change = (await db.execute(stmt)).one()
+        return int(count or 0), last_change
+
+    async def load(self, db: AsyncSession) -> None:
+        watermark = await self._current_watermark(db)
+
+        categories = await db.execute(select(IngestCategory.id, IngestCategory.name))
+        rows = await db.execute(
+            select(
+                IngestPointOfInterest.id,
+                IngestPointOfInterest.foursquare_id,
+                IngestPointOfInterest.name,
+                IngestPointOfInterest.latitude,
+                IngestPointOfInterest.longitude,
+                IngestPointOfInterest.category_ids,
+                IngestPointOfInterest.address,
+                IngestPointOfInterest.rating,
+            )
+        )
+        index = PointOfInterestIndex(
+            (
+                PointOfInterestEntry(
+                    id=row.id,
+                    foursquare_id=row.foursquare_id,
+                    name=row.name,
+                    latitude=row.latitude,
+                    longitude=row.longitude,
+                    category_ids=frozenset(row.category_ids or ()),
+                    address=row.address,
+                    rating=row.rating,
+                )
+                for row in rows
+            ),
+            cell_degrees=self.cell_degrees,
+        )
+
+        self.categories = {id_: name for id_, name in categories.all()}
+        self.index = index
+        self._watermark = watermark
+        logger.info("poi.index.loaded", extra={"points": len(index), "categories": len(self.categories)})
+
+    async def refresh_if_changed(self, db: AsyncSession) -> bool:
+        if self._watermark is not None and await self._current_watermark(db) == self._watermark:
+            return False
+        await self.load(db)
+        return True
+
+    async def _refresh_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with local_session() as db:
+                    await self.refresh_if_changed(db)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("poi.index.refresh_failed", extra={"error": str(exc)})
+
+    async def start(self, interval: float | None = None) -> None:
+        try:
+            async with local_session() as db:
+                await self.load(db)
+        except Exception as exc:  # noqa: BLE001
+            # Serve empty results rather than fail startup; the refresh loop retries.
+            logger.warning("poi.index.load_failed", extra={"error": str(exc)})
+
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(
+                self._refresh_loop(interval or settings.POI_INDEX_REFRESH_SECONDS)
+            )
+
+    async def stop(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+    def category_names(self, entry: PointOfInterestEntry) -> list[str]:
+        return [self.categories[id_] for id_ in sorted(entry.category_ids) if id_ in self.categories]
+
+
+poi_service = PointOfInterestService()
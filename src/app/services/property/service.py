@@ -35,7 +35,7 @@ class PropertyService:
         limit: int = 10,
         filters: Dict[str, Any] | None = None,
         ranges: Dict[str, Dict[str, int]] | None = None,
-        sort: list[Dict[str, str]] | None = None,
+        sort: list[Dict[str, Any]] | None = None,
         has_photo: bool | None = None,
     ) -> Dict[str, Any]:
         es_query: Dict[str, Any] = {"bool": {"must": []}}
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+from typing import Any, Dict, List, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+SendFn = Callable[[str, bytes], Awaitable[httpx.Response]]
+
+
+class InferenceBatcher:
+    """Coalesces concurrent inference calls for the same path into one batch request.
+
+    Calls are collected for `window` seconds or until `max_size` are waiting, then sent as
+    `POST {path}/batch` with `{"items": [<body>, ...]}`. The server answers
+    `{"results": [{"status_code": 200, "body": {...}}, ...]}` in the same order; each caller gets its
+    own item, and a failed item raises `httpx.HTTPStatusError` for that caller only. Paths whose batch
+    endpoint is missing (404/405) are remembered and sent one by one from then on.
+    """
+
+    def __init__(self, send: SendFn, window: float, max_size: int) -> None:
+        self._send = send
+        self.window = window
+        self.max_size = max_size
+        self._pending: Dict[str, List[Tuple[bytes, asyncio.Future]]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._unbatchable: set[str] = set()
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, path: str, content: bytes) -> Dict[str, Any]:
+        if path in self._unbatchable:
+            return _decode(await self._send(path, content))
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        batch = self._pending.setdefault(path, [])
+        batch.append((content, future))
+        if len(batch) >= self.max_size:
+            self._dispatch(path)
+        elif path not in self._timers:
+            self._timers[path] = loop.call_later(self.window, self._dispatch, path)
+        return await future
+
+    def _dispatch(self, path: str) -> None:
+        timer = self._timers.pop(path, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(path, None)
+        if not batch:
+            return
+        task = asyncio.create_task(self._run(path, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, path: str, batch: List[Tuple[bytes, asyncio.Future]]) -> None:
+        try:
+            if len(batch) == 1:
+                content, future = batch[0]
+                _resolve(future, result=_decode(await self._send(path, content)))
+                return
+            await self._run_batch(path, batch)
+        except Exception as exc:  # noqa: BLE001 - every waiter gets the failure of the shared request
+            for _, future in batch:
+                _resolve(future, exc=exc)
+
+    async def _run_batch(self, path: str, batch: List[Tuple[bytes, asyncio.Future]]) -> None:
+        payload = b'{"items":[' + b",".join(content for content, _ in batch) + b"]}"
+        response = await self._send(f"{path}/batch", payload)
+        if response.status_code in (404, 405):
+            logger.info(f"Inference service has no batch endpoint for {path}; sending requests individually")
+            self._unbatchable.add(path)
+            await asyncio.gather(*(self._run(path, [item]) for item in batch))
+            return
+
+        results = _decode(response).get("results")
+        if not isinstance(results, list) or len(results) != len(batch):
+            raise ValueError(f"Inference batch for {path} returned a malformed result list")
+
+        for (_, future), item in zip(batch, results, strict=True):
+            status_code = item.get("status_code", 200)
+            if 200 <= status_code < 300:
+                _resolve(future, result=item.get("body") or {})
+                continue
+            item_response = httpx.Response(status_code, json=item.get("body"), request=response.request)
+            _resolve(
+                future,
+                exc=httpx.HTTPStatusError(
+                    f"Inference batch item failed with {status_code}", request=response.request, response=item_response
+                ),
+            )
+
+
+def _decode(response: httpx.Response) -> Dict[str, Any]:
+    response.raise_for_status()
+    return response.json()  # type: ignore[no-any-return]
+
+
+def _resolve(future: asyncio.Future, result: Any = None, exc: BaseException | None = None) -> None:
+    # A caller that timed out or was cancelled has already given up on its future.
+    if future.done():
+        return
+    if exc is not None:
+        future.set_exception(exc)
+    else:
+        future.set_result(result)
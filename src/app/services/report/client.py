@@ -1,14 +1,47 @@
+import json
 from typing import Any, Dict
 
 import httpx
 
+from ...core.config import settings
+from ...core.http_clients import http_clients
+from .batcher import InferenceBatcher
+
 class InferenceClient:
-    def __init__(self, base_url: str = "http://property-inference", timeout: int = 30):
+    def __init__(
+        self,
+        base_url: str = settings.INFERENCE_API_BASE_URL,
+        timeout: int = settings.INFERENCE_API_TIMEOUT,
+        batching: bool = settings.INFERENCE_BATCH_ENABLED,
+    ):
         self.base_url = base_url
         self.timeout = timeout
+        self.batcher = (
+            InferenceBatcher(
+                self._send,
+                window=settings.INFERENCE_BATCH_WINDOW_MS / 1000,
+                max_size=settings.INFERENCE_BATCH_MAX_SIZE,
+            )
+            if batching
+            else None
+        )
 
     async def post(self, path: str, json_body: Dict[str, Any]) -> Dict[str, Any]:
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(f"{self.base_url}{path}", json=json_body)
-            response.raise_for_status()
-            return response.json()
+        return await self.post_raw(path, json.dumps(json_body, separators=(",", ":")).encode())
+
+    async def post_raw(self, path: str, content: bytes) -> Dict[str, Any]:
+        """POST an already-encoded JSON body, through the micro-batcher when batching is enabled."""
+        if self.batcher is not None:
+            return await self.batcher.submit(path, content)
+        response = await self._send(path, content)
+        response.raise_for_status()
+        return response.json()
+
+    async def _send(self, path: str, content: bytes) -> httpx.Response:
+        client = http_clients.get("inference")
+        return await client.post(
+            f"{self.base_url}{path}",
+            content=content,
+            headers={"Content-Type": "application/json"},
+            timeout=self.timeout,
+        )
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import json
+from typing import Any, Dict, Mapping
+
+from ...core.config import settings
+from ...core.utils.ttl_cache import TTLCache
+from ...schemas.property import PropertyBase
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+@dataclass(frozen=True)
+class PropertyPayload:
+    """A listing serialized once for the inference service: the JSON dict and its encoded bytes.
+
+    `data` is shared between requests and must be treated as read-only.
+    """
+
+    data: Dict[str, Any]
+    raw: bytes
+
+    def body(self, **fields: Any) -> bytes:
+        """`{"property_data": <raw>, **fields}` encoded without re-serializing the property."""
+        extra = b"".join(b"," + _dumps(name) + b":" + _dumps(value) for name, value in fields.items())
+        return b'{"property_data":' + self.raw + extra + b"}"
+
+
+class PropertyPayloadCache:
+    """In-process LRU of serialized listings keyed by `(listing_key, updated_at)`.
+
+    Any write to a listing bumps `updated_at`, so a changed listing never hits a stale entry; the TTL
+    only bounds how long unused payloads are kept.
+    """
+
+    def __init__(self) -> None:
+        self._cache = TTLCache(
+            maxsize=settings.REPORT_PAYLOAD_CACHE_MAXSIZE, ttl=settings.REPORT_PAYLOAD_CACHE_TTL
+        )
+
+    def get(self, property_data: Mapping[str, Any]) -> PropertyPayload:
+        """Serialize a listing row as returned by `crud_property.get`."""
+        updated_at = property_data.get("updated_at")
+        key = (property_data["listing_key"], updated_at)
+        if updated_at is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+        data = PropertyBase.model_validate(property_data).model_dump(mode="json")
+        payload = PropertyPayload(data=data, raw=_dumps(data))
+        if updated_at is not None:
+            self._cache.set(key, payload)
+        return payload
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+property_payloads = PropertyPayloadCache()
@@ -1,7 +1,10 @@
-from typing import List
+import asyncio
+import logging
+from typing import Any, Dict, List, Mapping
 
-from ...models.property import Property
-from ...schemas.property import PropertyBase
+from ...core.config import settings
+from ...core.utils.response_cache import content_key, response_cache
+from ...core.utils.single_flight import SingleFlight
 from ...schemas.report import (
     AppliedChange,
     BaseMetrics,
@@ -10,6 +13,8 @@ from ...schemas.report import (
     Indicator,
     MathematicalFormula,
     NewMetrics,
+    ReportBundle,
+    ReportSection,
     Scenario,
     SimilarListings,
     SimilarListingsItem,
@@ -20,18 +25,85 @@ from ...schemas.report import (
     UpliftMetrics,
 )
 from .client import InferenceClient
+from .payload_cache import PropertyPayload, property_payloads
+
+logger = logging.getLogger(__name__)
 
 
 class ReportService:
     def __init__(self):
         self.client = InferenceClient()
+        self.flight = SingleFlight("report")
+
+    @staticmethod
+    def serialize_property(property_data: Mapping[str, Any]) -> PropertyPayload:
+        return property_payloads.get(property_data)
+
+    async def get_bundle(
+        self,
+        listing_key: str,
+        property_data: Mapping[str, Any],
+        sections: List[ReportSection],
+        indicator: Indicator = Indicator.SALES_PROBABILITY,
+    ) -> ReportBundle:
+        """Build several report sections from one serialized property, running the inference calls concurrently.
+
+        Each section gets `REPORT_BUNDLE_SECTION_TIMEOUT` seconds; a section that fails or times out is
+        reported in `errors` and the rest are still returned.
+        """
+        payload = self.serialize_property(property_data)
+        loaders = {
+            ReportSection.SIMILAR_LISTINGS: lambda: self.get_similar_listings(listing_key, property_data, payload),
+            ReportSection.SPECTRUM: lambda: self.get_spectrum(listing_key, indicator, property_data, payload),
+            ReportSection.UPGRADE_IMPACT: lambda: self.get_upgrade_impact(listing_key, property_data, payload),
+        }
+        timeout = settings.REPORT_BUNDLE_SECTION_TIMEOUT
+        results = await asyncio.gather(
+            *(asyncio.wait_for(loaders[section](), timeout) for section in sections),
+            return_exceptions=True,
+        )
 
-    async def get_similar_listings(self, listing_key: str, property_data: Property) -> SimilarListings:
-        # Convert property model to dict for inference service
-        prop_dict = PropertyBase.model_validate(property_data).model_dump(mode="json")
+        bundle = ReportBundle(listing_key=listing_key)
+        for section, result in zip(sections, results, strict=True):
+            if isinstance(result, asyncio.TimeoutError):
+                bundle.errors[section.value] = f"timed out after {timeout}s"
+            elif isinstance(result, Exception):
+                logger.warning(f"Report section {section.value} failed for {listing_key}: {result!r}")
+                bundle.errors[section.value] = "section unavailable"
+            else:
+                setattr(bundle, section.value, result)
+        return bundle
+
+    async def _post_cached(
+        self, namespace: str, path: str, payload: PropertyPayload, **params: Any
+    ) -> Dict[str, Any]:
+        # The inference output depends only on the listing's stored data, so its key and
+        # modification stamp stand in for the full property payload.
+        material = {
+            "path": path,
+            "listing_key": payload.data.get("listing_key"),
+            "updated_at": payload.data.get("updated_at"),
+            **params,
+        }
+        return await self.flight.do(
+            content_key(namespace, material),
+            lambda: response_cache.get_or_compute(
+                namespace, material, lambda: self.client.post_raw(path, payload.body(**params))
+            ),
+            distributed=True,
+        )
 
-        inference_resp = await self.client.post(
-            "/api/v1/inference/similar", {"property_data": prop_dict, "limit": 10}
+    async def get_similar_listings(
+        self, listing_key: str, property_data: Mapping[str, Any], payload: PropertyPayload | None = None
+    ) -> SimilarListings:
+        payload = payload or self.serialize_property(property_data)
+        prop_dict = payload.data
+
+        inference_resp = await self._post_cached(
+            "similar-listings",
+            "/api/v1/inference/similar",
+            payload,
+            limit=10,
         )
         similar_items_data = inference_resp.get("similar_properties", [])
 
@@ -39,8 +111,8 @@ class ReportService:
         for idx, item in enumerate(similar_items_data):
             comparisons: List[Comparison] = []
             # Example comparison logic (simplified)
-            if item.get("list_price") and property_data.list_price:
-                diff = item["list_price"] - property_data.list_price
+            if item.get("list_price") and prop_dict.get("list_price"):
+                diff = item["list_price"] - prop_dict["list_price"]
                 if diff != 0:
                     status = Status.MORE if diff > 0 else Status.LESS
                     comparisons.append(
@@ -72,12 +144,18 @@ class ReportService:
         )
 
     async def get_spectrum(
-        self, listing_key: str, indicator: Indicator, property_data: Property
+        self,
+        listing_key: str,
+        indicator: Indicator,
+        property_data: Mapping[str, Any],
+        payload: PropertyPayload | None = None,
     ) -> Spectrum:
-        prop_dict = PropertyBase.model_validate(property_data).model_dump(mode="json")
+        payload = payload or self.serialize_property(property_data)
 
-        analysis = await self.client.post(
-            "/api/v1/inference/price-probability-analysis", {"property_data": prop_dict}
+        analysis = await self._post_cached(
+            "spectrum",
+            "/api/v1/inference/price-probability-analysis",
+            payload,
         )
 
         points = []
@@ -116,11 +194,15 @@ class ReportService:
             probability_range=analysis.get("achievable_probability_range"),
         )
 
-    async def get_upgrade_impact(self, listing_key: str, property_data: Property) -> UpgradeImpact:
-        prop_dict = PropertyBase.model_validate(property_data).model_dump(mode="json")
+    async def get_upgrade_impact(
+        self, listing_key: str, property_data: Mapping[str, Any], payload: PropertyPayload | None = None
+    ) -> UpgradeImpact:
+        payload = payload or self.serialize_property(property_data)
 
-        resp = await self.client.post(
-            "/api/v1/inference/upgrade-impact", {"property_data": prop_dict}
+        resp = await self._post_cached(
+            "upgrade-impact",
+            "/api/v1/inference/upgrade-impact",
+            payload,
         )
 
         base = resp.get("base", {})
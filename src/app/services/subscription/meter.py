@@ -0,0 +1,371 @@
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from dataclasses import dataclass
+from datetime import UTC, datetime
+import json
+import logging
+import os
+import socket
+from typing import Any
+import uuid
+
+from redis.exceptions import RedisError
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
+
+from ...core.config import settings
+from ...core.db.database import local_session
+from ...core.utils import cache
+from ...models.subscription import UserSubscription, UserSubscriptionUsage
+from .summary_cache import SubscriptionSummaryCache
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = "usage:pending"
+# Each flusher moves the batch it is writing into its own processing list and holds a lease while it
+# runs; batches left behind by a flusher whose lease expired are pushed back onto the pending queue.
+PROCESSING_KEY_PREFIX = "usage:pending:processing:"
+LEASE_KEY_PREFIX = "usage:pending:lease:"
+CONSUMERS_KEY = "usage:pending:consumers"
+LEASE_SECONDS = 60
+
+RECORDED = 1
+DUPLICATE = 0
+NOT_LOADED = -1
+NO_SUBSCRIPTION = -2
+LIMIT_REACHED = -3
+
+# KEYS: state hash, pending list, summary hash. ARGV: property id, pending row (JSON).
+# The state hash holds the active subscription id (empty for "none"), its hard limit, current usage
+# and end time; the subscription's metered properties live in "<state>:props:<sub_id>". A cached
+# subscription summary for the same subscription is kept in step with the counter.
+RECORD_USAGE_SCRIPT = """
+local sub_id = redis.call('HGET', KEYS[1], 'sub_id')
+if not sub_id then
+    return {-1, 0}
+end
+if sub_id == '' then
+    return {-2, 0}
+end
+
+local ended_at = tonumber(redis.call('HGET', KEYS[1], 'ended_at') or '0')
+if ended_at > 0 and ended_at <= tonumber(redis.call('TIME')[1]) then
+    -- Drop the ended subscription's state so the caller's re-prime can load the next active one.
+    redis.call('DEL', KEYS[1], KEYS[1] .. ':props:' .. sub_id)
+    if redis.call('HGET', KEYS[3], 'sub_id') == sub_id then
+        redis.call('DEL', KEYS[3])
+    end
+    return {-1, 0}
+end
+
+local used = tonumber(redis.call('HGET', KEYS[1], 'used') or '0')
+local props = KEYS[1] .. ':props:' .. sub_id
+if redis.call('SISMEMBER', props, ARGV[1]) == 1 then
+    return {0, used}
+end
+
+local hard_limit = tonumber(redis.call('HGET', KEYS[1], 'hard_limit') or '0')
+if hard_limit > 0 and used >= hard_limit then
+    return {-3, used}
+end
+
+redis.call('SADD', props, ARGV[1])
+redis.call('EXPIRE', props, redis.call('TTL', KEYS[1]))
+used = redis.call('HINCRBY', KEYS[1], 'used', 1)
+local row = string.gsub(ARGV[2], '"sub_id":0', '"sub_id":' .. sub_id, 1)
+redis.call('RPUSH', KEYS[2], row)
+if redis.call('HGET', KEYS[3], 'sub_id') == sub_id then
+    redis.call('HINCRBY', KEYS[3], 'used', 1)
+end
+return {1, used}
+"""
+
+
+# KEYS: state hash. ARGV: sub id, hard limit, used, ended_at epoch (0 = never re-check), ttl, *property ids.
+PRIME_STATE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return 0
+end
+local ttl = tonumber(ARGV[5])
+if ARGV[1] ~= '' then
+    local props = KEYS[1] .. ':props:' .. ARGV[1]
+    redis.call('DEL', props)
+    for i = 6, #ARGV do
+        redis.call('SADD', props, ARGV[i])
+    end
+    redis.call('EXPIRE', props, ttl)
+end
+redis.call('HSET', KEYS[1], 'sub_id', ARGV[1], 'hard_limit', ARGV[2], 'used', ARGV[3], 'ended_at', ARGV[4])
+redis.call('EXPIRE', KEYS[1], ttl)
+return 1
+"""
+
+
+# KEYS: source list, destination list. ARGV: max items. Moves items head-to-tail, returns them.
+CLAIM_BATCH_SCRIPT = """
+local items = {}
+for i = 1, tonumber(ARGV[1]) do
+    local item = redis.call('LMOVE', KEYS[1], KEYS[2], 'LEFT', 'RIGHT')
+    if not item then
+        break
+    end
+    items[i] = item
+end
+return items
+"""
+
+# KEYS: processing list, pending list. Puts a processing list back at the head of the queue, in order.
+REQUEUE_BATCH_SCRIPT = """
+local moved = 0
+while redis.call('LMOVE', KEYS[1], KEYS[2], 'RIGHT', 'LEFT') do
+    moved = moved + 1
+end
+return moved
+"""
+
+
+@dataclass(frozen=True)
+class MeterState:
+    subscription_id: int | None
+    hard_limit: int = 0
+    used: int = 0
+    ended_at: datetime | None = None
+
+
+class UsageMeter:
+    """Meters listing usage in Redis and writes usage rows to Postgres behind the request.
+
+    A usage check is one Lua call that deduplicates per subscription, enforces the hard limit and
+    queues the row. A background task drains the queue in batches; `UserSubscription.monthly_listing_usage`
+    is advanced by the number of rows that were actually inserted.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = settings.USAGE_METER_ENABLED
+        self.state_ttl = settings.USAGE_METER_STATE_TTL
+        self.batch_size = settings.USAGE_METER_FLUSH_BATCH_SIZE
+        self.flush_interval = settings.USAGE_METER_FLUSH_INTERVAL_SECONDS
+        self._script = None
+        self._script_client = None
+        self._prime_script = None
+        self._prime_client = None
+        self._claim_script = None
+        self._requeue_script = None
+        self._queue_client = None
+        self.consumer_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._flusher: asyncio.Task | None = None
+
+    @property
+    def available(self) -> bool:
+        return self.enabled and cache.client is not None
+
+    @staticmethod
+    def state_key(user_id: int) -> str:
+        return f"usage:{user_id}:state"
+
+    def _get_script(self):
+        if self._script is None or self._script_client is not cache.client:
+            self._script = cache.client.register_script(RECORD_USAGE_SCRIPT)
+            self._script_client = cache.client
+        return self._script
+
+    async def record(self, user_id: int, property_id: str) -> tuple[int, int]:
+        """Return (status, used) where status is one of the module-level result codes."""
+        row = json.dumps(
+            {
+                "sub_id": 0,
+                "user_id": user_id,
+                "property_id": property_id,
+                "created_at": datetime.now(UTC).isoformat(),
+            },
+            separators=(",", ":"),
+        )
+        status, used = await self._get_script()(keys=[self.state_key(user_id), PENDING_KEY, SubscriptionSummaryCache.key(user_id)], args=[property_id, row])
+        return int(status), int(used)
+
+    async def prime(self, user_id: int, state: MeterState, property_ids: list[str]) -> None:
+        """Seed the meter from Postgres. A no-op when another request already primed it."""
+        if self._prime_script is None or self._prime_client is not cache.client:
+            self._prime_script = cache.client.register_script(PRIME_STATE_SCRIPT)
+            self._prime_client = cache.client
+        ended_at = 0
+        if state.ended_at and state.ended_at > datetime.now(UTC):
+            ended_at = int(state.ended_at.timestamp())
+        sub_id = "" if state.subscription_id is None else str(state.subscription_id)
+        await self._prime_script(
+            keys=[self.state_key(user_id)],
+            args=[sub_id, state.hard_limit, state.used, ended_at, self.state_ttl, *property_ids],
+        )
+
+    async def metered_usage(self, user_id: int, subscription_id: int) -> int | None:
+        """Usage counted by the meter for this subscription, including rows not yet flushed."""
+        if not self.available:
+            return None
+        try:
+            sub_id, used = await cache.client.hmget(self.state_key(user_id), ["sub_id", "used"])
+        except RedisError as exc:
+            logger.warning(f"Usage meter read failed for user {user_id}: {exc}")
+            return None
+        if sub_id is None or sub_id.decode() != str(subscription_id):
+            return None
+        return int(used or 0)
+
+    async def invalidate(self, user_id: int) -> None:
+        if not self.available:
+            return
+        try:
+            await cache.client.delete(self.state_key(user_id))
+        except RedisError as exc:
+            logger.warning(f"Usage meter invalidation failed for user {user_id}: {exc}")
+
+    async def invalidate_all(self) -> int:
+        """Drop every user's meter state so the next usage check re-primes it from Postgres."""
+        if not self.available:
+            return 0
+        cleared = 0
+        try:
+            batch: list[bytes] = []
+            async for key in cache.client.scan_iter(match="usage:*:state*", count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    cleared += await cache.client.delete(*batch)
+                    batch.clear()
+            if batch:
+                cleared += await cache.client.delete(*batch)
+        except RedisError as exc:
+            logger.warning(f"Usage meter flush failed: {exc}")
+        return cleared
+
+    @property
+    def processing_key(self) -> str:
+        return f"{PROCESSING_KEY_PREFIX}{self.consumer_id}"
+
+    def _queue_scripts(self):
+        if self._queue_client is not cache.client:
+            self._claim_script = cache.client.register_script(CLAIM_BATCH_SCRIPT)
+            self._requeue_script = cache.client.register_script(REQUEUE_BATCH_SCRIPT)
+            self._queue_client = cache.client
+        return self._claim_script, self._requeue_script
+
+    async def _renew_lease(self) -> None:
+        async with cache.client.pipeline(transaction=False) as pipe:
+            pipe.sadd(CONSUMERS_KEY, self.consumer_id)
+            pipe.set(f"{LEASE_KEY_PREFIX}{self.consumer_id}", 1, ex=LEASE_SECONDS)
+            await pipe.execute()
+
+    async def recover_orphaned(self) -> int:
+        """Requeue batches held by flushers whose lease expired (a crash between claim and commit).
+
+        A batch that did commit before the crash is harmless to replay: inserts skip existing rows and
+        the counter only advances by rows actually inserted.
+        """
+        _, requeue = self._queue_scripts()
+        recovered = 0
+        for raw_consumer in await cache.client.smembers(CONSUMERS_KEY):
+            consumer = raw_consumer.decode() if isinstance(raw_consumer, bytes) else raw_consumer
+            if consumer == self.consumer_id or await cache.client.exists(f"{LEASE_KEY_PREFIX}{consumer}"):
+                continue
+            moved = int(await requeue(keys=[f"{PROCESSING_KEY_PREFIX}{consumer}", PENDING_KEY]))
+            if moved:
+                logger.warning(f"Requeued {moved} usage rows left by stopped flusher {consumer}")
+            recovered += moved
+            await cache.client.srem(CONSUMERS_KEY, consumer)
+        return recovered
+
+    async def flush(self) -> int:
+        """Drain queued usage rows into Postgres. Returns the number of rows inserted.
+
+        Each batch is moved into this flusher's processing list and only dropped from Redis after the
+        Postgres commit, so a crash mid-batch leaves it for `recover_orphaned`.
+        """
+        claim, requeue = self._queue_scripts()
+        await self._renew_lease()
+        # Anything still in our own list is from an earlier failed attempt; retry it first.
+        await requeue(keys=[self.processing_key, PENDING_KEY])
+        await self.recover_orphaned()
+
+        inserted_total = 0
+        while True:
+            await self._renew_lease()
+            raw_rows = await claim(keys=[PENDING_KEY, self.processing_key], args=[self.batch_size])
+            if not raw_rows:
+                return inserted_total
+            try:
+                inserted_total += await self._write_rows([json.loads(raw) for raw in raw_rows])
+            except Exception:
+                # Put the batch back at the head so it is retried before newer rows.
+                await requeue(keys=[self.processing_key, PENDING_KEY])
+                raise
+            await cache.client.delete(self.processing_key)
+            if len(raw_rows) < self.batch_size:
+                return inserted_total
+
+    async def release(self) -> None:
+        """Give up this flusher's lease after a clean shutdown."""
+        async with cache.client.pipeline(transaction=False) as pipe:
+            pipe.srem(CONSUMERS_KEY, self.consumer_id)
+            pipe.delete(f"{LEASE_KEY_PREFIX}{self.consumer_id}")
+            await pipe.execute()
+
+    @staticmethod
+    async def _write_rows(rows: list[dict[str, Any]]) -> int:
+        values = [
+            {
+                "user_subscription_id": row["sub_id"],
+                "user_id": row["user_id"],
+                "property_id": row["property_id"],
+                "created_at": datetime.fromisoformat(row["created_at"]),
+            }
+            for row in rows
+        ]
+        async with local_session() as db:
+            stmt = (
+                insert(UserSubscriptionUsage)
+                .values(values)
+                .on_conflict_do_nothing(constraint="uq_subscription_usage_user_property")
+                .returning(UserSubscriptionUsage.user_subscription_id)
+            )
+            result = await db.execute(stmt)
+            per_subscription = Counter(result.scalars().all())
+            for subscription_id, count in per_subscription.items():
+                await db.execute(
+                    update(UserSubscription)
+                    .where(UserSubscription.id == subscription_id)
+                    .values(monthly_listing_usage=UserSubscription.monthly_listing_usage + count)
+                )
+            await db.commit()
+        return sum(per_subscription.values())
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                logger.warning(f"Usage meter flush failed: {exc}")
+
+    def start_flusher(self) -> None:
+        if self.enabled and self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def stop_flusher(self) -> None:
+        if self._flusher is None:
+            return
+        self._flusher.cancel()
+        try:
+            await self._flusher
+        except asyncio.CancelledError:
+            pass
+        self._flusher = None
+        try:
+            await self.flush()
+            await self.release()
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(f"Final usage meter flush failed; rows stay queued in Redis: {exc}")
+
+
+usage_meter = UsageMeter()
@@ -1,6 +1,10 @@
+import base64
+import binascii
 from datetime import UTC, datetime
+import logging
 
-from sqlalchemy import select, func, or_
+from redis.exceptions import RedisError
+from sqlalchemy import select, func, or_, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...core.utils.s3 import generate_presigned_url
@@ -12,6 +16,31 @@ from ...models.subscription import (
 )
 from ...schemas.auth import SubscriptionSummary
 from ...schemas.subscription import Plan, PlanPayment, UsageItem, UsageReportResponse
+from .meter import (
+    DUPLICATE,
+    LIMIT_REACHED,
+    NO_SUBSCRIPTION,
+    NOT_LOADED,
+    MeterState,
+    usage_meter,
+)
+from .summary_cache import SummaryInputs, subscription_summary_cache
+
+logger = logging.getLogger(__name__)
+
+
+def encode_usage_cursor(created_at: datetime, usage_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{usage_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_usage_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, usage_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(usage_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("invalid cursor") from exc
 
 
 class SubscriptionService:
@@ -29,20 +58,60 @@ class SubscriptionService:
         if user_id <= 0:
             return self._default_summary()
 
-        sub_with_plan = await self._get_active_subscription(user_id)
-        if not sub_with_plan:
-            return self._default_summary()
+        inputs = await subscription_summary_cache.get(user_id)
+        if inputs is None:
+            inputs = await self._load_summary_inputs(user_id)
+            await subscription_summary_cache.set(user_id, inputs)
 
-        subscription, plan = sub_with_plan
-        if not plan:
+        if inputs.subscription_id is None:
             return self._default_summary()
-
-        return self._build_summary(subscription, plan)
+        return self._build_summary(inputs)
 
     async def add_usage(self, user_id: int, property_id: str) -> bool:
         if user_id <= 0 or not property_id:
             return False
 
+        if usage_meter.available:
+            try:
+                return await self._add_usage_metered(user_id, property_id)
+            except RedisError as exc:
+                logger.warning(f"Usage meter unavailable, recording usage in Postgres: {exc}")
+
+        return await self._add_usage_direct(user_id, property_id)
+
+    async def _add_usage_metered(self, user_id: int, property_id: str) -> bool:
+        status, _ = await usage_meter.record(user_id, property_id)
+        if status == NOT_LOADED:
+            await usage_meter.prime(user_id, *await self.load_meter_state(user_id))
+            status, _ = await usage_meter.record(user_id, property_id)
+
+        if status in (NO_SUBSCRIPTION, NOT_LOADED):
+            raise ValueError("no active subscription")
+        if status == LIMIT_REACHED:
+            raise ValueError("usage limit reached")
+        return status != DUPLICATE
+
+    async def load_meter_state(self, user_id: int) -> tuple[MeterState, list[str]]:
+        sub_with_plan = await self._get_active_subscription(user_id)
+        if not sub_with_plan or not sub_with_plan[1]:
+            return MeterState(subscription_id=None), []
+
+        subscription, plan = sub_with_plan
+        result = await self.db.execute(
+            select(UserSubscriptionUsage.property_id).where(
+                UserSubscriptionUsage.user_subscription_id == subscription.id,
+                UserSubscriptionUsage.user_id == user_id,
+            )
+        )
+        state = MeterState(
+            subscription_id=subscription.id,
+            hard_limit=plan.hard_usage_limit or 0,
+            used=subscription.monthly_listing_usage or 0,
+            ended_at=subscription.ended_at,
+        )
+        return state, list(result.scalars().all())
+
+    async def _add_usage_direct(self, user_id: int, property_id: str) -> bool:
         sub_with_plan = await self._get_active_subscription(user_id)
         if not sub_with_plan:
             raise ValueError("no active subscription")
@@ -74,34 +143,67 @@ class SubscriptionService:
         self.db.add(usage)
         subscription.monthly_listing_usage = used + 1
         await self.db.commit()
+        await subscription_summary_cache.invalidate(user_id)
         return True
 
     async def get_usage_report(
-        self, user_id: int, page: int = 1, limit: int = 20
+        self,
+        user_id: int,
+        page: int = 1,
+        limit: int = 20,
+        cursor: str | None = None,
+        include_total: bool | None = None,
     ) -> UsageReportResponse:
-        offset = (page - 1) * limit
+        """Page through a user's usage, newest first.
 
-        count_stmt = (
-            select(func.count())
-            .select_from(UserSubscriptionUsage)
+        With a cursor (the `next_cursor` of the previous page) the page is found by keyset on
+        `(created_at, id)`, so deep pages cost the same as the first. Otherwise `page` is used as an
+        offset. The total is counted on offset pages by default and skipped on cursor pages.
+        """
+        if include_total is None:
+            include_total = cursor is None
+
+        total = None
+        if include_total:
+            count_stmt = (
+                select(func.count())
+                .select_from(UserSubscriptionUsage)
+                .where(UserSubscriptionUsage.user_id == user_id)
+            )
+            total = (await self.db.execute(count_stmt)).scalar() or 0
+
+        usage_page = (
+            select(
+                UserSubscriptionUsage.id,
+                UserSubscriptionUsage.property_id,
+                UserSubscriptionUsage.created_at,
+            )
             .where(UserSubscriptionUsage.user_id == user_id)
+            .order_by(UserSubscriptionUsage.created_at.desc(), UserSubscriptionUsage.id.desc())
+            .limit(limit)
         )
-        total = (await self.db.execute(count_stmt)).scalar() or 0
+        if cursor:
+            after_created_at, after_id = decode_usage_cursor(cursor)
+            usage_page = usage_page.where(
+                tuple_(UserSubscriptionUsage.created_at, UserSubscriptionUsage.id) < (after_created_at, after_id)
+            )
+        else:
+            usage_page = usage_page.offset((page - 1) * limit)
+        usage_page = usage_page.subquery()
 
+        # Join only the rows on this page, and only the property columns the report shows.
         stmt = (
             select(
-                UserSubscriptionUsage.property_id,
-                UserSubscriptionUsage.created_at,
+                usage_page.c.id,
+                usage_page.c.property_id,
+                usage_page.c.created_at,
                 Property.unparsed_address,
                 Property.city,
                 Property.state_or_province,
                 Property.primary_photo,
             )
-            .outerjoin(Property, UserSubscriptionUsage.property_id == Property.listing_key)
-            .where(UserSubscriptionUsage.user_id == user_id)
-            .order_by(UserSubscriptionUsage.created_at.desc())
-            .offset(offset)
-            .limit(limit)
+            .outerjoin(Property, usage_page.c.property_id == Property.listing_key)
+            .order_by(usage_page.c.created_at.desc(), usage_page.c.id.desc())
         )
         rows = (await self.db.execute(stmt)).all()
 
@@ -117,7 +219,32 @@ class SubscriptionService:
                 created_at=row.created_at,
             ))
 
-        return UsageReportResponse(total=total, page=page, limit=limit, items=items)
+        next_cursor = None
+        if len(rows) == limit:
+            next_cursor = encode_usage_cursor(rows[-1].created_at, rows[-1].id)
+
+        return UsageReportResponse(total=total, page=page, limit=limit, items=items, next_cursor=next_cursor)
+
+    async def _load_summary_inputs(self, user_id: int) -> SummaryInputs:
+        sub_with_plan = await self._get_active_subscription(user_id)
+        if not sub_with_plan or not sub_with_plan[1]:
+            return SummaryInputs(subscription_id=None)
+
+        subscription, plan = sub_with_plan
+        used = subscription.monthly_listing_usage or 0
+        metered = await usage_meter.metered_usage(user_id, subscription.id)
+        if metered is not None:
+            used = max(used, metered)
+
+        return SummaryInputs(
+            subscription_id=subscription.id,
+            tier=plan.tier,
+            used=used,
+            soft_limit=plan.soft_usage_limit or 0,
+            hard_limit=plan.hard_usage_limit or 0,
+            ended_at=subscription.ended_at,
+            canceled_at=subscription.canceled_at,
+        )
 
     async def _get_active_subscription(
         self, user_id: int
@@ -166,12 +293,10 @@ class SubscriptionService:
             ),
         )
 
-    def _build_summary(
-        self, subscription: UserSubscription, plan: SubscriptionPlan
-    ) -> SubscriptionSummary:
-        used = subscription.monthly_listing_usage or 0
-        soft_limit = plan.soft_usage_limit or 0
-        hard_limit = plan.hard_usage_limit or 0
+    def _build_summary(self, inputs: SummaryInputs) -> SubscriptionSummary:
+        used = inputs.used
+        soft_limit = inputs.soft_limit
+        hard_limit = inputs.hard_limit
         soft_reached = soft_limit > 0 and used >= soft_limit
         hard_reached = hard_limit > 0 and used >= hard_limit
 
@@ -183,7 +308,7 @@ class SubscriptionService:
             limit_status = "normal"
 
         now = datetime.now(UTC)
-        ended_at = subscription.ended_at
+        ended_at = inputs.ended_at
         remaining_days = 0
         if ended_at and ended_at > now:
             remaining_days = (ended_at - now).days
@@ -192,7 +317,7 @@ class SubscriptionService:
         if ended_at:
             if ended_at <= now:
                 renewal_status = "expired"
-            elif subscription.canceled_at:
+            elif inputs.canceled_at:
                 renewal_status = "not_renewing"
             else:
                 renewal_status = "renewing"
@@ -202,7 +327,7 @@ class SubscriptionService:
             remaining = max(hard_limit - used, 0)
 
         return SubscriptionSummary(
-            tier=plan.tier,
+            tier=inputs.tier,
             used=used,
             remaining=remaining,
             remaining_days=remaining_days,
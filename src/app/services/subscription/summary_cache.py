@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import UTC, datetime
+import logging
+
+from redis.exceptions import RedisError
+
+from ...core.config import settings
+from ...core.utils import cache
+
+logger = logging.getLogger(__name__)
+
+KEY_PATTERN = "usage:*:summary"
+
+
+def _to_epoch(value: datetime | None) -> str:
+    return "" if value is None else str(int(value.timestamp()))
+
+
+def _from_epoch(value: str) -> datetime | None:
+    return datetime.fromtimestamp(int(value), UTC) if value else None
+
+
+@dataclass(frozen=True)
+class SummaryInputs:
+    """The stored facts a `SubscriptionSummary` is derived from. `subscription_id` is None without a plan."""
+
+    subscription_id: int | None
+    tier: str = ""
+    used: int = 0
+    soft_limit: int = 0
+    hard_limit: int = 0
+    ended_at: datetime | None = None
+    canceled_at: datetime | None = None
+
+    def to_hash(self) -> dict[str, str | int]:
+        return {
+            "sub_id": "" if self.subscription_id is None else str(self.subscription_id),
+            "tier": self.tier,
+            "used": self.used,
+            "soft_limit": self.soft_limit,
+            "hard_limit": self.hard_limit,
+            "ended_at": _to_epoch(self.ended_at),
+            "canceled_at": _to_epoch(self.canceled_at),
+        }
+
+    @classmethod
+    def from_hash(cls, data: dict[bytes, bytes]) -> SummaryInputs:
+        fields = {key.decode(): value.decode() for key, value in data.items()}
+        if not fields.get("sub_id"):
+            return cls(subscription_id=None)
+        return cls(
+            subscription_id=int(fields["sub_id"]),
+            tier=fields.get("tier", ""),
+            used=int(fields.get("used") or 0),
+            soft_limit=int(fields.get("soft_limit") or 0),
+            hard_limit=int(fields.get("hard_limit") or 0),
+            ended_at=_from_epoch(fields.get("ended_at", "")),
+            canceled_at=_from_epoch(fields.get("canceled_at", "")),
+        )
+
+
+class SubscriptionSummaryCache:
+    """Short-lived Redis hash of each user's summary inputs.
+
+    The usage meter bumps `used` in the same Lua call that records usage, so metered usage never has
+    to wait for the TTL. Payment syncs and admin edits drop entries instead.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = settings.SUBSCRIPTION_SUMMARY_CACHE_ENABLED
+        self.ttl = settings.SUBSCRIPTION_SUMMARY_CACHE_TTL
+
+    @property
+    def available(self) -> bool:
+        return self.enabled and cache.client is not None
+
+    @staticmethod
+    def key(user_id: int) -> str:
+        return f"usage:{user_id}:summary"
+
+    async def get(self, user_id: int) -> SummaryInputs | None:
+        if not self.available:
+            return None
+        try:
+            data = await cache.client.hgetall(self.key(user_id))
+        except RedisError as exc:
+            logger.warning(f"Subscription summary cache read failed: {exc}")
+            return None
+        return SummaryInputs.from_hash(data) if data else None
+
+    async def set(self, user_id: int, inputs: SummaryInputs) -> None:
+        if not self.available:
+            return
+        try:
+            async with cache.client.pipeline(transaction=True) as pipe:
+                pipe.delete(self.key(user_id))
+                pipe.hset(self.key(user_id), mapping=inputs.to_hash())
+                pipe.expire(self.key(user_id), self.ttl)
+                await pipe.execute()
+        except RedisError as exc:
+            logger.warning(f"Subscription summary cache write failed: {exc}")
+
+    async def invalidate(self, *user_ids: int) -> None:
+        if not user_ids or not self.available:
+            return
+        try:
+            await cache.client.delete(*(self.key(user_id) for user_id in user_ids))
+        except RedisError as exc:
+            logger.warning(f"Subscription summary cache invalidation failed: {exc}")
+
+    async def invalidate_all(self) -> None:
+        if not self.available:
+            return
+        try:
+            batch: list[bytes] = []
+            async for key in cache.client.scan_iter(match=KEY_PATTERN, count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    await cache.client.delete(*batch)
+                    batch.clear()
+            if batch:
+                await cache.client.delete(*batch)
+        except RedisError as exc:
+            logger.warning(f"Subscription summary cache flush failed: {exc}")
+
+
+subscription_summary_cache = SubscriptionSummaryCache()
@@ -1,7 +1,6 @@
 
-import httpx
-
 from ...core.config import settings
+from ...core.http_clients import http_clients
 from ...schemas.auth import GoogleUserInfo
 
 
@@ -14,24 +13,24 @@ class GoogleProvider:
         self.userinfo_endpoint = "https://www.googleapis.com/oauth2/v2/userinfo"
 
     async def get_user_data(self, code: str) -> GoogleUserInfo:
-        async with httpx.AsyncClient() as client:
-            # Exchange code for token
-            token_data = {
-                "code": code,
-                "client_id": self.client_id,
-                "client_secret": self.client_secret,
-                "redirect_uri": self.redirect_url,
-                "grant_type": "authorization_code",
-            }
-            token_response = await client.post(self.token_endpoint, data=token_data)
-            token_response.raise_for_status()
-            access_token = token_response.json()["access_token"]
+        client = http_clients.get("google")
+        # Exchange code for token
+        token_data = {
+            "code": code,
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+            "redirect_uri": self.redirect_url,
+            "grant_type": "authorization_code",
+        }
+        token_response = await client.post(self.token_endpoint, data=token_data)
+        token_response.raise_for_status()
+        access_token = token_response.json()["access_token"]
 
-            # Get user info
-            user_response = await client.get(
-                self.userinfo_endpoint, headers={"Authorization": f"Bearer {access_token}"}
-            )
-            user_response.raise_for_status()
-            user_data = user_response.json()
+        # Get user info
+        user_response = await client.get(
+            self.userinfo_endpoint, headers={"Authorization": f"Bearer {access_token}"}
+        )
+        user_response.raise_for_status()
+        user_data = user_response.json()
 
-            return GoogleUserInfo(**user_data)
+        return GoogleUserInfo(**user_data)
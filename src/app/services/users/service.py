@@ -9,7 +9,8 @@ from redis.asyncio import Redis
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ...core.security import get_password_hash, verify_password
+from ...core.security import hash_password, verify_password
+from ...core.utils.principal_cache import principal_cache
 from ...crud.crud_users import crud_users
 from ...schemas.auth import (
     EmailRegisterRequest,
@@ -214,9 +215,11 @@ class UserService:
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
             
-        hashed_password = get_password_hash(req.password)
+        hashed_password = await hash_password(req.password)
         user_update = UserUpdate(password_hash=hashed_password)
-        return await crud_users.update(db=self.db, id=user.id, object=user_update, return_as_model=True, schema_to_select=UserRead)
+        updated = await crud_users.update(db=self.db, id=user.id, object=user_update, return_as_model=True, schema_to_select=UserRead)
+        await principal_cache.invalidate(user.email)
+        return updated
 
     async def update_profile(self, user_id: int, req: UserUpdate, previous_password: str | None = None):
         # Handle password update specifically if included
@@ -259,9 +262,11 @@ class UserService:
                     detail="Invalid previous password"
                 )
                 
-            update_data["password_hash"] = get_password_hash(new_password_raw)
+            update_data["password_hash"] = await hash_password(new_password_raw)
             
-        return await crud_users.update(db=self.db, id=user.id, object=UserUpdate(**update_data), return_as_model=True, schema_to_select=UserRead)
+        updated = await crud_users.update(db=self.db, id=user.id, object=UserUpdate(**update_data), return_as_model=True, schema_to_select=UserRead)
+        await principal_cache.invalidate(user.email)
+        return updated
 
     async def get_google_client_id(self) -> ProviderClientID:
         state = str(uuid.uuid4())
@@ -0,0 +1,70 @@
+"""add indexes for hot query paths
+
+Revision ID: 8e4f2a6c1d37
+Revises: 40193dc86ea0
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4f2a6c1d37'
+down_revision: Union[str, None] = '40193dc86ea0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# CREATE INDEX CONCURRENTLY cannot run inside a transaction, hence the autocommit blocks.
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_subscription_user_id_ended_at',
+            'user_subscription',
+            ['user_id', 'ended_at'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_user_subscription_usages_user_id_created_at',
+            'user_subscription_usages',
+            ['user_id', 'created_at', 'id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_property_media_property_id_order',
+            'property_media',
+            ['property_id', 'order'],
+            schema='public',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_notifications_new_send_at',
+            'notifications',
+            ['send_at'],
+            postgresql_where=sa.text("status = 'new' AND send_at IS NOT NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_property_updated_at',
+            'property',
+            ['updated_at'],
+            schema='public',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_property_updated_at', table_name='property', schema='public', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_notifications_new_send_at', table_name='notifications', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_property_media_property_id_order', table_name='property_media', schema='public', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_user_subscription_usages_user_id_created_at', table_name='user_subscription_usages', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_user_subscription_user_id_ended_at', table_name='user_subscription', postgresql_concurrently=True, if_exists=True)